@@ -0,0 +1,167 @@
+import csv
+import json
+import time
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, TextIO
+
+from application.dto.requests import DepositCommand, WithdrawCommand, TransferCommand
+from application.errors import DomainError as ApplicationDomainError
+from domain.errors import DomainError, ApplicationError
+
+# Błędy, które odrzucają pojedynczą linię; wszystko inne przerywa batch.
+# ArithmeticError (decimal.InvalidOperation, OverflowError) to zła kwota jednej linii, nie awaria.
+REJECTABLE_ERRORS = (DomainError, ApplicationError, ApplicationDomainError, ValueError, ArithmeticError)
+
+
+@dataclass
+class BatchReport:
+    processed: int = 0
+    succeeded: int = 0
+    rejected: int = 0
+    chunks: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        return self.processed / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def detect_format(path: Path) -> str:
+    """Zgaduje format wejścia po rozszerzeniu pliku (csv / jsonl)."""
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        return "csv"
+    if suffix in (".jsonl", ".ndjson", ".json"):
+        return "jsonl"
+    raise ValueError(f"Cannot detect batch format from extension '{suffix}', use --file-format")
+
+
+def read_records(stream: TextIO, fmt: str) -> Iterator[tuple[int, dict | str]]:
+    """Strumieniowo zwraca (numer linii, rekord); niesparsowane linie JSONL oddaje jako surowy tekst."""
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record
+    elif fmt == "jsonl":
+        for line_no, line in enumerate(stream, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                yield line_no, line
+                continue
+            yield line_no, record
+    else:
+        raise ValueError(f"Unsupported batch format '{fmt}'")
+
+
+def parse_command(record: dict | str) -> tuple[str, DepositCommand | WithdrawCommand | TransferCommand]:
+    """Zamienia rekord wejściowy na (nazwa use-case'a, komenda); rzuca ValueError dla złych danych."""
+    if not isinstance(record, dict):
+        raise ValueError("Malformed line")
+
+    op = _text_field(record, "op").lower()
+    account_id = _text_field(record, "account_id")
+    note = _text_field(record, "note") or None
+    if not account_id:
+        raise ValueError("Missing account_id")
+    try:
+        amount = Decimal(str(record.get("amount") or ""))
+    except InvalidOperation:
+        raise ValueError(f"Invalid amount '{record.get('amount')}'")
+    if not amount.is_finite():
+        raise ValueError(f"Invalid amount '{record.get('amount')}'")
+
+    if op == "deposit":
+        return "deposit", DepositCommand(account_id=account_id, amount=amount, note=note)
+    if op == "withdraw":
+        return "withdraw", WithdrawCommand(account_id=account_id, amount=amount, note=note)
+    if op == "transfer":
+        to_account_id = _text_field(record, "to_account_id")
+        if not to_account_id:
+            raise ValueError("Missing to_account_id")
+        return "transfer", TransferCommand(
+            from_account_id=account_id,
+            to_account_id=to_account_id,
+            amount=amount,
+            note=note,
+        )
+    raise ValueError(f"Unknown op '{op}'")
+
+
+def _text_field(record: dict, name: str) -> str:
+    # JSONL może mieć w polu liczbę, listę czy obiekt; taka linia ma być odrzucona, nie przerwać batcha
+    value = record.get(name)
+    if value is None:
+        return ""
+    if not isinstance(value, str):
+        raise ValueError(f"Field '{name}' must be a string")
+    return value.strip()
+
+
+def chunked(records: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(records)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def run_batch(
+    records: Iterable[tuple[int, dict | str]],
+    session_factory: Callable,
+    services_factory: Callable,
+    rejects: TextIO,
+    chunk_size: int = 1000,
+    on_chunk: Callable[[BatchReport], None] | None = None,
+) -> BatchReport:
+    """
+    Wykonuje rekordy paczkami: jedna sesja i jeden COMMIT na paczkę,
+    każda linia w osobnym SAVEPOINT, żeby odrzucenie nie cofało sąsiadów.
+    """
+    report = BatchReport()
+    started = time.perf_counter()
+
+    for chunk in chunked(records, chunk_size):
+        session = session_factory()
+        services = services_factory(session)
+        try:
+            for line_no, record in chunk:
+                report.processed += 1
+                savepoint = None
+                try:
+                    use_case, cmd = parse_command(record)
+                    savepoint = session.begin_nested()
+                    getattr(services, use_case).execute(cmd)
+                    savepoint.commit()
+                    report.succeeded += 1
+                except REJECTABLE_ERRORS as e:
+                    if savepoint is not None:
+                        savepoint.rollback()
+                    report.rejected += 1
+                    _write_reject(rejects, line_no, record, e)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+        report.chunks += 1
+        report.elapsed = time.perf_counter() - started
+        if on_chunk is not None:
+            on_chunk(report)
+
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
+def _write_reject(rejects: TextIO, line_no: int, record: dict | str, error: Exception) -> None:
+    rejects.write(json.dumps(
+        {"line": line_no, "record": record, "error": f"{type(error).__name__}: {error}"},
+        ensure_ascii=False,
+    ))
+    rejects.write("\n")
@@ -0,0 +1,85 @@
+import csv
+import gzip
+import io
+import json
+import os
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, TextIO
+
+from application.dto.responses import TransactionItem
+from adapters.serialization import to_jsonable
+
+EXPORT_FORMATS = ("csv", "jsonl")
+
+CSV_COLUMNS = ("transaction_id", "type", "amount", "occurred_at", "related_account_id", "note")
+
+
+def detect_export_format(path: Path | None) -> str:
+    """Format wyciągu po rozszerzeniu pliku (bez .gz); stdout i nieznane rozszerzenia -> csv."""
+    if path is None:
+        return "csv"
+    suffixes = [suffix.lower() for suffix in path.suffixes]
+    if suffixes and suffixes[-1] == ".gz":
+        suffixes.pop()
+    if suffixes and suffixes[-1] in (".jsonl", ".ndjson"):
+        return "jsonl"
+    return "csv"
+
+
+def write_items(items: Iterable[TransactionItem], stream: TextIO, fmt: str) -> int:
+    """Koduje pozycje wyciągu wiersz po wierszu (nic nie jest zbierane w pamięci); zwraca liczbę wierszy."""
+    count = 0
+    if fmt == "csv":
+        writer = csv.writer(stream)
+        writer.writerow(CSV_COLUMNS)
+        for item in items:
+            writer.writerow((
+                item.transaction_id,
+                item.type.value,
+                str(item.amount),
+                item.occurred_at.isoformat(),
+                item.related_account_id or "",
+                item.note or "",
+            ))
+            count += 1
+    elif fmt == "jsonl":
+        for item in items:
+            stream.write(json.dumps(to_jsonable(item), ensure_ascii=False))
+            stream.write("\n")
+            count += 1
+    else:
+        raise ValueError(f"Unsupported export format '{fmt}'")
+    return count
+
+
+@contextmanager
+def open_output(path: Path | None, compress: bool) -> Iterator[TextIO]:
+    """
+    Strumień tekstowy wyciągu: plik (przez <nazwa>.part, podmieniany dopiero po sukcesie) albo stdout.
+
+    Z compress dane idą przez gzip w locie, bez pliku pośredniego.
+    """
+    if path is None:
+        if not compress:
+            yield sys.stdout
+            sys.stdout.flush()
+            return
+        with gzip.GzipFile(fileobj=sys.stdout.buffer, mode="wb") as raw, \
+                io.TextIOWrapper(raw, encoding="utf-8", newline="") as stream:
+            yield stream
+        sys.stdout.buffer.flush()
+        return
+
+    partial = path.with_name(path.name + ".part")
+    try:
+        if compress:
+            stream = gzip.open(partial, "wt", encoding="utf-8", newline="")
+        else:
+            stream = open(partial, "w", encoding="utf-8", newline="")
+        with stream:
+            yield stream
+        os.replace(partial, path)
+    finally:
+        partial.unlink(missing_ok=True)
@@ -1,23 +1,12 @@
+import sys
+
 import typer
+from datetime import datetime
 from decimal import Decimal, InvalidOperation
 from contextlib import contextmanager
-
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-
-from db import SessionLocal
-from adapters.repositories.sqlite_account_repository import SqliteAccountRepository
-from adapters.repositories.transaction_repository import TransactionsRepository
-from adapters.clock.system_clock import SystemClock
-from adapters.id_provider.id_provider import UUIDIdProvider
-
-from application.use_cases.create_account import CreateAccountUseCase
-from application.use_cases.deposit import DepositUseCase
-from application.use_cases.withdraw import WithdrawUseCase
-from application.use_cases.transfer import TransferUseCase
-from application.use_cases.get_balance import GetBalanceUseCase
-from application.use_cases.list_transactions import ListTransactionsUseCase
+from dataclasses import asdict
+from functools import lru_cache
+from pathlib import Path
 
 from application.dto.requests import (
     CreateAccountCommand,
@@ -26,66 +15,151 @@ from application.dto.requests import (
     TransferCommand,
     GetBalanceCommand,
     ListTransactionsCommand,
+    ExportTransactionsCommand,
+    GetAccountSummaryCommand,
+    ListAccountsCommand,
 )
 
 from application.errors import (
     ApplicationError,
 )
 
+from domain.types.account_status import AccountStatus
 from domain.types.currency import CurrencyType
 from domain.types.transaction import TransactionType
 
+from adapters.cli.output import OutputFormat
+
 app = typer.Typer(no_args_is_help=True)
-console = Console()
 
+# db (SQLAlchemy + migracje) i Rich ładujemy dopiero w komendzie, która ich
+# potrzebuje: `--help` i błędy parsowania opcji nie płacą za ich import.
 
-# --------- infra: UoW + DI --------- #
+# ustawiane przez globalne --format (callback niżej) przy każdym wywołaniu, także w shellu
+_output_format = OutputFormat.rich
 
-class Services:
-    def __init__(self, session):
-        account_repo = SqliteAccountRepository(session)
-        tx_repo = TransactionsRepository(session)
-        clock = SystemClock()
-        idp = UUIDIdProvider()
 
-        self.create_account = CreateAccountUseCase(account_repo, tx_repo, clock, idp)
-        self.deposit = DepositUseCase(account_repo, tx_repo, clock, idp)
-        self.withdraw = WithdrawUseCase(account_repo, tx_repo, clock, idp)
-        self.transfer = TransferUseCase(account_repo, tx_repo, clock, idp)
-        self.get_balance = GetBalanceUseCase(account_repo, tx_repo, clock)
-        self.list_transactions = ListTransactionsUseCase(account_repo, tx_repo)
+@app.callback()
+def main(
+    output_format: OutputFormat = typer.Option(
+        OutputFormat.rich,
+        "--format",
+        help="rich (tables for people) or json / jsonl / tsv for scripts; machine formats skip Rich entirely",
+    ),
+):
+    """
+    Bank accounts, transfers and statements on SQLite.
+    """
+    global _output_format
+    _output_format = output_format
 
 
+# --------- infra: UoW + DI --------- #
+
 @contextmanager
 def get_services():
-    session = SessionLocal()
-    services = Services(session)
+    from adapters.services import SHARDED
+
+    if SHARDED:
+        from adapters.services import ShardedServices, shard_set
+
+        # sesje shardów otwierane leniwie: komenda na jednym koncie dotyka jednego pliku
+        session = shard_set().session()
+        read_session = None
+        services = ShardedServices(session)
+    else:
+        from db import ReadSessionLocal, SessionLocal
+        from adapters.services import Services
+
+        # sesje łączą się z bazą dopiero przy pierwszym zapytaniu: `balance` nie otwiera
+        # połączenia do zapisu, a mutacje nie otwierają połączenia tylko do odczytu
+        session = SessionLocal()
+        read_session = ReadSessionLocal()
+        services = Services(session, read_session=read_session)
     try:
         yield services
         session.commit()
     except ApplicationError as e:
         session.rollback()
         _print_error(str(e))
+        if _machine_output():
+            raise typer.Exit(code=1)
     except Exception as e:
         session.rollback()
+        if _machine_output():
+            # skrypt dostaje błąd na stderr i kod wyjścia, bez tracebacku renderowanego przez Rich
+            _print_error(str(e), type(e).__name__)
+            raise typer.Exit(code=1)
         _print_error(f"Unexpected error: {e}")
         raise
     finally:
+        if read_session is not None:
+            read_session.close()
         session.close()
 
 
-# --------- helpers: Rich output --------- #
+# --------- helpers: output (Rich albo json/jsonl/tsv) --------- #
+
+def _machine_output() -> bool:
+    return _output_format != OutputFormat.rich
+
+
+def _write(record):
+    """Wynik (DTO, raport, dict) w formacie maszynowym na stdout."""
+    from adapters.cli.output import write_record
+    write_record(record, _output_format)
+
+
+def _progress(message: str):
+    """Postęp długich komend; w formatach maszynowych na stderr, żeby nie mieszać go z wynikiem."""
+    if _machine_output():
+        print(message, file=sys.stderr)
+        return
+    _console().print(f"[dim]{message}[/dim]")
+
+
+def _parse_amount(value: str, message: str) -> Decimal:
+    try:
+        amount = Decimal(value)
+    except InvalidOperation:
+        _print_error(message)
+        raise typer.Exit(code=1)
+    if not amount.is_finite():
+        _print_error(message)
+        raise typer.Exit(code=1)
+    return amount
+
+
+@lru_cache(maxsize=None)
+def _console():
+    from rich.console import Console
+    return Console()
+
+
+def _table(title: str):
+    from rich.table import Table
+    return Table(title=title)
+
 
 def _print_success(message: str):
-    console.print(Panel.fit(message, style="bold green"))
+    from rich.panel import Panel
+    _console().print(Panel.fit(message, style="bold green"))
 
 
-def _print_error(message: str):
-    console.print(Panel.fit(message, style="bold red"))
+def _print_error(message: str, error_type: str | None = None):
+    if _machine_output():
+        from adapters.cli.output import write_error
+        write_error(message, _output_format, error_type)
+        return
+    from rich.panel import Panel
+    _console().print(Panel.fit(message, style="bold red"))
 
 
 def _print_account_created(result):
-    table = Table(title="Account created")
+    if _machine_output():
+        _write(result)
+        return
+    table = _table("Account created")
     table.add_column("Field", style="bold cyan")
     table.add_column("Value")
     table.add_row("Account ID", result.account_id)
@@ -94,20 +168,74 @@ def _print_account_created(result):
     table.add_row("Status", result.status.value)
     table.add_row("Created at", str(result.created_at))
     table.add_row("Initial balance", str(result.initial_balance))
-    console.print(table)
+    _console().print(table)
+
+
+def _print_operation(message: str, result):
+    """Wynik wpłaty/wypłaty (DepositResult / WithdrawResult)."""
+    if _machine_output():
+        _write(result)
+        return
+    _print_success(message)
+    _console().print(
+        f"[bold]Account:[/bold] {result.account_id}  "
+        f"[bold]Tx ID:[/bold] {result.transaction_id}  "
+        f"[bold]New balance:[/bold] {result.new_balance}  "
+        f"[bold]At:[/bold] {result.occurred_at}"
+    )
+
+
+def _print_transfer(result):
+    if _machine_output():
+        _write(result)
+        return
+    _print_success("Transfer completed.")
+    table = _table("Transfer result")
+    table.add_column("Field", style="bold cyan")
+    table.add_column("Value")
+    table.add_row("Transfer ID", result.transfer_id)
+    table.add_row("From account", result.from_account_id)
+    table.add_row("To account", result.to_account_id)
+    table.add_row("Debit Tx ID", result.debit_tx_id)
+    table.add_row("Credit Tx ID", result.credit_tx_id)
+    table.add_row("From new balance", str(result.from_new_balance))
+    table.add_row("To new balance", str(result.to_new_balance))
+    table.add_row("At", str(result.occurred_at))
+    _console().print(table)
 
 
 def _print_balance(result):
-    table = Table(title="Account balance")
+    if _machine_output():
+        _write(result)
+        return
+    table = _table("Account balance")
     table.add_column("Account ID", style="bold cyan")
     table.add_column("Balance")
     table.add_column("As of")
     table.add_row(result.account_id, str(result.balance), str(result.as_of))
-    console.print(table)
+    _console().print(table)
+
+
+def _print_report(title: str, rows: dict[str, str], record):
+    """Raport komendy: tabela Field/Value albo `record` (surowe wartości) w formacie maszynowym."""
+    if _machine_output():
+        _write(record)
+        return
+    table = _table(title)
+    table.add_column("Field", style="bold cyan")
+    table.add_column("Value")
+    for field, value in rows.items():
+        table.add_row(field, value)
+    _console().print(table)
 
 
 def _print_transactions(result):
-    table = Table(title=f"Transactions for {result.account_id}")
+    if _machine_output():
+        from adapters.cli.output import write_page
+        from application.dto.responses import TransactionItem
+        write_page(result, "items", TransactionItem, _output_format)
+        return
+    table = _table(f"Transactions for {result.account_id}")
     table.add_column("Tx ID", style="bold cyan")
     table.add_column("Type")
     table.add_column("Amount")
@@ -125,7 +253,40 @@ def _print_transactions(result):
             item.note or "",
         )
 
-    console.print(table)
+    _console().print(table)
+    if result.total_count is not None:
+        _console().print(f"[bold]Total:[/bold] {result.total_count}")
+    if result.next_cursor:
+        _console().print(f"[bold]Next cursor:[/bold] {result.next_cursor}", soft_wrap=True)
+
+
+def _print_accounts(result):
+    if _machine_output():
+        from adapters.cli.output import write_page
+        from application.dto.responses import AccountItem
+        write_page(result, "items", AccountItem, _output_format)
+        return
+    table = _table("Accounts")
+    table.add_column("Account ID", style="bold cyan")
+    table.add_column("Owner")
+    table.add_column("Currency")
+    table.add_column("Balance", justify="right")
+    table.add_column("Status")
+    table.add_column("Created at")
+
+    for item in result.items:
+        table.add_row(
+            item.account_id,
+            item.owner_name,
+            item.currency.value,
+            str(item.balance),
+            item.status.value,
+            str(item.created_at),
+        )
+
+    _console().print(table)
+    if result.next_cursor:
+        _console().print(f"[bold]Next cursor:[/bold] {result.next_cursor}", soft_wrap=True)
 
 
 # --------- commands --------- #
@@ -139,13 +300,9 @@ def create_account(
     """
     Create a new bank account.
     """
-    with get_services() as s:
-        try:
-            initial_dec = Decimal(initial)
-        except InvalidOperation:
-            _print_error("Invalid initial amount format")
-            return
+    initial_dec = _parse_amount(initial, "Invalid initial amount format")
 
+    with get_services() as s:
         cmd = CreateAccountCommand(
             owner_name=owner,
             currency=currency,
@@ -164,27 +321,16 @@ def deposit(
     """
     Deposit money into an account.
     """
-    with get_services() as s:
-        try:
-            amount_dec = Decimal(amount)
-        except InvalidOperation:
-            _print_error("Invalid amount format")
-            return
+    amount_dec = _parse_amount(amount, "Invalid amount format")
 
+    with get_services() as s:
         cmd = DepositCommand(
             account_id=account_id,
             amount=amount_dec,
             note=note or None,
         )
         result = s.deposit.execute(cmd)
-
-        _print_success("Deposit completed.")
-        console.print(
-            f"[bold]Account:[/bold] {result.account_id}  "
-            f"[bold]Tx ID:[/bold] {result.transaction_id}  "
-            f"[bold]New balance:[/bold] {result.new_balance}  "
-            f"[bold]At:[/bold] {result.occurred_at}"
-        )
+        _print_operation("Deposit completed.", result)
 
 
 @app.command("withdraw")
@@ -196,27 +342,16 @@ def withdraw(
     """
     Withdraw money from an account.
     """
-    with get_services() as s:
-        try:
-            amount_dec = Decimal(amount)
-        except InvalidOperation:
-            _print_error("Invalid amount format")
-            return
+    amount_dec = _parse_amount(amount, "Invalid amount format")
 
+    with get_services() as s:
         cmd = WithdrawCommand(
             account_id=account_id,
             amount=amount_dec,
             note=note or None,
         )
         result = s.withdraw.execute(cmd)
-
-        _print_success("Withdrawal completed.")
-        console.print(
-            f"[bold]Account:[/bold] {result.account_id}  "
-            f"[bold]Tx ID:[/bold] {result.transaction_id}  "
-            f"[bold]New balance:[/bold] {result.new_balance}  "
-            f"[bold]At:[/bold] {result.occurred_at}"
-        )
+        _print_operation("Withdrawal completed.", result)
 
 
 @app.command("transfer")
@@ -229,13 +364,9 @@ def transfer(
     """
     Transfer money from one account to another.
     """
-    with get_services() as s:
-        try:
-            amount_dec = Decimal(amount)
-        except InvalidOperation:
-            _print_error("Invalid amount format")
-            return
+    amount_dec = _parse_amount(amount, "Invalid amount format")
 
+    with get_services() as s:
         cmd = TransferCommand(
             from_account_id=from_account_id,
             to_account_id=to_account_id,
@@ -243,20 +374,7 @@ def transfer(
             note=note or None,
         )
         result = s.transfer.execute(cmd)
-
-        _print_success("Transfer completed.")
-        table = Table(title="Transfer result")
-        table.add_column("Field", style="bold cyan")
-        table.add_column("Value")
-        table.add_row("Transfer ID", result.transfer_id)
-        table.add_row("From account", result.from_account_id)
-        table.add_row("To account", result.to_account_id)
-        table.add_row("Debit Tx ID", result.debit_tx_id)
-        table.add_row("Credit Tx ID", result.credit_tx_id)
-        table.add_row("From new balance", str(result.from_new_balance))
-        table.add_row("To new balance", str(result.to_new_balance))
-        table.add_row("At", str(result.occurred_at))
-        console.print(table)
+        _print_transfer(result)
 
 
 @app.command("balance")
@@ -281,6 +399,9 @@ def transactions(
         "--type",
         help="Filter by transaction type (DEPOSIT/WITHDRAW/...)",
     ),
+    date_from: datetime | None = typer.Option(None, "--from", help="Only transactions at or after this time (UTC)"),
+    date_to: datetime | None = typer.Option(None, "--to", help="Only transactions before this time (UTC)"),
+    cursor: str | None = typer.Option(None, "--cursor", help="Cursor from the previous page"),
 ):
     """
     List transactions for an account.
@@ -290,12 +411,612 @@ def transactions(
     with get_services() as s:
         cmd = ListTransactionsCommand(
             account_id=account_id,
+            date_from=date_from,
+            date_to=date_to,
             limit=limit,
+            cursor=cursor,
             type_filter=type_filter,
         )
         result = s.list_transactions.execute(cmd)
         _print_transactions(result)
 
 
+@app.command("accounts")
+def accounts(
+    status: AccountStatus | None = typer.Option(None, "--status", help="Only accounts with this status"),
+    currency: CurrencyType | None = typer.Option(None, "--currency", "-c", help="Only accounts in this currency"),
+    owner: str | None = typer.Option(None, "--owner", "-o", help="Owner name prefix (case-sensitive)"),
+    created_from: datetime | None = typer.Option(None, "--from", help="Only accounts created at or after this time (UTC)"),
+    created_to: datetime | None = typer.Option(None, "--to", help="Only accounts created before this time (UTC)"),
+    limit: int = typer.Option(50, "--limit", "-l"),
+    cursor: str | None = typer.Option(None, "--cursor", help="Cursor from the previous page"),
+):
+    """
+    List accounts, newest first, one page at a time.
+    """
+    with get_services() as s:
+        cmd = ListAccountsCommand(
+            status=status,
+            currency=currency,
+            owner_prefix=owner,
+            created_from=created_from,
+            created_to=created_to,
+            limit=limit,
+            cursor=cursor,
+        )
+        result = s.list_accounts.execute(cmd)
+        _print_accounts(result)
+
+
+@app.command("summary")
+def summary(
+    account_id: str = typer.Option(..., "--account-id", "-a"),
+    date_from: datetime | None = typer.Option(None, "--from", help="First day of the period (UTC)"),
+    date_to: datetime | None = typer.Option(None, "--to", help="End of the period, exclusive (UTC day)"),
+    daily: bool = typer.Option(False, "--daily", help="Also list the totals of every day"),
+):
+    """
+    Inflow, outflow and transaction count of an account over whole UTC days, from the daily totals table.
+    """
+    with get_services() as s:
+        cmd = GetAccountSummaryCommand(
+            account_id=account_id,
+            date_from=date_from.date() if date_from is not None else None,
+            date_to=date_to.date() if date_to is not None else None,
+        )
+        result = s.get_account_summary.execute(cmd)
+
+        if _machine_output():
+            if daily:
+                from adapters.cli.output import write_rows
+                from application.dto.responses import DailyTotalsItem
+                write_rows(result.days, DailyTotalsItem, _output_format)
+            else:
+                _write(result)
+            return
+        _print_report(
+            f"Summary of {result.account_id}",
+            {
+                "From": str(result.date_from or "-"),
+                "To": str(result.date_to or "-"),
+                "Inflow": str(result.inflow),
+                "Outflow": str(result.outflow),
+                "Net": str(result.net),
+                "Transactions": str(result.count),
+            },
+            result,
+        )
+        if daily:
+            table = _table("Daily totals")
+            table.add_column("Day", style="bold cyan")
+            table.add_column("Currency")
+            table.add_column("Inflow", justify="right")
+            table.add_column("Outflow", justify="right")
+            table.add_column("Net", justify="right")
+            table.add_column("Count", justify="right")
+            for item in result.days:
+                table.add_row(
+                    item.day.isoformat(),
+                    item.currency.value,
+                    str(item.inflow),
+                    str(item.outflow),
+                    str(item.net),
+                    str(item.count),
+                )
+            _console().print(table)
+
+
+@app.command("export")
+def export(
+    account_id: str = typer.Option(..., "--account-id", "-a"),
+    output: Path | None = typer.Option(
+        None, "--output", "-o", dir_okay=False, help="File to write (default: stdout); a .gz name implies --gzip"
+    ),
+    fmt: str | None = typer.Option(None, "--file-format", help="csv or jsonl (default: from --output extension, else csv)"),
+    compress: bool = typer.Option(False, "--gzip", help="Compress the output with gzip"),
+    tx_type: TransactionType | None = typer.Option(None, "--type", help="Only transactions of this type"),
+    date_from: datetime | None = typer.Option(None, "--from", help="Only transactions at or after this time (UTC)"),
+    date_to: datetime | None = typer.Option(None, "--to", help="Only transactions before this time (UTC)"),
+    batch_size: int = typer.Option(1000, "--batch-size", min=1, help="Rows fetched from the database at a time"),
+):
+    """
+    Stream an account statement (oldest first) to CSV or JSONL without loading the history into memory.
+    """
+    import time
+    from adapters.cli.export import EXPORT_FORMATS, detect_export_format, open_output, write_items
+
+    fmt = fmt or detect_export_format(output)
+    if fmt not in EXPORT_FORMATS:
+        _print_error(f"Unsupported export format '{fmt}'")
+        raise typer.Exit(code=1)
+    compress = compress or (output is not None and output.suffix.lower() == ".gz")
+    type_filter = {tx_type} if tx_type is not None else None
+
+    with get_services() as s:
+        cmd = ExportTransactionsCommand(
+            account_id=account_id,
+            date_from=date_from,
+            date_to=date_to,
+            type_filter=type_filter,
+            batch_size=batch_size,
+        )
+        # walidacja (konto, zakres dat) przed otwarciem pliku; wiersze płyną dopiero w write_items
+        items = s.export_transactions.execute(cmd)
+        started = time.perf_counter()
+        with open_output(output, compress) as stream:
+            count = write_items(items, stream, fmt)
+        elapsed = time.perf_counter() - started
+
+        if output is not None:
+            _print_report(
+                "Export result",
+                {
+                    "File": str(output),
+                    "Format": fmt + (" (gzip)" if compress else ""),
+                    "Transactions": str(count),
+                    "Elapsed": f"{elapsed:.2f}s",
+                },
+                {"file": str(output), "format": fmt, "gzip": compress, "transactions": count, "elapsed": elapsed},
+            )
+
+
+@app.command("batch")
+def batch(
+    input_path: Path = typer.Argument(..., exists=True, dir_okay=False, help="CSV or JSONL file with operations"),
+    fmt: str | None = typer.Option(None, "--file-format", help="csv or jsonl (default: from file extension)"),
+    chunk_size: int = typer.Option(1000, "--chunk-size", min=1, help="Operations per commit"),
+    rejects_path: Path | None = typer.Option(None, "--rejects", help="Where to write rejected lines (JSONL)"),
+):
+    """
+    Run deposits, withdrawals and transfers from a file, committing in chunks.
+
+    Columns/keys: op (deposit|withdraw|transfer), account_id, to_account_id, amount, note.
+    """
+    from db import SessionLocal
+    from adapters.services import SHARDED, Services
+    from adapters.cli.batch import detect_format, read_records, run_batch
+
+    if SHARDED:
+        # paczka z przelewami obciąża wiele shardów naraz, a protokół dwufazowy obsługuje jeden
+        _print_error("batch is not supported with BANK_SHARD_COUNT >= 2; run operations one by one")
+        raise typer.Exit(code=1)
+
+    try:
+        fmt = fmt or detect_format(input_path)
+    except ValueError as e:
+        _print_error(str(e))
+        raise typer.Exit(code=1)
+    if fmt not in ("csv", "jsonl"):
+        _print_error(f"Unsupported batch format '{fmt}'")
+        raise typer.Exit(code=1)
+
+    rejects_path = rejects_path or input_path.with_name(input_path.name + ".rejects.jsonl")
+
+    def on_chunk(report):
+        _progress(
+            f"chunk {report.chunks}: {report.processed} lines, "
+            f"{report.rejected} rejected, {report.throughput:.0f} lines/s"
+        )
+
+    with open(input_path, newline="", encoding="utf-8") as source, \
+            open(rejects_path, "w", encoding="utf-8") as rejects:
+        report = run_batch(
+            read_records(source, fmt),
+            session_factory=SessionLocal,
+            services_factory=Services,
+            rejects=rejects,
+            chunk_size=chunk_size,
+            on_chunk=on_chunk,
+        )
+
+    _print_report(
+        "Batch result",
+        {
+            "Processed": str(report.processed),
+            "Succeeded": str(report.succeeded),
+            "Rejected": str(report.rejected),
+            "Commits": str(report.chunks),
+            "Elapsed": f"{report.elapsed:.2f}s",
+            "Throughput": f"{report.throughput:.0f} lines/s",
+            "Rejects file": str(rejects_path),
+        },
+        {**asdict(report), "throughput": report.throughput, "rejects_file": str(rejects_path)},
+    )
+
+
+@app.command("migrate-money")
+def migrate_money(
+    chunk_size: int = typer.Option(5000, "--chunk-size", min=1, help="Rows updated per commit"),
+):
+    """
+    Backfill integer minor-unit amounts (grosze/cents) for rows written before schema v4.
+
+    Safe to run while the bank is in use and to re-run after an interruption.
+    """
+    from db import engine
+    from adapters.jobs.money_minor_units import backfill_minor_units
+
+    def on_chunk(table, done, total):
+        _progress(f"{table}: rowid {done}/{total}")
+
+    report = backfill_minor_units(engine, chunk_size=chunk_size, on_chunk=on_chunk)
+
+    rows = {f"Updated {name}": str(updated) for name, updated in report.updated.items()}
+    rows["Commits"] = str(report.chunks)
+    rows["Ledger rows off by rounding"] = str(report.ledger_drift)
+    rows["Elapsed"] = f"{report.elapsed:.2f}s"
+    _print_report("Money backfill result", rows, report)
+
+
+@app.command("migrate-timestamps")
+def migrate_timestamps(
+    chunk_size: int = typer.Option(5000, "--chunk-size", min=1, help="Rows updated per commit"),
+):
+    """
+    Backfill integer microsecond-epoch timestamps for rows written before schema v5.
+
+    Switch to BANK_TIMESTAMP_STORAGE=epoch_us once nothing is left to backfill.
+    """
+    from db import engine
+    from adapters.jobs.epoch_timestamps import backfill_epoch_timestamps
+
+    def on_chunk(column, done, total):
+        _progress(f"{column}: rowid {done}/{total}")
+
+    report = backfill_epoch_timestamps(engine, chunk_size=chunk_size, on_chunk=on_chunk)
+
+    rows = {f"Updated {column}": str(updated) for column, updated in report.updated.items()}
+    rows.update({f"Still NULL {column}": str(remaining) for column, remaining in report.remaining.items()})
+    rows["Commits"] = str(report.chunks)
+    rows["Elapsed"] = f"{report.elapsed:.2f}s"
+    _print_report("Timestamp backfill result", rows, report)
+
+
+@app.command("migrate-daily-totals")
+def migrate_daily_totals(
+    chunk_size: int = typer.Option(200, "--chunk-size", min=1, help="Accounts rebuilt per commit"),
+):
+    """
+    Build the daily totals of accounts whose history predates schema v7.
+
+    Safe on a live database; accounts with archived history wait until BANK_ARCHIVE_PATH is set.
+    """
+    from db import engine
+    from adapters.jobs.daily_totals import backfill_daily_totals
+
+    def on_chunk(report):
+        _progress(f"accounts: {report.accounts} done")
+
+    report = backfill_daily_totals(engine, chunk_size=chunk_size, on_chunk=on_chunk)
+
+    rows = {
+        "Accounts rebuilt": str(report.accounts),
+        "Days written": str(report.days),
+        "Accounts pending": str(report.remaining),
+        "Commits": str(report.chunks),
+        "Elapsed": f"{report.elapsed:.2f}s",
+    }
+    _print_report("Daily totals backfill result", rows, report)
+
+
+@app.command("migrate-ids")
+def migrate_ids(
+    vacuum: bool = typer.Option(False, "--vacuum", help="VACUUM afterwards to reclaim space"),
+):
+    """
+    Convert account and transaction IDs from 36-char text to 16-byte BLOBs.
+
+    Offline migration: stop the bank first and restart it with BANK_ID_STORAGE=blob.
+    """
+    from db import engine
+    from adapters.jobs.binary_ids import convert_ids_to_blob
+
+    try:
+        converted = convert_ids_to_blob(engine, vacuum=vacuum)
+    except ValueError as e:
+        _print_error(str(e))
+        raise typer.Exit(code=1)
+
+    if _machine_output():
+        _write(converted)
+        return
+    table = _table("ID conversion result")
+    table.add_column("Column", style="bold cyan")
+    table.add_column("Converted")
+    for column, count in converted.items():
+        table.add_row(column, str(count))
+    _console().print(table)
+
+
+@app.command("archive")
+def archive(
+    before: datetime | None = typer.Option(None, "--before", help="Archive transactions older than this time (UTC)"),
+    older_than_days: int | None = typer.Option(None, "--older-than-days", min=1, help="Alternative to --before"),
+    chunk_size: int = typer.Option(5000, "--chunk-size", min=1, help="Transactions moved per commit"),
+):
+    """
+    Move old transactions to the archive database (BANK_ARCHIVE_PATH).
+
+    Each account gets an opening-balance checkpoint; history queries that reach
+    past it read the archive transparently. Safe to re-run after an interruption.
+    """
+    from datetime import timedelta, timezone
+    from config.config import ARCHIVE_PATH
+
+    if ARCHIVE_PATH is None:
+        _print_error("Set BANK_ARCHIVE_PATH to the archive database file first")
+        raise typer.Exit(code=1)
+    if (before is None) == (older_than_days is None):
+        _print_error("Pass exactly one of --before / --older-than-days")
+        raise typer.Exit(code=1)
+    cutoff = before if before is not None else datetime.now(timezone.utc) - timedelta(days=older_than_days)
+
+    from db import engine
+    from adapters.jobs.archive_transactions import archive_transactions
+
+    def on_chunk(report):
+        _progress(f"chunk {report.chunks}: {report.moved} moved, {report.accounts} accounts")
+
+    report = archive_transactions(engine, cutoff, chunk_size=chunk_size, on_chunk=on_chunk)
+
+    _print_report(
+        "Archive result",
+        {
+            "Cutoff": cutoff.isoformat(),
+            "Moved": str(report.moved),
+            "Accounts": str(report.accounts),
+            "Chunks": str(report.chunks),
+            "Elapsed": f"{report.elapsed:.2f}s",
+        },
+        {"cutoff": cutoff, **asdict(report)},
+    )
+
+
+@app.command("recover-shards")
+def recover_shards(
+    grace_seconds: int = typer.Option(60, "--grace-seconds", min=0, help="Skip entries younger than this (may still be in flight)"),
+):
+    """
+    Finish or abandon cross-shard writes interrupted by a crash (BANK_SHARD_COUNT >= 2).
+
+    Entries whose debited shard committed are replayed on the other shards;
+    the rest are marked aborted.
+    """
+    from datetime import timedelta
+    from adapters.services import SHARDED, shard_set
+
+    if not SHARDED:
+        _print_error("Sharding is disabled (BANK_SHARD_COUNT < 2)")
+        raise typer.Exit(code=1)
+
+    report = shard_set().recover(grace=timedelta(seconds=grace_seconds))
+
+    _print_report(
+        "Shard recovery result",
+        {"Committed": str(report.committed), "Aborted": str(report.aborted)},
+        report,
+    )
+
+
+@app.command("cache-stats")
+def cache_stats():
+    """
+    Show hit/miss counters of this process's account cache (BANK_ACCOUNT_CACHE_SIZE).
+
+    The cache lives per process, so the numbers are useful inside `shell`.
+    """
+    from dataclasses import asdict
+    from adapters.services import account_cache
+
+    if account_cache is None:
+        _print_error("Account cache is disabled (BANK_ACCOUNT_CACHE_SIZE=0)")
+        raise typer.Exit(code=1)
+
+    stats = account_cache.stats()
+    _print_report(
+        "Account cache",
+        {
+            "Hits": str(stats.hits),
+            "Misses": str(stats.misses),
+            "Hit ratio": f"{stats.hit_ratio:.1%}",
+            "Evictions": str(stats.evictions),
+            "Invalidations": str(stats.invalidations),
+            "Entries": str(stats.size),
+        },
+        {**asdict(stats), "hit_ratio": stats.hit_ratio},
+    )
+
+
+# --------- report: raporty wektorowe (NumPy) nad całą tabelą transakcji --------- #
+
+report_app = typer.Typer(no_args_is_help=True, help="Inflow/outflow, top accounts and balance series computed with NumPy.")
+app.add_typer(report_app, name="report")
+
+
+def _reports(chunk_size: int):
+    """TransactionReports na read_engine; NumPy ładowany dopiero tutaj (reszta CLI go nie potrzebuje)."""
+    from adapters.services import BINARY_IDS, SHARDED
+
+    if SHARDED:
+        _print_error("report is not supported with BANK_SHARD_COUNT >= 2")
+        raise typer.Exit(code=1)
+    try:
+        from adapters.reporting.columnar import ColumnarSource
+        from adapters.reporting.reports import TransactionReports
+    except ImportError:
+        _print_error("Reports need NumPy (pip install numpy)")
+        raise typer.Exit(code=1)
+    from db import read_engine
+
+    return TransactionReports(ColumnarSource(read_engine, chunk_size=chunk_size, binary_ids=BINARY_IDS))
+
+
+def _print_period_report(report, title: str):
+    if _machine_output():
+        from adapters.cli.output import write_rows
+        from adapters.reporting.reports import PeriodTotals
+        write_rows(report.rows(), PeriodTotals, _output_format)
+        return
+    table = _table(title)
+    table.add_column("Account ID", style="bold cyan")
+    table.add_column("Currency")
+    table.add_column("Day" if report.period == "day" else "Month")
+    table.add_column("Inflow", justify="right")
+    table.add_column("Outflow", justify="right")
+    table.add_column("Net", justify="right")
+    table.add_column("Count", justify="right")
+    for row in report.rows():
+        start = row.period_start.isoformat()
+        table.add_row(
+            row.account_id,
+            row.currency.value,
+            start if report.period == "day" else start[:7],
+            str(row.inflow),
+            str(row.outflow),
+            str(row.net),
+            str(row.count),
+        )
+    _console().print(table)
+
+
+def _period_report(period: str, title: str, account_id, currency, date_from, date_to, chunk_size):
+    reports = _reports(chunk_size)
+    try:
+        report = reports.period_totals(period, account_id, currency, date_from, date_to)
+    except ValueError as e:
+        _print_error(str(e))
+        raise typer.Exit(code=1)
+    _print_period_report(report, title)
+
+
+@report_app.command("daily")
+def report_daily(
+    account_id: str | None = typer.Option(None, "--account-id", "-a", help="Only this account"),
+    currency: CurrencyType | None = typer.Option(None, "--currency", "-c", help="Only this currency"),
+    date_from: datetime | None = typer.Option(None, "--from", help="Only transactions at or after this time (UTC)"),
+    date_to: datetime | None = typer.Option(None, "--to", help="Only transactions before this time (UTC)"),
+    chunk_size: int = typer.Option(65536, "--chunk-size", min=1, help="Rows fetched from the database at a time"),
+):
+    """
+    Daily inflow, outflow and net per account and currency (UTC days).
+    """
+    _period_report("day", "Daily totals", account_id, currency, date_from, date_to, chunk_size)
+
+
+@report_app.command("monthly")
+def report_monthly(
+    account_id: str | None = typer.Option(None, "--account-id", "-a", help="Only this account"),
+    currency: CurrencyType | None = typer.Option(None, "--currency", "-c", help="Only this currency"),
+    date_from: datetime | None = typer.Option(None, "--from", help="Only transactions at or after this time (UTC)"),
+    date_to: datetime | None = typer.Option(None, "--to", help="Only transactions before this time (UTC)"),
+    chunk_size: int = typer.Option(65536, "--chunk-size", min=1, help="Rows fetched from the database at a time"),
+):
+    """
+    Monthly inflow, outflow and net per account and currency (UTC months).
+    """
+    _period_report("month", "Monthly totals", account_id, currency, date_from, date_to, chunk_size)
+
+
+@report_app.command("top")
+def report_top(
+    limit: int = typer.Option(10, "--limit", "-l", min=1, help="Accounts per currency"),
+    currency: CurrencyType | None = typer.Option(None, "--currency", "-c", help="Only this currency"),
+    date_from: datetime | None = typer.Option(None, "--from", help="Only transactions at or after this time (UTC)"),
+    date_to: datetime | None = typer.Option(None, "--to", help="Only transactions before this time (UTC)"),
+    chunk_size: int = typer.Option(65536, "--chunk-size", min=1, help="Rows fetched from the database at a time"),
+):
+    """
+    Top accounts by volume (inflow + outflow) in each currency.
+    """
+    report = _reports(chunk_size).top_accounts(limit, currency, date_from, date_to)
+
+    if _machine_output():
+        from adapters.cli.output import write_rows
+        from adapters.reporting.reports import AccountVolume
+        write_rows(report.rows(), AccountVolume, _output_format)
+        return
+    table = _table(f"Top {limit} accounts by volume")
+    table.add_column("Account ID", style="bold cyan")
+    table.add_column("Currency")
+    table.add_column("Volume", justify="right")
+    table.add_column("Inflow", justify="right")
+    table.add_column("Outflow", justify="right")
+    table.add_column("Count", justify="right")
+    for row in report.rows():
+        table.add_row(
+            row.account_id,
+            row.currency.value,
+            str(row.volume),
+            str(row.inflow),
+            str(row.outflow),
+            str(row.count),
+        )
+    _console().print(table)
+
+
+@report_app.command("balance")
+def report_balance(
+    account_id: str = typer.Option(..., "--account-id", "-a"),
+    date_from: datetime | None = typer.Option(None, "--from", help="First day of the series (UTC)"),
+    date_to: datetime | None = typer.Option(None, "--to", help="End of the series, exclusive (UTC)"),
+    chunk_size: int = typer.Option(65536, "--chunk-size", min=1, help="Rows fetched from the database at a time"),
+):
+    """
+    End-of-day balance of an account over time, including days without transactions.
+    """
+    from domain.errors import AccountNotFound
+
+    try:
+        series = _reports(chunk_size).balance_series(account_id, date_from, date_to)
+    except AccountNotFound as e:
+        _print_error(str(e))
+        raise typer.Exit(code=1)
+
+    if _machine_output():
+        from adapters.cli.output import write_rows
+        from adapters.reporting.reports import BalancePoint
+        write_rows(series.rows(), BalancePoint, _output_format)
+        return
+    table = _table(f"Balance of {account_id}")
+    table.add_column("Day", style="bold cyan")
+    table.add_column("Net", justify="right")
+    table.add_column("Balance", justify="right")
+    for point in series.rows():
+        table.add_row(point.day.isoformat(), str(point.net), str(point.balance))
+    _console().print(table)
+
+
+@app.command("shell")
+def shell(
+    socket_path: Path | None = typer.Option(None, "--socket", help="Serve commands on this Unix socket instead of stdin"),
+    timing: bool = typer.Option(False, "--timing", help="Print how long each command took"),
+):
+    """
+    Run commands line by line in one long-lived process (same syntax as the CLI).
+
+    The engine and connection pool are reused between commands; each command
+    runs in its own transaction. Type `exit` or press Ctrl+D to quit.
+    """
+    from db import engine, read_engine
+    from adapters.cli.shell import CommandRunner, run_repl, serve_socket
+
+    # rozgrzewamy obie pule (połączenie + ewentualne migracje) przed pierwszą komendą
+    with engine.connect(), read_engine.connect():
+        pass
+
+    # --format podane przed `shell` obowiązuje każdą linię, o ile ta nie poda własnego
+    output_format = _output_format.value if _machine_output() else None
+    runner = CommandRunner(app, timing=timing, output_format=output_format)
+    if socket_path is None:
+        run_repl(runner)
+        return
+
+    if _machine_output():
+        print(f"Listening on {socket_path} (Ctrl+C to stop)", file=sys.stderr)
+    else:
+        _console().print(f"Listening on {socket_path} (Ctrl+C to stop)")
+    serve_socket(runner, socket_path)
+
+
 if __name__ == "__main__":
     app()
@@ -0,0 +1,118 @@
+import dataclasses
+import json
+import sys
+from enum import Enum
+from typing import Any, Iterable, TextIO
+
+from adapters.serialization import to_jsonable
+
+
+class OutputFormat(str, Enum):
+    """Globalne `--format` CLI: rich dla człowieka, reszta dla skryptów (bez Rich, wprost z DTO)."""
+    rich = "rich"
+    json = "json"
+    jsonl = "jsonl"
+    tsv = "tsv"
+
+
+def write_record(record: Any, fmt: OutputFormat, stream: TextIO | None = None) -> None:
+    """Jeden wynik (DTO, raport albo dict): json/jsonl -> jeden obiekt w linii, tsv -> nagłówek + wiersz."""
+    stream = stream or sys.stdout
+    payload = to_jsonable(record)
+    if fmt == OutputFormat.tsv:
+        stream.write(_tsv_line(payload.keys()))
+        stream.write(_tsv_line(payload.values()))
+    else:
+        stream.write(_json_line(payload))
+
+
+def write_rows(rows: Iterable[Any], row_type: type, fmt: OutputFormat, stream: TextIO | None = None) -> int:
+    """
+    Lista wyników wiersz po wierszu (bez budowania całości w pamięci); zwraca liczbę wierszy.
+
+    json -> tablica JSON pisana przyrostowo, jsonl -> obiekt na linię, tsv -> nagłówek
+    z pól dataclassy row_type (także dla pustej listy) i wiersz na pozycję.
+    """
+    stream = stream or sys.stdout
+    count = 0
+    if fmt == OutputFormat.tsv:
+        stream.write(_tsv_line(field.name for field in dataclasses.fields(row_type)))
+        for row in rows:
+            stream.write(_tsv_line(to_jsonable(row).values()))
+            count += 1
+    elif fmt == OutputFormat.jsonl:
+        for row in rows:
+            stream.write(_json_line(to_jsonable(row)))
+            count += 1
+    else:
+        count = _write_json_array(rows, stream)
+        stream.write("\n")
+    return count
+
+
+def write_page(page: Any, rows_field: str, row_type: type, fmt: OutputFormat, stream: TextIO | None = None) -> None:
+    """
+    Strona listy (np. ListTransactionsResult): json -> cały obiekt z tablicą `rows_field`
+    pisaną wiersz po wierszu; jsonl/tsv -> same wiersze, a next_cursor na stderr.
+    """
+    stream = stream or sys.stdout
+    rows = getattr(page, rows_field)
+    if fmt != OutputFormat.json:
+        write_rows(rows, row_type, fmt, stream)
+        cursor = getattr(page, "next_cursor", None)
+        if cursor:
+            print(f"next_cursor={cursor}", file=sys.stderr)
+        return
+
+    stream.write("{")
+    for index, field in enumerate(dataclasses.fields(page)):
+        if index:
+            stream.write(", ")
+        stream.write(json.dumps(field.name) + ": ")
+        if field.name == rows_field:
+            _write_json_array(rows, stream)
+        else:
+            stream.write(json.dumps(to_jsonable(getattr(page, field.name)), ensure_ascii=False))
+    stream.write("}\n")
+
+
+def write_error(message: str, fmt: OutputFormat, error_type: str | None = None) -> None:
+    """Błąd na stderr w formacie wyjścia (stdout zostaje czysty dla potoku)."""
+    payload = {"error": message}
+    if error_type is not None:
+        payload["type"] = error_type
+    if fmt == OutputFormat.tsv:
+        sys.stderr.write(_tsv_line(payload.keys()) + _tsv_line(payload.values()))
+    else:
+        sys.stderr.write(_json_line(payload))
+
+
+def _write_json_array(rows: Iterable[Any], stream: TextIO) -> int:
+    count = 0
+    stream.write("[")
+    for row in rows:
+        stream.write(",\n" if count else "\n")
+        stream.write(json.dumps(to_jsonable(row), ensure_ascii=False))
+        count += 1
+    stream.write("\n]" if count else "]")
+    return count
+
+
+def _json_line(payload: Any) -> str:
+    return json.dumps(payload, ensure_ascii=False) + "\n"
+
+
+# TSV jak COPY ... TEXT w PostgreSQL: \t, \n, \r i \ escapowane, NULL jako pusta wartość
+_TSV_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _tsv_line(values: Iterable[Any]) -> str:
+    return "\t".join(_tsv_value(value) for value in values) + "\n"
+
+
+def _tsv_value(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value, ensure_ascii=False)
+    return str(value).translate(_TSV_ESCAPES)
@@ -0,0 +1,153 @@
+import io
+import os
+import shlex
+import socketserver
+import stat
+import sys
+import time
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import TextIO
+
+import click
+import typer
+
+EXIT_COMMANDS = {"exit", "quit"}
+PROMPT = "bank> "
+
+
+class CommandRunner:
+    """
+    Wykonuje linie w składni CLI (`balance -a ID`) na komendach aplikacji Typer w bieżącym procesie.
+
+    Engine, pula połączeń i zaimportowane moduły żyją przez całą sesję; każda
+    komenda dostaje własną sesję i transakcję (get_services), jak przy osobnym procesie.
+    Z output_format linie bez własnego `--format` dostają go na początku.
+    """
+
+    def __init__(
+        self,
+        app: typer.Typer,
+        prog_name: str = "bank",
+        timing: bool = False,
+        output_format: str | None = None,
+    ):
+        self._command = typer.main.get_command(app)
+        self._prog_name = prog_name
+        self._timing = timing
+        self._output_format = output_format
+
+    def run_line(self, line: str) -> bool:
+        """Wykonuje jedną linię; zwraca False, gdy sesja ma się zakończyć."""
+        line = line.strip()
+        if not line or line.startswith("#"):
+            return True
+        if line in EXIT_COMMANDS:
+            return False
+
+        try:
+            args = shlex.split(line)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return True
+        if args[0] == "shell":
+            print("Error: already in a shell", file=sys.stderr)
+            return True
+        if self._output_format is not None and not args[0].startswith("--format"):
+            args = ["--format", self._output_format, *args]
+
+        started = time.perf_counter()
+        try:
+            self._command.main(args=args, prog_name=self._prog_name, standalone_mode=False)
+        except click.ClickException as e:
+            e.show()
+        except click.Abort:
+            print("Aborted.", file=sys.stderr)
+        except Exception as e:
+            # błąd jednej komendy nie kończy sesji (transakcja już wycofana w get_services)
+            print(f"{type(e).__name__}: {e}", file=sys.stderr)
+        if self._timing:
+            # przy formacie maszynowym stdout zawiera tylko wyniki komend
+            timing_stream = sys.stderr if self._output_format is not None else sys.stdout
+            print(f"({(time.perf_counter() - started) * 1000:.1f} ms)", file=timing_stream)
+        return True
+
+
+def run_repl(runner: CommandRunner, stdin: TextIO = sys.stdin) -> None:
+    """Czyta komendy linia po linii; z terminala z promptem i historią (readline), z pliku/potoku bez."""
+    interactive = stdin.isatty()
+    if interactive:
+        try:
+            import readline  # noqa: F401  (historia i edycja linii dla input())
+        except ImportError:
+            pass
+
+    while True:
+        if interactive:
+            try:
+                line = input(PROMPT)
+            except EOFError:
+                print()
+                return
+            except KeyboardInterrupt:
+                print()
+                continue
+        else:
+            line = stdin.readline()
+            if not line:
+                return
+        if not runner.run_line(line):
+            return
+
+
+class _ShellRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for raw in self.rfile:
+            output = io.StringIO()
+            with redirect_stdout(output), redirect_stderr(output):
+                keep_going = self.server.runner.run_line(raw.decode("utf-8", errors="replace"))
+            self.wfile.write(output.getvalue().encode("utf-8"))
+            self.wfile.flush()
+            if not keep_going:
+                return
+
+
+class ShellSocketServer(socketserver.UnixStreamServer):
+    """
+    Demon na lokalnym gnieździe Unix: każda linia od klienta to komenda, odpowiedzią jest jej wyjście.
+
+    Komendy wykonujemy po kolei w jednym wątku (SQLite i tak ma jednego writera),
+    a przekierowanie stdout/stderr na czas komendy jest wtedy bezpieczne.
+    """
+
+    def __init__(self, path: Path, runner: CommandRunner):
+        self.path = Path(path)
+        self.runner = runner
+        _remove_stale_socket(self.path)
+        super().__init__(str(self.path), _ShellRequestHandler)
+        os.chmod(self.path, 0o600)
+
+    def server_close(self):
+        super().server_close()
+        _remove_stale_socket(self.path)
+
+
+def _remove_stale_socket(path: Path) -> None:
+    try:
+        mode = path.stat().st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"{path} exists and is not a socket")
+    path.unlink()
+
+
+def serve_socket(runner: CommandRunner, path: Path) -> None:
+    """Obsługuje klientów na gnieździe `path` aż do Ctrl+C."""
+    server = ShellSocketServer(path, runner)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -1,7 +1,28 @@
+import time
 from domain.ports.ports import Clock
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def to_epoch_us(value: datetime) -> int:
+    """datetime -> mikrosekundy od epoki Unix (naiwny datetime traktujemy jako UTC)."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - EPOCH) // _MICROSECOND
+
+
+def from_epoch_us(value: int) -> datetime:
+    """Mikrosekundy od epoki Unix -> datetime w UTC."""
+    return EPOCH + timedelta(microseconds=value)
+
 
 class SystemClock(Clock):
     def now(self):
         """Zwraca bieżący czas UTC."""
-        return datetime.now(timezone.utc)
\ No newline at end of file
+        return datetime.now(timezone.utc)
+
+    def now_us(self) -> int:
+        """Zwraca bieżący czas jako mikrosekundy od epoki (format kolumn *_us)."""
+        return time.time_ns() // 1000
@@ -0,0 +1,158 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable
+
+from config.config import GROUP_COMMIT_MAX_BATCH, GROUP_COMMIT_MAX_DELAY_MS
+
+_STOP = object()
+
+
+class GroupCommitExecutor:
+    """
+    Jeden wątek-writer wykonuje komendy z wielu wątków w jednej transakcji SQLite.
+
+    Każda komenda idzie w osobnym SAVEPOINT (błąd nie cofa sąsiadów), a COMMIT
+    leci raz na `max_batch` komend albo po `max_delay_ms` od pierwszej z nich.
+    Future dostaje wynik dopiero po udanym COMMIT, więc wynik oznacza trwały zapis.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable,
+        services_factory: Callable,
+        max_batch: int = GROUP_COMMIT_MAX_BATCH,
+        max_delay_ms: float = GROUP_COMMIT_MAX_DELAY_MS,
+    ):
+        if max_batch <= 0:
+            raise ValueError("max_batch must be positive")
+        self._session_factory = session_factory
+        self._services_factory = services_factory
+        self._max_batch = max_batch
+        self._max_delay = max_delay_ms / 1000
+        self._queue: queue.Queue = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._writer = threading.Thread(target=self._run, name="group-commit-writer", daemon=True)
+        self._writer.start()
+
+    def submit(self, use_case: str, cmd: Any) -> Future:
+        """Zleca `services.<use_case>.execute(cmd)`; zwraca Future z wynikiem lub błędem."""
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("GroupCommitExecutor is closed")
+            self._queue.put((use_case, cmd, future))
+        return future
+
+    def execute(self, use_case: str, cmd: Any, timeout: float | None = None) -> Any:
+        """Wersja blokująca submit()."""
+        return self.submit(use_case, cmd).result(timeout=timeout)
+
+    def close(self) -> None:
+        """Dokańcza zleconą pracę i zatrzymuje writera."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._writer.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _run(self) -> None:
+        batch: list[tuple[str, Any, Future]] = []
+        try:
+            stopping = False
+            while not stopping:
+                item = self._queue.get()
+                if item is _STOP:
+                    break
+
+                batch = [item]
+                deadline = time.monotonic() + self._max_delay
+                while len(batch) < self._max_batch:
+                    timeout = deadline - time.monotonic()
+                    try:
+                        item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stopping = True
+                        break
+                    batch.append(item)
+
+                self._commit_batch(batch)
+                batch = []
+        except BaseException as e:
+            # martwy writer nie może zostawić wiszących Future ani przyjmować nowych komend
+            self._abort(batch, e)
+            raise
+
+    def _abort(self, batch: list[tuple[str, Any, Future]], error: BaseException) -> None:
+        """Zamyka executor i kończy błędem bieżącą paczkę oraz wszystko, co czeka w kolejce."""
+        with self._lock:
+            self._closed = True
+            pending = list(batch)
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not _STOP:
+                    pending.append(item)
+
+        failure = RuntimeError("Group commit writer stopped unexpectedly")
+        failure.__cause__ = error
+        for _, _, future in pending:
+            if not future.done():
+                future.set_exception(failure)
+
+    def _commit_batch(self, batch: list[tuple[str, Any, Future]]) -> None:
+        outcomes: list[tuple[Future, Any, BaseException | None]] = []
+        session = None
+        try:
+            session = self._session_factory()
+            services = self._services_factory(session)
+            for use_case, cmd, future in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                savepoint = session.begin_nested()
+                try:
+                    result = getattr(services, use_case).execute(cmd)
+                except Exception as e:
+                    savepoint.rollback()
+                    outcomes.append((future, None, e))
+                else:
+                    savepoint.commit()
+                    outcomes.append((future, result, None))
+            session.commit()
+        except Exception as e:
+            # COMMIT (albo sama sesja) padł: nic z tej paczki nie jest trwałe.
+            if session is not None:
+                try:
+                    session.rollback()
+                except Exception:
+                    # połączenie i tak wraca do puli przez close(); Future muszą dostać błąd paczki
+                    pass
+            started = {future for future, _, _ in outcomes}
+            for future, _, error in outcomes:
+                future.set_exception(error or e)
+            for _, _, future in batch:
+                if future not in started and not future.cancelled():
+                    future.set_exception(e)
+            return
+        finally:
+            if session is not None:
+                session.close()
+
+        for future, result, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
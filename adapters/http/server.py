@@ -0,0 +1,217 @@
+import argparse
+import json
+import re
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+from db import ReadSessionLocal, SessionLocal
+from config.config import HTTP_HOST, HTTP_PORT
+from adapters.services import SHARDED, Services, ShardedServices, account_cache, shard_set
+from adapters.serialization import to_jsonable, from_jsonable
+
+from application.dto.requests import (
+    CreateAccountCommand,
+    DepositCommand,
+    WithdrawCommand,
+    TransferCommand,
+    GetBalanceCommand,
+    ListTransactionsCommand,
+    GetAccountSummaryCommand,
+    ListAccountsCommand,
+)
+from application import errors as app_errors
+from domain import errors as domain_errors
+
+
+# --------- routing --------- #
+
+# (metoda, wzorzec ścieżki) -> (use-case, klasa komendy)
+ROUTES = [
+    ("POST", re.compile(r"^/accounts$"), "create_account", CreateAccountCommand),
+    ("GET", re.compile(r"^/accounts$"), "list_accounts", ListAccountsCommand),
+    ("POST", re.compile(r"^/deposits$"), "deposit", DepositCommand),
+    ("POST", re.compile(r"^/withdrawals$"), "withdraw", WithdrawCommand),
+    ("POST", re.compile(r"^/transfers$"), "transfer", TransferCommand),
+    ("GET", re.compile(r"^/accounts/(?P<account_id>[^/]+)/balance$"), "get_balance", GetBalanceCommand),
+    ("GET", re.compile(r"^/accounts/(?P<account_id>[^/]+)/transactions$"), "list_transactions", ListTransactionsCommand),
+    ("GET", re.compile(r"^/accounts/(?P<account_id>[^/]+)/summary$"), "get_account_summary", GetAccountSummaryCommand),
+]
+
+ERROR_STATUSES = [
+    ((app_errors.AccountNotFoundError, app_errors.AccountNotFound,
+      domain_errors.AccountNotFoundError, domain_errors.AccountNotFound), HTTPStatus.NOT_FOUND),
+    ((app_errors.InvalidRequestError, app_errors.OwnerNameNotProvided,
+      domain_errors.InvalidRequestError, ValueError), HTTPStatus.BAD_REQUEST),
+    ((app_errors.AccountAlreadyExists, app_errors.TransactionAlreadyExists,
+      domain_errors.AccountAlreadyExists, domain_errors.TransactionAlreadyExists,
+      domain_errors.AccountVersionConflict), HTTPStatus.CONFLICT),
+    ((app_errors.DomainError, domain_errors.DomainError, domain_errors.ApplicationError),
+     HTTPStatus.UNPROCESSABLE_ENTITY),
+]
+
+
+def _status_for(error: Exception) -> HTTPStatus | None:
+    for error_types, status in ERROR_STATUSES:
+        if isinstance(error, error_types):
+            return status
+    return None
+
+
+class BankRequestHandler(BaseHTTPRequestHandler):
+    """Mapuje żądania HTTP/JSON na use-case'y; jedna sesja (checkout z puli) na żądanie."""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "MiniBank/1.0"
+    # nagłówki i body idą osobnymi write(); bez tego keep-alive łapie ~40 ms opóźnienia (Nagle + delayed ACK)
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if urlsplit(self.path).path == "/stats":
+            self._send_json(HTTPStatus.OK, self._stats())
+            return
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _dispatch(self, method: str) -> None:
+        url = urlsplit(self.path)
+        path_matched = False
+        for route_method, pattern, use_case, command_cls in ROUTES:
+            match = pattern.match(url.path)
+            if match is None:
+                continue
+            # ta sama ścieżka może mieć kilka metod (POST i GET /accounts)
+            if route_method != method:
+                path_matched = True
+                continue
+            try:
+                payload = self._read_payload(method, url.query)
+                payload.update(match.groupdict())
+                cmd = from_jsonable(command_cls, payload)
+                result = self._execute(use_case, cmd)
+            except Exception as e:
+                status = _status_for(e)
+                if status is None:
+                    self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"Unexpected error: {e}"})
+                    raise
+                self._send_json(status, {"error": str(e), "type": type(e).__name__})
+                return
+            status = HTTPStatus.CREATED if method == "POST" else HTTPStatus.OK
+            self._send_json(status, to_jsonable(result))
+            return
+
+        if path_matched:
+            self._send_json(HTTPStatus.METHOD_NOT_ALLOWED, {"error": "Method not allowed"})
+            return
+        self._send_json(HTTPStatus.NOT_FOUND, {"error": "Not found"})
+
+    def _execute(self, use_case: str, cmd):
+        executor = self.server.group_commit
+        if executor is not None and self.command != "GET":
+            return executor.execute(use_case, cmd)
+
+        if SHARDED:
+            session = shard_set().session()
+            read_session = None
+            services = ShardedServices(session)
+        else:
+            session = SessionLocal()
+            read_session = ReadSessionLocal()
+            services = Services(session, read_session=read_session)
+        try:
+            result = getattr(services, use_case).execute(cmd)
+            session.commit()
+            return result
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            if read_session is not None:
+                read_session.close()
+            session.close()
+
+    def _stats(self) -> dict:
+        """Liczniki procesu serwera: cache kont (None, gdy wyłączony)."""
+        if account_cache is None:
+            return {"account_cache": None}
+        stats = account_cache.stats()
+        return {"account_cache": {**to_jsonable(stats), "hit_ratio": stats.hit_ratio}}
+
+    def _read_payload(self, method: str, query: str) -> dict:
+        if method == "GET":
+            params = parse_qs(query)
+            payload = {key: values[-1] for key, values in params.items()}
+            # ?type=DEPOSIT&type=WITHDRAW -> type_filter
+            if "type" in params:
+                payload.pop("type")
+                payload["type_filter"] = params["type"]
+            return payload
+
+        length = int(self.headers.get("Content-Length") or 0)
+        if length == 0:
+            return {}
+        try:
+            payload = json.loads(self.rfile.read(length))
+        except ValueError:
+            raise ValueError("Request body is not valid JSON")
+        if not isinstance(payload, dict):
+            raise ValueError("Request body must be a JSON object")
+        return payload
+
+    def _send_json(self, status: HTTPStatus, body) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class BankHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, group_commit=None, verbose: bool = False):
+        super().__init__(address, BankRequestHandler)
+        self.group_commit = group_commit
+        self.verbose = verbose
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Mini Bank HTTP/JSON server")
+    parser.add_argument("--host", default=HTTP_HOST)
+    parser.add_argument("--port", type=int, default=HTTP_PORT)
+    parser.add_argument("--group-commit", action="store_true", help="Coalesce writes into group commits")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args(argv)
+
+    if SHARDED:
+        if args.group_commit:
+            parser.error("--group-commit is not supported with BANK_SHARD_COUNT >= 2")
+        # dokończ przelewy między shardami przerwane poprzednią awarią
+        shard_set().recover()
+
+    group_commit = None
+    if args.group_commit:
+        from adapters.group_commit.group_commit_executor import GroupCommitExecutor
+        group_commit = GroupCommitExecutor(SessionLocal, Services)
+
+    server = BankHTTPServer((args.host, args.port), group_commit=group_commit, verbose=args.verbose)
+    print(f"Serving on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if group_commit is not None:
+            group_commit.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,6 @@
+import os
+import threading
+import time
 import uuid
 from domain.ports.ports import IdProvider
 
@@ -5,4 +8,54 @@ class UUIDIdProvider(IdProvider):
     name = "uuid4"
 
     def generate_id(self) -> str:
-        return str(uuid.uuid4())
\ No newline at end of file
+        return str(uuid.uuid4())
+
+    def generate_ids(self, count: int) -> list[str]:
+        return [str(uuid.uuid4()) for _ in range(count)]
+
+
+class UUID7IdProvider(IdProvider):
+    """
+    UUIDv7 (RFC 9562): 48 bitów milisekund od epoki, 12-bitowy licznik, 62 bity losowe.
+
+    Kolejne ID rosną także w obrębie jednej milisekundy (licznik startuje od losowej
+    wartości z zapasem, a po przepełnieniu pożycza następną milisekundę), więc nowe
+    wiersze trafiają na prawą krawędź indeksu PK zamiast w losowe strony B-drzewa.
+    Jedna instancja na proces; bezpieczna dla wątków.
+    """
+
+    name = "uuid7"
+
+    _COUNTER_MAX = 0xFFF
+    _RAND_B_MASK = (1 << 62) - 1
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._counter = 0
+
+    def generate_id(self) -> str:
+        return self.generate_ids(1)[0]
+
+    def generate_ids(self, count: int) -> list[str]:
+        """Zwraca `count` rosnących ID; losowość pobierana jednym odczytem z os.urandom."""
+        random_bytes = os.urandom(8 * count)
+        ids = []
+        with self._lock:
+            for i in range(count):
+                rand_b = int.from_bytes(random_bytes[8 * i:8 * i + 8], "big") & self._RAND_B_MASK
+                ids.append(str(uuid.UUID(int=self._next_prefix() | rand_b)))
+        return ids
+
+    def _next_prefix(self) -> int:
+        ms = time.time_ns() // 1_000_000
+        if ms > self._last_ms:
+            self._last_ms = ms
+            # losowy start w dolnej połowie zakresu zostawia miejsce na >= 2048 ID w tej milisekundzie
+            self._counter = int.from_bytes(os.urandom(2), "big") & 0x7FF
+        else:
+            self._counter += 1
+            if self._counter > self._COUNTER_MAX:
+                self._last_ms += 1
+                self._counter = 0
+        return (self._last_ms << 80) | (0x7 << 76) | (self._counter << 64) | (0b10 << 62)
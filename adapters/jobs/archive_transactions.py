@@ -0,0 +1,163 @@
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from adapters.repositories.transaction_repository import _to_db_timestamp
+
+# Przenoszenie transakcji starszych niż cutoff z transactions do archive.transactions.
+#
+# Konta idą po kolei (account_id malejąco, wstecz po indeksie (account_id, created_at, tx_id)),
+# a w koncie od najstarszych, porcjami po chunk_size. Porcja to dwie krótkie transakcje:
+#   1. INSERT OR IGNORE do archiwum (COMMIT pliku archiwum),
+#   2. saldo otwarcia w account_checkpoints + DELETE z gorącej tabeli (COMMIT pliku głównego).
+# W WAL COMMIT obejmujący dwa pliki nie jest atomowy, dlatego kroki są rozdzielone i
+# kasujemy tylko wiersze, które już są w archiwum: przerwany job zostawia co najwyżej
+# duplikaty (ukryte za granicą checkpointu) i można go po prostu uruchomić ponownie.
+
+COLUMNS = (
+    "tx_id, account_id, type, amount, currency, created_at, related_account_id, note, amount_minor, created_at_us"
+)
+
+SELECT_CHUNK_SQL = """
+    SELECT account_id, created_at, tx_id
+    FROM main.transactions
+    WHERE created_at < :cutoff
+    ORDER BY account_id DESC, created_at ASC, tx_id ASC
+    LIMIT :limit
+"""
+
+SELECT_NEXT_CHUNK_SQL = """
+    SELECT account_id, created_at, tx_id
+    FROM main.transactions
+    WHERE account_id <= :last_account AND created_at < :cutoff
+    ORDER BY account_id DESC, created_at ASC, tx_id ASC
+    LIMIT :limit
+"""
+
+# wiersze jednego konta z porcji: starsze niż cutoff i nie dalej niż ostatni wiersz porcji
+CHUNK_ROWS = """
+    account_id = :account_id
+    AND created_at < :cutoff
+    AND (created_at, tx_id) <= (:boundary_created_at, :boundary_tx_id)
+"""
+
+COPY_TO_ARCHIVE_SQL = f"""
+    INSERT OR IGNORE INTO archive.transactions ({COLUMNS})
+    SELECT {COLUMNS} FROM main.transactions
+    WHERE {CHUNK_ROWS}
+"""
+
+ARCHIVED = "EXISTS (SELECT 1 FROM archive.transactions a WHERE a.tx_id = t.tx_id)"
+
+UPSERT_CHECKPOINT_SQL = f"""
+    INSERT INTO account_checkpoints (
+        account_id, balance_minor, tx_count, boundary_created_at, boundary_tx_id, updated_at
+    )
+    SELECT
+        account_id,
+        SUM(
+            CASE
+                WHEN type = 'DEPOSIT' THEN COALESCE(amount_minor, CAST(ROUND(amount * 100) AS INTEGER))
+                WHEN type = 'WITHDRAW' THEN -COALESCE(amount_minor, CAST(ROUND(amount * 100) AS INTEGER))
+                ELSE 0
+            END
+        ),
+        COUNT(*),
+        :boundary_created_at,
+        :boundary_tx_id,
+        :updated_at
+    FROM main.transactions t
+    WHERE {CHUNK_ROWS} AND {ARCHIVED}
+    GROUP BY account_id
+    ON CONFLICT (account_id) DO UPDATE SET
+        balance_minor = balance_minor + excluded.balance_minor,
+        tx_count = tx_count + excluded.tx_count,
+        boundary_created_at = excluded.boundary_created_at,
+        boundary_tx_id = excluded.boundary_tx_id,
+        updated_at = excluded.updated_at
+"""
+
+DELETE_ARCHIVED_SQL = f"""
+    DELETE FROM main.transactions AS t
+    WHERE {CHUNK_ROWS} AND {ARCHIVED}
+"""
+
+
+@dataclass
+class ArchiveReport:
+    moved: int = 0
+    accounts: int = 0
+    chunks: int = 0
+    elapsed: float = 0.0
+
+
+def archive_transactions(
+    engine: Engine,
+    cutoff: datetime,
+    chunk_size: int = 5000,
+    on_chunk: Callable[[ArchiveReport], None] | None = None,
+) -> ArchiveReport:
+    """
+    Przenosi transakcje z created_at < cutoff do archive.transactions porcjami.
+
+    Silnik musi mieć podpięte archiwum (install_sqlite_hooks(archive_path=...)).
+    Saldo ledgera (account_balances) się nie zmienia; historia w repozytoriach
+    sięga do archiwum, gdy zapytanie wychodzi przed granicę z account_checkpoints.
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+
+    started = time.perf_counter()
+    report = ArchiveReport()
+    cutoff_db = _to_db_timestamp(cutoff)
+    last_account = None
+    seen_accounts = set()
+
+    while True:
+        # odczyt poza transakcją zapisu: zapis zaczyna się od INSERT, więc nie trafi na BUSY_SNAPSHOT
+        with engine.connect() as conn:
+            if last_account is None:
+                rows = conn.execute(text(SELECT_CHUNK_SQL), {"cutoff": cutoff_db, "limit": chunk_size}).all()
+            else:
+                rows = conn.execute(
+                    text(SELECT_NEXT_CHUNK_SQL),
+                    {"cutoff": cutoff_db, "last_account": last_account, "limit": chunk_size},
+                ).all()
+        if not rows:
+            break
+
+        # wiersze konta w porcji są rosnące, więc ostatni wyznacza granicę
+        boundaries: dict = {}
+        for account_id, created_at, tx_id in rows:
+            boundaries[account_id] = (created_at, tx_id)
+        params = [
+            {
+                "account_id": account_id,
+                "cutoff": cutoff_db,
+                "boundary_created_at": created_at,
+                "boundary_tx_id": tx_id,
+                "updated_at": datetime.now(timezone.utc).isoformat(),
+            }
+            for account_id, (created_at, tx_id) in boundaries.items()
+        ]
+
+        with engine.begin() as conn:
+            conn.execute(text(COPY_TO_ARCHIVE_SQL), params)
+        with engine.begin() as conn:
+            conn.execute(text(UPSERT_CHECKPOINT_SQL), params)
+            report.moved += conn.execute(text(DELETE_ARCHIVED_SQL), params).rowcount
+
+        seen_accounts.update(boundaries)
+        last_account = rows[-1][0]
+        report.accounts = len(seen_accounts)
+        report.chunks += 1
+        report.elapsed = time.perf_counter() - started
+        if on_chunk is not None:
+            on_chunk(report)
+
+    report.elapsed = time.perf_counter() - started
+    return report
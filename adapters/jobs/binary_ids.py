@@ -0,0 +1,78 @@
+import sqlite3
+import uuid
+
+from sqlalchemy.engine import Engine
+
+# Jednorazowa konwersja ID z tekstu UUID na 16-bajtowe BLOB-y (BANK_ID_STORAGE=blob).
+#
+# W odróżnieniu od backfilli kwot i czasu to migracja offline: zmienia klucze główne
+# i obce naraz, więc idzie w jednej transakcji z wyłączonymi foreign_keys (inaczej
+# każdy UPDATE konta łamałby referencje z transactions) i kończy się
+# foreign_key_check. Aplikację trzeba zatrzymać na czas migracji i uruchomić już
+# z BANK_ID_STORAGE=blob.
+
+# (tabela, kolumna) wszystkich kolumn z ID kont i transakcji
+ID_COLUMNS = (
+    ("accounts", "account_id"),
+    ("transactions", "tx_id"),
+    ("transactions", "account_id"),
+    ("transactions", "related_account_id"),
+    ("account_balances", "account_id"),
+    ("account_checkpoints", "account_id"),
+    ("account_checkpoints", "boundary_tx_id"),
+    ("account_daily_totals", "account_id"),
+)
+
+# to samo w bazie archiwum, jeśli jest podpięta (BANK_ARCHIVE_PATH)
+ARCHIVE_ID_COLUMNS = (
+    ("archive.transactions", "tx_id"),
+    ("archive.transactions", "account_id"),
+    ("archive.transactions", "related_account_id"),
+)
+
+
+def _uuid_to_blob(value: str) -> bytes:
+    return uuid.UUID(value).bytes
+
+
+def convert_ids_to_blob(engine: Engine, vacuum: bool = False) -> dict[str, int]:
+    """
+    Zamienia tekstowe UUID na BLOB we wszystkich kolumnach ID; zwraca liczbę zmienionych wartości per kolumna.
+
+    Rzuca ValueError (i nic nie zmienia), gdy któreś ID nie jest UUID albo referencje się nie zgadzają.
+    """
+    raw = engine.raw_connection()
+    conn: sqlite3.Connection = raw.driver_connection
+    converted: dict[str, int] = {}
+    try:
+        conn.create_function("uuid_to_blob", 1, _uuid_to_blob, deterministic=True)
+        # PRAGMA foreign_keys działa tylko poza transakcją
+        conn.execute("PRAGMA foreign_keys=OFF")
+        attached = {row[1] for row in conn.execute("PRAGMA database_list")}
+        columns = ID_COLUMNS + (ARCHIVE_ID_COLUMNS if "archive" in attached else ())
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for table, column in columns:
+                cursor = conn.execute(
+                    f"UPDATE {table} SET {column} = uuid_to_blob({column}) WHERE typeof({column}) = 'text'"
+                )
+                converted[f"{table}.{column}"] = cursor.rowcount
+            violations = conn.execute("PRAGMA foreign_key_check").fetchall()
+            if violations:
+                raise ValueError(f"{len(violations)} foreign key violations after conversion")
+            conn.execute("COMMIT")
+        except sqlite3.OperationalError as e:
+            conn.execute("ROLLBACK")
+            raise ValueError(f"Cannot convert ids to BLOB (non-UUID id?): {e}") from e
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.execute("PRAGMA foreign_keys=ON")
+
+        if vacuum:
+            # zwalnia strony po krótszych kluczach i przebudowuje indeksy
+            conn.execute("VACUUM")
+    finally:
+        raw.close()
+    return converted
@@ -0,0 +1,127 @@
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+# Backfill account_daily_totals (migracja 7) na działającej bazie.
+#
+# Sumy nie są dopisywane przyrostowo po rowid, tylko liczone od nowa per konto: porcja
+# kont to jedna transakcja zapisu (DELETE sum konta, INSERT ... SELECT z całej historii,
+# daily_totals_ready = 1). Zaczyna się od zapisu, więc widzi stan po ostatnim COMMIT
+# i żaden append nie wejdzie w środek; wynik jest dokładny także wtedy, gdy aplikacja
+# w tym czasie dopisuje transakcje, a przerwany job można po prostu uruchomić ponownie.
+# Konta z zarchiwizowaną historią wymagają podpiętego archiwum (BANK_ARCHIVE_PATH),
+# inaczej zostają na później.
+
+# pierwsze konto porcji: '' jest mniejsze od każdego ID (tekst i BLOB)
+SELECT_PENDING_SQL = """
+    SELECT b.account_id
+    FROM account_balances b
+    WHERE b.account_id > :last_account AND b.daily_totals_ready = 0
+    {archived_filter}
+    ORDER BY b.account_id
+    LIMIT :limit
+"""
+
+WITHOUT_ARCHIVED_HISTORY = (
+    "AND NOT EXISTS (SELECT 1 FROM account_checkpoints c WHERE c.account_id = b.account_id)"
+)
+
+HOT_HISTORY_SQL = """
+    SELECT account_id, created_at, currency, type, amount, amount_minor
+    FROM main.transactions
+    WHERE account_id IN ({accounts})
+"""
+
+# z archiwum tylko wiersze do granicy salda otwarcia (jak historia w repozytoriach)
+ARCHIVED_HISTORY_SQL = """
+    SELECT t.account_id, t.created_at, t.currency, t.type, t.amount, t.amount_minor
+    FROM archive.transactions t
+    JOIN account_checkpoints c ON c.account_id = t.account_id
+    WHERE t.account_id IN ({accounts})
+    AND (t.created_at, t.tx_id) <= (c.boundary_created_at, c.boundary_tx_id)
+"""
+
+DELETE_TOTALS_SQL = "DELETE FROM account_daily_totals WHERE account_id IN ({accounts})"
+
+# date(created_at) normalizuje przesunięcie strefy do UTC, tak jak utc_day() przy append
+INSERT_TOTALS_SQL = """
+    INSERT INTO account_daily_totals (account_id, day, currency, inflow_minor, outflow_minor, tx_count)
+    SELECT
+        account_id,
+        date(created_at),
+        currency,
+        SUM(CASE WHEN type = 'DEPOSIT' THEN COALESCE(amount_minor, CAST(ROUND(amount * 100) AS INTEGER)) ELSE 0 END),
+        SUM(CASE WHEN type = 'WITHDRAW' THEN COALESCE(amount_minor, CAST(ROUND(amount * 100) AS INTEGER)) ELSE 0 END),
+        COUNT(*)
+    FROM ({history})
+    GROUP BY account_id, date(created_at), currency
+"""
+
+MARK_READY_SQL = "UPDATE account_balances SET daily_totals_ready = 1 WHERE account_id IN ({accounts})"
+
+REMAINING_SQL = "SELECT COUNT(*) FROM account_balances WHERE daily_totals_ready = 0"
+
+
+@dataclass
+class DailyTotalsBackfillReport:
+    accounts: int = 0
+    days: int = 0
+    remaining: int = 0
+    chunks: int = 0
+    elapsed: float = 0.0
+
+
+def backfill_daily_totals(
+    engine: Engine,
+    chunk_size: int = 200,
+    on_chunk: Callable[[DailyTotalsBackfillReport], None] | None = None,
+) -> DailyTotalsBackfillReport:
+    """
+    Liczy account_daily_totals z historii dla kont z daily_totals_ready = 0, po chunk_size kont na COMMIT.
+
+    remaining w raporcie to konta, które nadal czekają (zarchiwizowana historia bez podpiętego archiwum).
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+
+    started = time.perf_counter()
+    report = DailyTotalsBackfillReport()
+
+    with engine.connect() as conn:
+        attached = {row[1] for row in conn.exec_driver_sql("PRAGMA database_list")}
+    archive = "archive" in attached
+    select_pending = text(SELECT_PENDING_SQL.format(archived_filter="" if archive else WITHOUT_ARCHIVED_HISTORY))
+
+    last_account = ""
+    while True:
+        # odczyt poza transakcją zapisu: zapis zaczyna się od DELETE, więc nie trafi na BUSY_SNAPSHOT
+        with engine.connect() as conn:
+            accounts = conn.execute(select_pending, {"last_account": last_account, "limit": chunk_size}).scalars().all()
+        if not accounts:
+            break
+
+        params = {f"account_{i}": account_id for i, account_id in enumerate(accounts)}
+        placeholders = ", ".join(f":{name}" for name in params)
+        history = HOT_HISTORY_SQL
+        if archive:
+            history += " UNION ALL " + ARCHIVED_HISTORY_SQL
+        history = history.format(accounts=placeholders)
+
+        with engine.begin() as conn:
+            conn.execute(text(DELETE_TOTALS_SQL.format(accounts=placeholders)), params)
+            report.days += conn.execute(text(INSERT_TOTALS_SQL.format(history=history)), params).rowcount
+            report.accounts += conn.execute(text(MARK_READY_SQL.format(accounts=placeholders)), params).rowcount
+
+        last_account = accounts[-1]
+        report.chunks += 1
+        if on_chunk is not None:
+            on_chunk(report)
+
+    with engine.connect() as conn:
+        report.remaining = conn.execute(text(REMAINING_SQL)).scalar_one()
+
+    report.elapsed = time.perf_counter() - started
+    return report
@@ -0,0 +1,81 @@
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from adapters.clock.system_clock import to_epoch_us
+from adapters.jobs.rowid_chunks import rowid_ranges
+
+# Backfill kolumn *_us (migracja 5) na działającej bazie.
+#
+# Tekst ISO-8601 parsujemy w Pythonie (datetime.fromisoformat), bo SQLite liczy
+# julianday z dokładnością do milisekund, a keyset potrzebuje pełnych mikrosekund.
+# Porcja = jedna krótka transakcja; aktualizujemy tylko wiersze z NULL, więc job
+# można przerwać i wznowić. BANK_TIMESTAMP_STORAGE=epoch_us włączać dopiero, gdy
+# `remaining` spadnie do zera.
+
+# (tabela, kolumna tekstowa, kolumna *_us)
+BACKFILL_COLUMNS = (
+    ("transactions", "created_at", "created_at_us"),
+    ("accounts", "created_at", "created_at_us"),
+    ("accounts", "updated_at", "updated_at_us"),
+)
+
+
+@dataclass
+class EpochBackfillReport:
+    updated: dict[str, int]
+    remaining: dict[str, int]
+    chunks: int = 0
+    elapsed: float = 0.0
+
+
+def backfill_epoch_timestamps(
+    engine: Engine,
+    chunk_size: int = 5000,
+    on_chunk: Callable[[str, int, int], None] | None = None,
+) -> EpochBackfillReport:
+    """
+    Uzupełnia created_at_us / updated_at_us z kolumn ISO-8601 porcjami po rowid.
+
+    on_chunk(tabela.kolumna, rowid końca porcji, max rowid) pozwala raportować postęp.
+    """
+    started = time.perf_counter()
+    report = EpochBackfillReport(updated={}, remaining={})
+
+    for table, iso_column, us_column in BACKFILL_COLUMNS:
+        label = f"{table}.{us_column}"
+        report.updated[label] = 0
+        select_sql = text(
+            f"SELECT rowid, {iso_column} FROM {table} "
+            f"WHERE rowid > :start AND rowid <= :stop AND {us_column} IS NULL"
+        )
+        update_sql = text(
+            f"UPDATE {table} SET {us_column} = :value WHERE rowid = :rowid AND {us_column} IS NULL"
+        )
+
+        for start, stop, max_rowid in rowid_ranges(engine, table, chunk_size):
+            # odczyt poza transakcją zapisu: zapis zaczyna się od UPDATE, więc nie trafi na BUSY_SNAPSHOT
+            with engine.connect() as conn:
+                rows = conn.execute(select_sql, {"start": start, "stop": stop}).all()
+            if rows:
+                params = [
+                    {"rowid": rowid, "value": to_epoch_us(datetime.fromisoformat(value))}
+                    for rowid, value in rows
+                ]
+                with engine.begin() as conn:
+                    report.updated[label] += conn.execute(update_sql, params).rowcount
+            report.chunks += 1
+            if on_chunk is not None:
+                on_chunk(label, stop, max_rowid)
+
+        with engine.connect() as conn:
+            report.remaining[label] = conn.execute(
+                text(f"SELECT COUNT(*) FROM {table} WHERE {us_column} IS NULL")
+            ).scalar_one()
+
+    report.elapsed = time.perf_counter() - started
+    return report
@@ -0,0 +1,97 @@
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from adapters.jobs.rowid_chunks import rowid_ranges
+
+# Backfill kolumn *_minor (migracja 4) na działającej bazie.
+#
+# Każda porcja to osobna, krótka transakcja zapisu, więc pisarze czekają najwyżej na
+# jedną porcję (busy_timeout), a przerwany job można po prostu uruchomić ponownie:
+# aktualizowane są tylko wiersze z NULL. Zakłada, że wszystkie procesy piszące działają
+# już na kodzie, który zapisuje *_minor przy każdym INSERT/UPDATE (inaczej nowe wiersze
+# znowu będą miały NULL).
+
+BACKFILL_TRANSACTIONS_SQL = """
+    UPDATE transactions
+    SET amount_minor = CAST(ROUND(amount * 100) AS INTEGER)
+    WHERE rowid > :start AND rowid <= :stop AND amount_minor IS NULL
+"""
+
+BACKFILL_ACCOUNTS_SQL = """
+    UPDATE accounts
+    SET balance_minor = CAST(ROUND(balance * 100) AS INTEGER)
+    WHERE rowid > :start AND rowid <= :stop AND balance_minor IS NULL
+"""
+
+# Saldo ledgera liczymy od nowa z historii w groszach, a nie z (zaokrąglanej) kolumny balance.
+BACKFILL_LEDGER_SQL = """
+    UPDATE account_balances
+    SET balance_minor = (
+        SELECT COALESCE(SUM(
+            CASE
+                WHEN t.type = 'DEPOSIT' THEN COALESCE(t.amount_minor, CAST(ROUND(t.amount * 100) AS INTEGER))
+                WHEN t.type = 'WITHDRAW' THEN -COALESCE(t.amount_minor, CAST(ROUND(t.amount * 100) AS INTEGER))
+                ELSE 0
+            END
+        ), 0)
+        FROM transactions t
+        WHERE t.account_id = account_balances.account_id
+    ) + COALESCE((
+        SELECT c.balance_minor FROM account_checkpoints c WHERE c.account_id = account_balances.account_id
+    ), 0)
+    WHERE rowid > :start AND rowid <= :stop AND balance_minor IS NULL
+"""
+
+# Wiersze ledgera, w których stara kolumna NUMERIC rozjechała się z sumą w groszach.
+LEDGER_DRIFT_SQL = """
+    SELECT COUNT(*)
+    FROM account_balances
+    WHERE balance_minor IS NOT NULL AND balance_minor != CAST(ROUND(balance * 100) AS INTEGER)
+"""
+
+# Kolejność ma znaczenie: ledger liczy się z już uzupełnionych transakcji.
+BACKFILL_STEPS = (
+    ("transactions", BACKFILL_TRANSACTIONS_SQL),
+    ("accounts", BACKFILL_ACCOUNTS_SQL),
+    ("account_balances", BACKFILL_LEDGER_SQL),
+)
+
+
+@dataclass
+class MinorUnitsBackfillReport:
+    updated: dict[str, int]
+    chunks: int = 0
+    ledger_drift: int = 0
+    elapsed: float = 0.0
+
+
+def backfill_minor_units(
+    engine: Engine,
+    chunk_size: int = 5000,
+    on_chunk: Callable[[str, int, int], None] | None = None,
+) -> MinorUnitsBackfillReport:
+    """
+    Uzupełnia amount_minor / balance_minor porcjami po rowid; zwraca liczbę zmienionych wierszy per tabela.
+
+    on_chunk(tabela, rowid końca porcji, max rowid) pozwala raportować postęp.
+    """
+    started = time.perf_counter()
+    report = MinorUnitsBackfillReport(updated={table: 0 for table, _ in BACKFILL_STEPS})
+
+    for table, sql in BACKFILL_STEPS:
+        for start, stop, max_rowid in rowid_ranges(engine, table, chunk_size):
+            with engine.begin() as conn:
+                report.updated[table] += conn.execute(text(sql), {"start": start, "stop": stop}).rowcount
+            report.chunks += 1
+            if on_chunk is not None:
+                on_chunk(table, stop, max_rowid)
+
+    with engine.connect() as conn:
+        report.ledger_drift = conn.execute(text(LEDGER_DRIFT_SQL)).scalar_one()
+
+    report.elapsed = time.perf_counter() - started
+    return report
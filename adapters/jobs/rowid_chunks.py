@@ -0,0 +1,24 @@
+from collections.abc import Iterator
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+
+def rowid_ranges(engine: Engine, table: str, chunk_size: int) -> Iterator[tuple[int, int, int]]:
+    """
+    Dzieli tabelę na zakresy rowid (start, stop], zwraca (start, stop, max_rowid).
+
+    max_rowid czytamy raz na starcie: wiersze dopisane w trakcie joba pisze już
+    nowy kod, więc nie wymagają backfillu.
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+
+    with engine.connect() as conn:
+        max_rowid = conn.execute(text(f"SELECT COALESCE(MAX(rowid), 0) FROM {table}")).scalar_one()
+
+    start = 0
+    while start < max_rowid:
+        stop = min(start + chunk_size, max_rowid)
+        yield start, stop, max_rowid
+        start = stop
@@ -0,0 +1,175 @@
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy.engine import Engine
+
+from adapters.repositories.ids import id_from_db, id_to_db
+from adapters.repositories.transaction_repository import _to_db_timestamp
+from domain.types.currency import CurrencyType
+
+# Kolumny raportowe wyłącznie jako liczby całkowite, żeby porcja z fetchmany trafiała
+# do NumPy jednym np.array(rows, int64): konto jako accounts.rowid, waluta jako indeks
+# w CURRENCIES, kwota w groszach ze znakiem ledgera (DEPOSIT +, WITHDRAW -, reszta 0),
+# czas w mikrosekundach od epoki. Wiersze sprzed `migrate-money` / `migrate-timestamps`
+# są przeliczane w SQL (created_at z julianday, z dokładnością do ~ms).
+
+CURRENCIES = tuple(CurrencyType)
+
+_CURRENCY_CODE = (
+    "CASE t.currency "
+    + " ".join(f"WHEN '{currency.value}' THEN {code}" for code, currency in enumerate(CURRENCIES))
+    + " ELSE -1 END"
+)
+
+_COLUMNS = f"""
+    a.rowid,
+    {_CURRENCY_CODE},
+    CASE t.type
+        WHEN 'DEPOSIT' THEN COALESCE(t.amount_minor, CAST(ROUND(t.amount * 100) AS INTEGER))
+        WHEN 'WITHDRAW' THEN -COALESCE(t.amount_minor, CAST(ROUND(t.amount * 100) AS INTEGER))
+        ELSE 0
+    END,
+    COALESCE(t.created_at_us, CAST(ROUND((julianday(t.created_at) - 2440587.5) * 86400000000) AS INTEGER))
+"""
+
+# CROSS JOIN ustala kolejność pętli: transakcje czytane po kolei, a konto dobierane z indeksu PK.
+# Przy zwykłym JOIN planer idzie po accounts i czyta transakcje indeksem konta, czyli losowo
+# po tabeli (300k wierszy w cache stron: ~1.3 s zamiast ~0.75 s).
+HOT_ROWS_SQL = f"""
+    SELECT {_COLUMNS}
+    FROM transactions t
+    CROSS JOIN accounts a ON a.account_id = t.account_id
+    WHERE 1 = 1
+"""
+
+# z archiwum tylko wiersze do granicy salda otwarcia (jak w list_for_account)
+ARCHIVED_ROWS_SQL = f"""
+    SELECT {_COLUMNS}
+    FROM archive.transactions t
+    CROSS JOIN account_checkpoints c ON c.account_id = t.account_id
+    CROSS JOIN accounts a ON a.account_id = t.account_id
+    WHERE (t.created_at, t.tx_id) <= (c.boundary_created_at, c.boundary_tx_id)
+"""
+
+CHECKPOINT_BALANCE_SQL = """
+    SELECT COALESCE(SUM(c.balance_minor), 0)
+    FROM account_checkpoints c
+    JOIN accounts a ON a.account_id = c.account_id
+    WHERE a.rowid = ?
+"""
+
+
+@dataclass(frozen=True)
+class TransactionColumns:
+    """Porcja transakcji jako kolumny int64 tej samej długości."""
+    account: np.ndarray
+    currency: np.ndarray
+    amount_minor: np.ndarray
+    created_at_us: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.account)
+
+    def select(self, mask: np.ndarray) -> "TransactionColumns":
+        return TransactionColumns(
+            self.account[mask], self.currency[mask], self.amount_minor[mask], self.created_at_us[mask]
+        )
+
+
+class ColumnarSource:
+    """
+    Czyta transakcje porcjami po chunk_size wierszy, w jednej transakcji odczytu (jeden snapshot).
+
+    Silnik powinien być read_engine: z podpiętym archiwum (BANK_ARCHIVE_PATH) do gorącej
+    tabeli dochodzi archive.transactions; bez niego zarchiwizowaną historię reprezentuje
+    tylko saldo otwarcia z account_checkpoints (zob. opening_balance_minor).
+    """
+
+    def __init__(self, engine: Engine, chunk_size: int = 65536, binary_ids: bool = False):
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        self._engine = engine
+        self._chunk_size = chunk_size
+        self._binary_ids = binary_ids
+
+    def chunks(
+        self,
+        account_id: str | None = None,
+        currency: CurrencyType | None = None,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+    ) -> Iterator[TransactionColumns]:
+        """Porcje transakcji spełniających filtry (date_from włącznie, date_to wyłącznie)."""
+        conditions, params = self._filters(account_id, currency, date_from, date_to)
+        with self._engine.connect() as conn, conn.begin():
+            raw = conn.connection.driver_connection
+            sources = [HOT_ROWS_SQL]
+            if _archive_attached(raw):
+                sources.insert(0, ARCHIVED_ROWS_SQL)
+            for sql in sources:
+                cursor = raw.execute(sql + conditions, params)
+                try:
+                    while rows := cursor.fetchmany(self._chunk_size):
+                        block = np.array(rows, dtype=np.int64)
+                        yield TransactionColumns(block[:, 0], block[:, 1], block[:, 2], block[:, 3])
+                finally:
+                    cursor.close()
+
+    def account_code(self, account_id: str) -> int | None:
+        """accounts.rowid konta (kod konta w kolumnach) albo None."""
+        with self._engine.connect() as conn:
+            raw = conn.connection.driver_connection
+            row = raw.execute(
+                "SELECT rowid FROM accounts WHERE account_id = ?", (self._id_to_db(account_id),)
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def opening_balance_minor(self, account_code: int) -> int:
+        """Saldo otwarcia z checkpointu, gdy archiwum nie jest podpięte (inaczej jego wiersze są w chunks)."""
+        with self._engine.connect() as conn:
+            raw = conn.connection.driver_connection
+            if _archive_attached(raw):
+                return 0
+            return raw.execute(CHECKPOINT_BALANCE_SQL, (account_code,)).fetchone()[0]
+
+    def account_ids(self, codes: np.ndarray) -> dict[int, str]:
+        """Mapa accounts.rowid -> account_id dla kodów z wyniku (zapytania po 500 kodów)."""
+        unique = np.unique(codes).tolist()
+        mapping: dict[int, str] = {}
+        with self._engine.connect() as conn:
+            raw = conn.connection.driver_connection
+            for start in range(0, len(unique), 500):
+                batch = unique[start:start + 500]
+                placeholders = ", ".join("?" * len(batch))
+                for rowid, account_id in raw.execute(
+                    f"SELECT rowid, account_id FROM accounts WHERE rowid IN ({placeholders})", batch
+                ):
+                    mapping[rowid] = id_from_db(account_id)
+        return mapping
+
+    def _filters(self, account_id, currency, date_from, date_to) -> tuple[str, list]:
+        conditions = ""
+        params: list = []
+        if account_id is not None:
+            conditions += " AND t.account_id = ?"
+            params.append(self._id_to_db(account_id))
+        if currency is not None:
+            conditions += " AND t.currency = ?"
+            params.append(currency.value)
+        # created_at (ISO) jest wypełnione w obu trybach zapisu czasu
+        if date_from is not None:
+            conditions += " AND t.created_at >= ?"
+            params.append(_to_db_timestamp(date_from))
+        if date_to is not None:
+            conditions += " AND t.created_at < ?"
+            params.append(_to_db_timestamp(date_to))
+        return conditions, params
+
+    def _id_to_db(self, account_id: str):
+        return id_to_db(account_id, self._binary_ids)
+
+
+def _archive_attached(raw) -> bool:
+    return any(row[1] == "archive" for row in raw.execute("PRAGMA database_list"))
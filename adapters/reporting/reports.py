@@ -0,0 +1,349 @@
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import numpy as np
+
+from adapters.clock.system_clock import to_epoch_us
+from adapters.repositories.money import from_minor
+from adapters.reporting.columnar import CURRENCIES, ColumnarSource, TransactionColumns
+from domain.errors import AccountNotFound
+from domain.types.currency import CurrencyType
+
+US_PER_DAY = 86_400_000_000
+PERIODS = ("day", "month")
+# rows() zamienia kolumny na listy Pythona po tyle grup naraz, nie całe (6 list intów na grupę)
+_ROWS_BLOCK = 65536
+
+# Klucz grupy w jednym int64, rosnąco po (konto, waluta, okres): konto (accounts.rowid)
+# | waluta (4 bity) | numer okresu od epoki (24 bity, przesunięty, żeby daty sprzed 1970 też pasowały).
+_PERIOD_BITS = 24
+_CURRENCY_BITS = 4
+_PERIOD_OFFSET = 1 << (_PERIOD_BITS - 1)
+
+
+def _pack(account: np.ndarray, currency: np.ndarray, period: np.ndarray) -> np.ndarray:
+    return ((account << _CURRENCY_BITS | currency) << _PERIOD_BITS) | (period + _PERIOD_OFFSET)
+
+
+def _unpack(keys: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    period = (keys & ((1 << _PERIOD_BITS) - 1)) - _PERIOD_OFFSET
+    rest = keys >> _PERIOD_BITS
+    return rest >> _CURRENCY_BITS, rest & ((1 << _CURRENCY_BITS) - 1), period
+
+
+def period_index(created_at_us: np.ndarray, period: str) -> np.ndarray:
+    """Numer dnia / miesiąca (UTC) od 1970-01 dla znaczników w mikrosekundach."""
+    if period == "day":
+        return created_at_us // US_PER_DAY
+    return created_at_us.astype("datetime64[us]").astype("datetime64[M]").astype(np.int64)
+
+
+def period_starts(indices: np.ndarray, period: str) -> list[date]:
+    unit = "D" if period == "day" else "M"
+    return indices.astype(f"datetime64[{unit}]").astype("datetime64[D]").tolist()
+
+
+def _flows(amount_minor: np.ndarray) -> np.ndarray:
+    """Kolumny (wpływy, wypływy, liczba) do sumowania; kwoty w groszach ze znakiem."""
+    return np.stack(
+        (np.maximum(amount_minor, 0), np.maximum(-amount_minor, 0), np.ones_like(amount_minor)), axis=1
+    )
+
+
+def _reduce(keys: np.ndarray, values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Sumy wierszy `values` per klucz (klucze posortowane rosnąco); int64, więc bez błędów zaokrągleń."""
+    if len(keys) == 0:
+        return keys, values
+    order = np.argsort(keys, kind="stable")
+    keys = keys[order]
+    starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+    return keys[starts], np.add.reduceat(values[order], starts, axis=0)
+
+
+class _GroupSums:
+    """
+    Sumy per klucz zbierane z kolejnych porcji.
+
+    Wyniki porcji są scalane, gdy zaległe przewyższą już scalone, więc pamięć
+    rośnie z liczbą grup, a nie wierszy, a łączny koszt scalania jest liniowy.
+    """
+
+    def __init__(self, width: int):
+        self._parts: list[tuple[np.ndarray, np.ndarray]] = []
+        self._pending = 0
+        self._merged = 0
+        self._width = width
+
+    def add(self, keys: np.ndarray, values: np.ndarray) -> None:
+        keys, values = _reduce(keys, values)
+        self._parts.append((keys, values))
+        self._pending += len(keys)
+        if self._pending > self._merged:
+            self._merge()
+
+    def result(self) -> tuple[np.ndarray, np.ndarray]:
+        self._merge()
+        if not self._parts:
+            return np.empty(0, dtype=np.int64), np.empty((0, self._width), dtype=np.int64)
+        return self._parts[0]
+
+    def _merge(self) -> None:
+        if len(self._parts) > 1:
+            keys = np.concatenate([keys for keys, _ in self._parts])
+            values = np.concatenate([values for _, values in self._parts])
+            self._parts = [_reduce(keys, values)]
+        self._merged = len(self._parts[0][0]) if self._parts else 0
+        self._pending = 0
+
+
+@dataclass(frozen=True, slots=True)
+class PeriodTotals:
+    account_id: str
+    currency: CurrencyType
+    period_start: date
+    inflow: Decimal
+    outflow: Decimal
+    net: Decimal
+    count: int
+
+
+@dataclass(frozen=True, slots=True)
+class AccountVolume:
+    account_id: str
+    currency: CurrencyType
+    volume: Decimal
+    inflow: Decimal
+    outflow: Decimal
+    count: int
+
+
+@dataclass(frozen=True, slots=True)
+class BalancePoint:
+    day: date
+    net: Decimal
+    balance: Decimal
+
+
+@dataclass
+class PeriodReport:
+    """Wpływy/wypływy per (konto, waluta, dzień|miesiąc) jako kolumny; wiersze budowane dopiero w rows()."""
+    period: str
+    accounts: np.ndarray
+    currencies: np.ndarray
+    periods: np.ndarray
+    inflow_minor: np.ndarray
+    outflow_minor: np.ndarray
+    count: np.ndarray
+    account_ids: dict[int, str]
+
+    @property
+    def net_minor(self) -> np.ndarray:
+        return self.inflow_minor - self.outflow_minor
+
+    def __len__(self) -> int:
+        return len(self.accounts)
+
+    def rows(self) -> Iterator[PeriodTotals]:
+        for block in range(0, len(self), _ROWS_BLOCK):
+            part = slice(block, block + _ROWS_BLOCK)
+            for account, currency, start, inflow, outflow, count in zip(
+                self.accounts[part].tolist(),
+                self.currencies[part].tolist(),
+                period_starts(self.periods[part], self.period),
+                self.inflow_minor[part].tolist(),
+                self.outflow_minor[part].tolist(),
+                self.count[part].tolist(),
+            ):
+                yield PeriodTotals(
+                    account_id=self.account_ids[account],
+                    currency=CURRENCIES[currency],
+                    period_start=start,
+                    inflow=from_minor(inflow),
+                    outflow=from_minor(outflow),
+                    net=from_minor(inflow - outflow),
+                    count=count,
+                )
+
+
+@dataclass
+class TopAccountsReport:
+    """Konta o największym obrocie (wpływy + wypływy), osobno w każdej walucie."""
+    accounts: np.ndarray
+    currencies: np.ndarray
+    inflow_minor: np.ndarray
+    outflow_minor: np.ndarray
+    count: np.ndarray
+    account_ids: dict[int, str]
+
+    def __len__(self) -> int:
+        return len(self.accounts)
+
+    def rows(self) -> Iterator[AccountVolume]:
+        for account, currency, inflow, outflow, count in zip(
+            self.accounts.tolist(),
+            self.currencies.tolist(),
+            self.inflow_minor.tolist(),
+            self.outflow_minor.tolist(),
+            self.count.tolist(),
+        ):
+            yield AccountVolume(
+                account_id=self.account_ids[account],
+                currency=CURRENCIES[currency],
+                volume=from_minor(inflow + outflow),
+                inflow=from_minor(inflow),
+                outflow=from_minor(outflow),
+                count=count,
+            )
+
+
+@dataclass
+class BalanceSeries:
+    """Saldo konta na koniec każdego dnia (UTC) zakresu, także dni bez transakcji."""
+    account_id: str
+    first_day: int
+    net_minor: np.ndarray
+    balance_minor: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.net_minor)
+
+    def rows(self) -> Iterator[BalancePoint]:
+        days = period_starts(np.arange(self.first_day, self.first_day + len(self)), "day")
+        for day, net, balance in zip(days, self.net_minor.tolist(), self.balance_minor.tolist()):
+            yield BalancePoint(day=day, net=from_minor(net), balance=from_minor(balance))
+
+
+class TransactionReports:
+    """
+    Raporty nad całą tabelą transakcji liczone wektorowo w NumPy.
+
+    Transakcje przychodzą porcjami kolumn z ColumnarSource; każda porcja jest od razu
+    redukowana do sum per grupa, więc pamięć zależy od liczby grup, nie transakcji.
+    Kwoty sumowane są w groszach (int64), dni i miesiące liczone w UTC.
+    """
+
+    def __init__(self, source: ColumnarSource):
+        self._source = source
+
+    def period_totals(
+        self,
+        period: str,
+        account_id: str | None = None,
+        currency: CurrencyType | None = None,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+    ) -> PeriodReport:
+        """Wpływy, wypływy, saldo netto i liczba transakcji per konto, walutę i dzień/miesiąc."""
+        if period not in PERIODS:
+            raise ValueError(f"Unknown period '{period}' (expected one of: {', '.join(PERIODS)})")
+
+        sums = _GroupSums(width=3)
+        for chunk in self._chunks(account_id, currency, date_from, date_to):
+            keys = _pack(chunk.account, chunk.currency, period_index(chunk.created_at_us, period))
+            sums.add(keys, _flows(chunk.amount_minor))
+
+        keys, values = sums.result()
+        accounts, currencies, periods = _unpack(keys)
+        return PeriodReport(
+            period=period,
+            accounts=accounts,
+            currencies=currencies,
+            periods=periods,
+            inflow_minor=values[:, 0],
+            outflow_minor=values[:, 1],
+            count=values[:, 2],
+            account_ids=self._source.account_ids(accounts),
+        )
+
+    def top_accounts(
+        self,
+        limit: int = 10,
+        currency: CurrencyType | None = None,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+    ) -> TopAccountsReport:
+        """`limit` kont o największym obrocie w każdej walucie (remisy po kodzie konta)."""
+        if limit <= 0:
+            raise ValueError("limit must be positive")
+
+        sums = _GroupSums(width=3)
+        for chunk in self._chunks(None, currency, date_from, date_to):
+            keys = _pack(chunk.account, chunk.currency, np.zeros_like(chunk.account))
+            sums.add(keys, _flows(chunk.amount_minor))
+
+        keys, values = sums.result()
+        accounts, currencies, _ = _unpack(keys)
+        volume = values[:, 0] + values[:, 1]
+
+        selected = []
+        for code in np.unique(currencies):
+            (candidates,) = np.nonzero(currencies == code)
+            if len(candidates) > limit:
+                # próg = `limit`-ty największy obrót (np.partition, O(n)); remisy na progu rozstrzyga lexsort
+                threshold = np.partition(volume[candidates], len(candidates) - limit)[len(candidates) - limit]
+                candidates = candidates[volume[candidates] >= threshold]
+            ranked = candidates[np.lexsort((accounts[candidates], -volume[candidates]))][:limit]
+            selected.append(ranked)
+        index = np.concatenate(selected) if selected else np.empty(0, dtype=np.int64)
+
+        return TopAccountsReport(
+            accounts=accounts[index],
+            currencies=currencies[index],
+            inflow_minor=values[index, 0],
+            outflow_minor=values[index, 1],
+            count=values[index, 2],
+            account_ids=self._source.account_ids(accounts[index]),
+        )
+
+    def balance_series(
+        self,
+        account_id: str,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+    ) -> BalanceSeries:
+        """Dzienna seria salda: saldo otwarcia sprzed date_from + narastająca suma dziennych sald netto."""
+        code = self._source.account_code(account_id)
+        if code is None:
+            raise AccountNotFound(f"Account with id={account_id} does not exist")
+
+        from_us = to_epoch_us(_utc(date_from)) if date_from is not None else None
+        opening = self._source.opening_balance_minor(code)
+        sums = _GroupSums(width=1)
+        for chunk in self._chunks(account_id, None, None, date_to):
+            if from_us is not None:
+                before = chunk.created_at_us < from_us
+                opening += int(chunk.amount_minor[before].sum())
+                chunk = chunk.select(~before)
+            sums.add(period_index(chunk.created_at_us, "day"), chunk.amount_minor[:, np.newaxis])
+
+        days, net = sums.result()
+        first_day = int(days[0]) if len(days) else None
+        last_day = int(days[-1]) if len(days) else None
+        if date_from is not None:
+            first_day = int(from_us // US_PER_DAY)
+        if date_to is not None:
+            last_day = int((to_epoch_us(_utc(date_to)) - 1) // US_PER_DAY)
+        # bez transakcji w zakresie seria z jednego końca to sam punkt salda otwarcia
+        first_day = first_day if first_day is not None else last_day
+        last_day = last_day if last_day is not None else first_day
+        if first_day is None or last_day is None or last_day < first_day:
+            empty = np.empty(0, dtype=np.int64)
+            return BalanceSeries(account_id, first_day or 0, empty, empty)
+
+        dense = np.zeros(last_day - first_day + 1, dtype=np.int64)
+        in_range = (days >= first_day) & (days <= last_day)
+        dense[days[in_range] - first_day] = net[in_range, 0]
+        return BalanceSeries(account_id, first_day, dense, opening + np.cumsum(dense))
+
+    def _chunks(self, account_id, currency, date_from, date_to) -> Iterable[TransactionColumns]:
+        for chunk in self._source.chunks(account_id, currency, date_from, date_to):
+            # waluta spoza CurrencyType (np. wiersz archiwum bez CHECK) nie zmieści się w kluczu
+            if (chunk.currency < 0).any():
+                chunk = chunk.select(chunk.currency >= 0)
+            yield chunk
+
+
+def _utc(value: datetime) -> datetime:
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
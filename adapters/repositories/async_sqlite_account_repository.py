@@ -0,0 +1,68 @@
+from collections.abc import Sequence
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy.ext.asyncio import AsyncSession
+from domain.entities.entities import Account
+from domain.ports.ports import AsyncAccountRepository
+from domain.types.account_status import AccountStatus
+from domain.types.currency import CurrencyType
+from adapters.repositories.sqlite_account_repository import SqliteAccountRepository
+
+
+class AsyncSqliteAccountRepository(AsyncAccountRepository):
+    """
+    Asynchroniczny adapter AccountRepository na AsyncSession (aiosqlite).
+
+    Logikę SQL i mapowanie błędów dzieli z SqliteAccountRepository: każde wywołanie
+    idzie przez AsyncSession.run_sync, więc I/O jest nieblokujące dla pętli zdarzeń,
+    a zachowanie jest identyczne z wersją synchroniczną.
+    """
+
+    def __init__(self, session: AsyncSession, epoch_timestamps: bool = False, binary_ids: bool = False):
+        self._session = session
+        self._sync = SqliteAccountRepository(
+            session.sync_session, epoch_timestamps=epoch_timestamps, binary_ids=binary_ids
+        )
+
+    async def create(self, account: Account) -> None:
+        await self._session.run_sync(lambda _: self._sync.create(account))
+
+    async def get(self, account_id: str) -> Account:
+        return await self._session.run_sync(lambda _: self._sync.get(account_id))
+
+    async def get_by_id(self, account_id: str) -> Account | None:
+        return await self._session.run_sync(lambda _: self._sync.get_by_id(account_id))
+
+    async def get_version(self, account_id: str) -> int | None:
+        return await self._session.run_sync(lambda _: self._sync.get_version(account_id))
+
+    async def update_balance(self, account_id: str, new_balance: Decimal, expected_version: int | None = None) -> None:
+        await self._session.run_sync(
+            lambda _: self._sync.update_balance(account_id, new_balance, expected_version=expected_version)
+        )
+
+    async def update_balances(
+        self,
+        balances: dict[str, Decimal],
+        expected_versions: dict[str, int] | None = None,
+    ) -> None:
+        await self._session.run_sync(
+            lambda _: self._sync.update_balances(balances, expected_versions=expected_versions)
+        )
+
+    async def list_all(self, limit: int | None = None) -> Sequence[Account]:
+        return await self._session.run_sync(lambda _: self._sync.list_all(limit))
+
+    async def list_page(
+        self,
+        limit: int,
+        status: AccountStatus | None = None,
+        currency: CurrencyType | None = None,
+        owner_prefix: str | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+        after: tuple[datetime, str] | None = None,
+    ) -> Sequence[Account]:
+        return await self._session.run_sync(
+            lambda _: self._sync.list_page(limit, status, currency, owner_prefix, created_from, created_to, after)
+        )
@@ -0,0 +1,73 @@
+from collections.abc import Sequence
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy.ext.asyncio import AsyncSession
+from domain.entities.entities import Transaction
+from domain.ports.ports import AsyncTransactionRepository
+from domain.types.transaction import TransactionType
+from adapters.repositories.transaction_repository import TransactionsRepository
+
+
+class AsyncTransactionsRepository(AsyncTransactionRepository):
+    """
+    Asynchroniczny adapter TransactionRepository na AsyncSession (aiosqlite).
+
+    Deleguje do TransactionsRepository przez AsyncSession.run_sync (ledger,
+    batch i keyset działają tak samo jak w wersji synchronicznej).
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        consistency_check: bool = False,
+        epoch_timestamps: bool = False,
+        binary_ids: bool = False,
+        archive: bool = False,
+    ):
+        self._session = session
+        self._sync = TransactionsRepository(
+            session.sync_session,
+            consistency_check=consistency_check,
+            epoch_timestamps=epoch_timestamps,
+            binary_ids=binary_ids,
+            archive=archive,
+        )
+
+    async def append(self, transaction: Transaction) -> None:
+        await self._session.run_sync(lambda _: self._sync.append(transaction))
+
+    async def append_many(self, transactions: list[Transaction]) -> None:
+        await self._session.run_sync(lambda _: self._sync.append_many(transactions))
+
+    async def get_balance(self, account_id: str) -> Decimal:
+        return await self._session.run_sync(lambda _: self._sync.get_balance(account_id))
+
+    async def list_for_account(
+        self,
+        account_id: str,
+        limit: int | None = None,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+        types: set[TransactionType] | None = None,
+        after: tuple[datetime, str] | None = None,
+    ) -> Sequence[Transaction]:
+        return await self._session.run_sync(
+            lambda _: self._sync.list_for_account(
+                account_id,
+                limit=limit,
+                date_from=date_from,
+                date_to=date_to,
+                types=types,
+                after=after,
+            )
+        )
+
+    async def count_for_account(
+        self,
+        account_id: str,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+    ) -> int | None:
+        return await self._session.run_sync(
+            lambda _: self._sync.count_for_account(account_id, date_from=date_from, date_to=date_to)
+        )
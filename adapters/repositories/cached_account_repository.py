@@ -0,0 +1,230 @@
+from collections.abc import Sequence
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from domain.entities.entities import Account
+from domain.ports.ports import AccountRepository
+from domain.types.account_status import AccountStatus
+from domain.types.currency import CurrencyType
+
+
+@dataclass(frozen=True)
+class AccountCacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    size: int
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class AccountCache:
+    """
+    Współdzielony w procesie cache LRU kont (account_id -> Account), bezpieczny wątkowo.
+
+    Trzyma tylko stan zatwierdzony w bazie: wpisy dokłada CachedAccountRepository
+    po odczycie albo po COMMIT-cie własnego zapisu.
+    """
+
+    def __init__(self, max_size: int):
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self._max_size = max_size
+        self._entries: OrderedDict[str, Account] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def get(self, account_id: str) -> Account | None:
+        with self._lock:
+            account = self._entries.get(account_id)
+            if account is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(account_id)
+            self._hits += 1
+            return account
+
+    def peek(self, account_id: str) -> Account | None:
+        """Jak get(), ale bez liczenia trafień i bez zmiany kolejności LRU."""
+        with self._lock:
+            return self._entries.get(account_id)
+
+    def put(self, account: Account) -> None:
+        with self._lock:
+            self._entries[account.account_id] = account
+            self._entries.move_to_end(account.account_id)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, account_id: str) -> None:
+        with self._lock:
+            if self._entries.pop(account_id, None) is not None:
+                self._invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> AccountCacheStats:
+        with self._lock:
+            return AccountCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                invalidations=self._invalidations,
+                size=len(self._entries),
+            )
+
+
+class CachedAccountRepository(AccountRepository):
+    """
+    Dekorator AccountRepository: get/get_by_id czytają z AccountCache, zapisy idą do bazy.
+
+    Zapis (także nieudany) od razu usuwa konto z cache, a do końca transakcji
+    kolejne odczyty tego konta idą do bazy i widzą własny, niezatwierdzony stan.
+    Po COMMIT konto jest ponownie usuwane albo, przy cache_balances=True,
+    podmieniane na wersję z nowym saldem. Zmiany z innych procesów wykrywa CAS
+    na accounts.version: konflikt usuwa wpis, a ponowienie use-case'u czyta
+    konto z bazy. Z verify_version=True każde trafienie porównuje też wersję z bazą.
+    """
+
+    def __init__(
+        self,
+        inner: AccountRepository,
+        cache: AccountCache,
+        session: Session,
+        cache_balances: bool = False,
+        verify_version: bool = False,
+    ):
+        self._inner = inner
+        self._cache = cache
+        self._cache_balances = cache_balances
+        self._verify_version = verify_version
+        # konta zmienione w bieżącej transakcji -> stan do wstawienia po COMMIT (None = tylko usuń)
+        self._pending: dict[str, Account | None] = {}
+        event.listen(session, "after_commit", self._on_commit)
+        event.listen(session, "after_rollback", self._on_rollback)
+
+    def create(self, account: Account) -> None:
+        self._inner.create(account)
+        self._pending[account.account_id] = account
+
+    def get(self, account_id: str) -> Account:
+        account = self._cached(account_id)
+        if account is None:
+            account = self._inner.get(account_id)
+            self._fill(account)
+        return account
+
+    def get_by_id(self, account_id: str) -> Account | None:
+        account = self._cached(account_id)
+        if account is None:
+            account = self._inner.get_by_id(account_id)
+            if account is not None:
+                self._fill(account)
+        return account
+
+    def get_version(self, account_id: str) -> int | None:
+        return self._inner.get_version(account_id)
+
+    def update_balance(self, account_id: str, new_balance: Decimal, expected_version: int | None = None) -> None:
+        current = self._current(account_id)
+        self._cache.invalidate(account_id)
+        self._pending[account_id] = None
+        self._inner.update_balance(account_id, new_balance, expected_version=expected_version)
+        self._pending[account_id] = self._after_update(current, new_balance, expected_version)
+
+    def update_balances(
+        self,
+        balances: dict[str, Decimal],
+        expected_versions: dict[str, int] | None = None,
+    ) -> None:
+        expected_versions = expected_versions or {}
+        current = {account_id: self._current(account_id) for account_id in balances}
+        for account_id in balances:
+            self._cache.invalidate(account_id)
+            self._pending[account_id] = None
+        self._inner.update_balances(balances, expected_versions=expected_versions)
+        for account_id, new_balance in balances.items():
+            self._pending[account_id] = self._after_update(
+                current[account_id], new_balance, expected_versions.get(account_id)
+            )
+
+    def list_all(self, limit: int | None = None) -> Sequence[Account]:
+        return self._inner.list_all(limit)
+
+    def list_page(
+        self,
+        limit: int,
+        status: AccountStatus | None = None,
+        currency: CurrencyType | None = None,
+        owner_prefix: str | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+        after: tuple[datetime, str] | None = None,
+    ) -> Sequence[Account]:
+        return self._inner.list_page(limit, status, currency, owner_prefix, created_from, created_to, after)
+
+    def _cached(self, account_id: str) -> Account | None:
+        if account_id in self._pending:
+            return None
+        account = self._cache.get(account_id)
+        if account is not None and self._verify_version:
+            if self._inner.get_version(account_id) != account.version:
+                self._cache.invalidate(account_id)
+                return None
+        return account
+
+    def _fill(self, account: Account) -> None:
+        if account.account_id not in self._pending:
+            self._cache.put(account)
+
+    def _current(self, account_id: str) -> Account | None:
+        """Ostatni znany stan konta w tej transakcji (z pending albo z cache), bez odczytu z bazy."""
+        if account_id in self._pending:
+            return self._pending[account_id]
+        return self._cache.peek(account_id)
+
+    def _after_update(self, current: Account | None, new_balance: Decimal, expected_version: int | None) -> Account | None:
+        # Nowy stan znamy tylko przy CAS (wersja = expected + 1) i znanym poprzednim stanie.
+        if not self._cache_balances or current is None or expected_version is None:
+            return None
+        if current.version != expected_version:
+            return None
+        return replace(
+            current,
+            balance=new_balance,
+            version=expected_version + 1,
+            updated_at=datetime.now(timezone.utc),
+        )
+
+    def _on_commit(self, session: Session) -> None:
+        if session.in_nested_transaction():
+            return
+        pending, self._pending = self._pending, {}
+        for account_id, account in pending.items():
+            if account is None:
+                self._cache.invalidate(account_id)
+            else:
+                self._cache.put(account)
+
+    def _on_rollback(self, session: Session) -> None:
+        if session.in_nested_transaction():
+            # SAVEPOINT cofnięty: nie wiemy, które zapisy przepadły, więc po COMMIT tylko usuwamy wpisy.
+            self._pending = dict.fromkeys(self._pending)
+            return
+        self._pending = {}
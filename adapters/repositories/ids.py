@@ -0,0 +1,23 @@
+import uuid
+
+# Identyfikatory mogą leżeć w bazie jako tekst UUID (36 znaków) albo jako 16 bajtów BLOB
+# (BANK_ID_STORAGE=blob, po `migrate-ids`). Kolumny zostają zadeklarowane jako TEXT:
+# afinicja TEXT nie konwertuje BLOB-ów, więc wystarczy zmienić wartości, nie schemat.
+
+
+def id_to_db(value: str | None, binary: bool):
+    """ID z domeny -> parametr zapytania (bytes w trybie binarnym)."""
+    if value is None or not binary:
+        return value
+    try:
+        return uuid.UUID(value).bytes
+    except ValueError:
+        # to nie UUID, więc i tak nie pasuje do żadnego wiersza: wyszukiwanie kończy się "nie ma"
+        return value
+
+
+def id_from_db(value) -> str | None:
+    """Wartość kolumny ID -> str; rozpoznaje BLOB po typie, więc działa w obu trybach."""
+    if isinstance(value, bytes):
+        return str(uuid.UUID(bytes=value))
+    return value
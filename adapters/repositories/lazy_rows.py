@@ -0,0 +1,47 @@
+from collections.abc import Sequence
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class LazyRows(Sequence[T]):
+    """
+    Wynik listowania z repozytorium: surowe wiersze z bazy, encja budowana przy pierwszym dostępie.
+
+    len() i wycinki nie dekodują niczego, a każdy wiersz jest dekodowany co najwyżej
+    raz (Decimal, datetime, Enum). Strona przycięta z limit + 1 nie płaci więc za
+    nadmiarowy wiersz, a liczenie wyników nie płaci za żaden.
+    """
+
+    __slots__ = ("_rows", "_decode", "_decoded")
+
+    def __init__(self, rows: Sequence[Any], decode: Callable[[Any], T]):
+        self._rows = rows
+        self._decode = decode
+        self._decoded: list[T | None] = [None] * len(rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            sliced = LazyRows.__new__(LazyRows)
+            sliced._rows = self._rows[index]
+            sliced._decode = self._decode
+            sliced._decoded = self._decoded[index]
+            return sliced
+
+        item = self._decoded[index]
+        if item is None:
+            item = self._decode(self._rows[index])
+            self._decoded[index] = item
+        return item
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        decoded = sum(item is not None for item in self._decoded)
+        return f"LazyRows({len(self)} rows, {decoded} decoded)"
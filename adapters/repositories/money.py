@@ -0,0 +1,30 @@
+from decimal import Decimal
+
+from domain.errors import DomainError
+
+# Kwoty trzymamy równolegle jako NUMERIC (amount/balance) i jako liczbę groszy/centów
+# w INTEGER (amount_minor/balance_minor). Odczyt preferuje kolumny *_minor; stare
+# kolumny zostają do czasu, aż backfill (adapters/jobs/money_minor_units.py) wypełni resztę.
+MINOR_UNIT_EXPONENT = 2
+
+
+def to_minor(amount: Decimal) -> int:
+    """Decimal -> liczba jednostek drobnych; kwota z więcej niż 2 miejscami po przecinku to błąd, nie zaokrąglenie."""
+    if not isinstance(amount, Decimal):
+        amount = Decimal(str(amount))
+    minor = amount.scaleb(MINOR_UNIT_EXPONENT)
+    if minor != minor.to_integral_value():
+        raise DomainError(f"Amount {amount} has more than {MINOR_UNIT_EXPONENT} decimal places")
+    return int(minor)
+
+
+def from_minor(minor: int) -> Decimal:
+    """Liczba jednostek drobnych -> Decimal z dokładnie 2 miejscami po przecinku."""
+    return Decimal(minor).scaleb(-MINOR_UNIT_EXPONENT)
+
+
+def decode_money(legacy, minor: int | None) -> Decimal:
+    """Kwota z wiersza: z kolumny *_minor, a dla wierszy sprzed backfillu z kolumny NUMERIC."""
+    if minor is not None:
+        return from_minor(minor)
+    return Decimal(str(legacy))
@@ -0,0 +1,208 @@
+import heapq
+from collections.abc import Callable, Iterator, Sequence
+from datetime import date, datetime
+from decimal import Decimal
+from itertools import islice
+
+from adapters.sharding.shard_set import ShardedSession
+from domain.entities.entities import Account, DailyTotals, Transaction
+from domain.errors import BatchWriteError
+from domain.ports.ports import AccountRepository, TransactionRepository
+from domain.types.account_status import AccountStatus
+from domain.types.currency import CurrencyType
+from domain.types.transaction import TransactionType
+
+
+def _run_on_shards(session: ShardedSession, groups: dict, operation: Callable[[int, object], None]) -> dict[int, BatchWriteError]:
+    """
+    Wykonuje operację na każdym shardzie z `groups` w osobnym SAVEPOINT.
+
+    Jeśli którykolwiek shard odrzuci zapis, wycofuje wszystkie, żeby ponowienie
+    (RetryPolicy) nie zapisało drugi raz części, która już przeszła.
+    """
+    savepoints = {shard: session.session(shard).begin_nested() for shard in groups}
+    failures: dict[int, BatchWriteError] = {}
+    try:
+        for shard, items in groups.items():
+            try:
+                operation(shard, items)
+            except BatchWriteError as e:
+                failures[shard] = e
+    except BaseException:
+        for savepoint in savepoints.values():
+            savepoint.rollback()
+        raise
+
+    for savepoint in savepoints.values():
+        if failures:
+            savepoint.rollback()
+        else:
+            savepoint.commit()
+    return failures
+
+
+class ShardedAccountRepository(AccountRepository):
+    """AccountRepository kierujący każde konto do repozytorium jego shardu."""
+
+    def __init__(self, session: ShardedSession):
+        self._session = session
+
+    def _repo(self, account_id: str) -> tuple[int, AccountRepository]:
+        shard = self._session.shard_for(account_id)
+        return shard, self._session.repositories(shard)[0]
+
+    def create(self, account: Account) -> None:
+        shard, repo = self._repo(account.account_id)
+        repo.create(account)
+        self._session.mark_written(shard)
+
+    def get(self, account_id: str) -> Account:
+        return self._repo(account_id)[1].get(account_id)
+
+    def get_by_id(self, account_id: str) -> Account | None:
+        return self._repo(account_id)[1].get_by_id(account_id)
+
+    def get_version(self, account_id: str) -> int | None:
+        return self._repo(account_id)[1].get_version(account_id)
+
+    def update_balance(self, account_id: str, new_balance: Decimal, expected_version: int | None = None) -> None:
+        shard, repo = self._repo(account_id)
+        repo.update_balance(account_id, new_balance, expected_version)
+        self._session.mark_written(shard)
+
+    def update_balances(
+        self,
+        balances: dict[str, Decimal],
+        expected_versions: dict[str, int] | None = None,
+    ) -> None:
+        """Aktualizuje salda per shard; odrzucenie na jednym shardzie wycofuje zmiany na wszystkich."""
+
+        groups: dict[int, dict[str, Decimal]] = {}
+        for account_id, new_balance in balances.items():
+            groups.setdefault(self._session.shard_for(account_id), {})[account_id] = new_balance
+
+        def update(shard: int, shard_balances: dict[str, Decimal]) -> None:
+            self._session.repositories(shard)[0].update_balances(shard_balances, expected_versions)
+
+        failures = _run_on_shards(self._session, groups, update)
+        if failures:
+            merged = {key: error for failure in failures.values() for key, error in failure.failures.items()}
+            raise BatchWriteError(f"{len(merged)} of {len(balances)} balance updates rejected", merged)
+        for shard in groups:
+            self._session.mark_written(shard)
+
+    def list_all(self, limit: int | None = None) -> Sequence[Account]:
+        """Zwraca konta ze wszystkich shardów, najnowsze najpierw (scalanie posortowanych list)."""
+
+        per_shard = [
+            self._session.repositories(shard)[0].list_all(limit)
+            for shard in range(self._session.shard_set.shard_count)
+        ]
+        merged = heapq.merge(*per_shard, key=lambda account: account.created_at, reverse=True)
+        if limit is not None and limit > 0:
+            merged = islice(merged, limit)
+        return list(merged)
+
+    def list_page(
+        self,
+        limit: int,
+        status: AccountStatus | None = None,
+        currency: CurrencyType | None = None,
+        owner_prefix: str | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+        after: tuple[datetime, str] | None = None,
+    ) -> Sequence[Account]:
+        """Strona kont ze wszystkich shardów: ten sam keyset na każdym shardzie, scalanie i przycięcie do limit."""
+
+        per_shard = [
+            self._session.repositories(shard)[0].list_page(
+                limit, status, currency, owner_prefix, created_from, created_to, after
+            )
+            for shard in range(self._session.shard_set.shard_count)
+        ]
+        merged = heapq.merge(
+            *per_shard, key=lambda account: (account.created_at, account.account_id), reverse=True
+        )
+        return list(islice(merged, limit))
+
+
+class ShardedTransactionsRepository(TransactionRepository):
+    """TransactionRepository zapisujący każdą transakcję na shardzie jej konta."""
+
+    def __init__(self, session: ShardedSession):
+        self._session = session
+
+    def _repo(self, account_id: str) -> TransactionRepository:
+        return self._session.repositories(self._session.shard_for(account_id))[1]
+
+    def append(self, transaction: Transaction) -> None:
+        shard = self._session.shard_for(transaction.account_id)
+        self._session.repositories(shard)[1].append(transaction)
+        self._session.mark_written(shard, [transaction])
+
+    def append_many(self, transactions: list[Transaction]) -> None:
+        """Dzieli batch per shard; przy błędzie BatchWriteError ma indeksy z oryginalnej listy."""
+
+        if not transactions:
+            return
+
+        groups: dict[int, list[tuple[int, Transaction]]] = {}
+        for index, transaction in enumerate(transactions):
+            groups.setdefault(self._session.shard_for(transaction.account_id), []).append((index, transaction))
+
+        def append(shard: int, items: list[tuple[int, Transaction]]) -> None:
+            try:
+                self._session.repositories(shard)[1].append_many([transaction for _, transaction in items])
+            except BatchWriteError as e:
+                raise BatchWriteError(str(e), {items[index][0]: error for index, error in e.failures.items()})
+
+        failures = _run_on_shards(self._session, groups, append)
+        if failures:
+            merged = {key: error for failure in failures.values() for key, error in failure.failures.items()}
+            raise BatchWriteError(f"{len(merged)} of {len(transactions)} transactions rejected", merged)
+        for shard, items in groups.items():
+            self._session.mark_written(shard, [transaction for _, transaction in items])
+
+    def get_balance(self, account_id: str) -> Decimal:
+        return self._repo(account_id).get_balance(account_id)
+
+    def get_balance_from_history(self, account_id: str) -> Decimal:
+        return self._repo(account_id).get_balance_from_history(account_id)
+
+    def list_for_account(
+        self,
+        account_id: str,
+        limit: int | None = None,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+        types: set[TransactionType] | None = None,
+        after: tuple[datetime, str] | None = None,
+    ) -> Sequence[Transaction]:
+        return self._repo(account_id).list_for_account(account_id, limit, date_from, date_to, types, after)
+
+    def iter_for_account(
+        self,
+        account_id: str,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+        types: set[TransactionType] | None = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Transaction]:
+        return self._repo(account_id).iter_for_account(account_id, date_from, date_to, types, batch_size)
+
+    def daily_totals(
+        self,
+        account_id: str,
+        date_from: date | None = None,
+        date_to: date | None = None,
+    ) -> Sequence[DailyTotals] | None:
+        return self._repo(account_id).daily_totals(account_id, date_from, date_to)
+
+    def count_for_account(
+        self,
+        account_id: str,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+    ) -> int | None:
+        return self._repo(account_id).count_for_account(account_id, date_from, date_to)
@@ -0,0 +1,226 @@
+from collections.abc import Sequence
+import sqlite3
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from sqlalchemy.orm import Session
+
+from domain.ports.ports import AccountRepository
+from domain.entities.entities import Account
+from domain.errors import AccountNotFound, AccountVersionConflict, BatchWriteError, DomainError
+from domain.types.account_status import AccountStatus
+from domain.types.currency import CurrencyType
+from adapters.repositories.lazy_rows import LazyRows
+from adapters.repositories.money import to_minor
+from adapters.clock.system_clock import to_epoch_us
+from adapters.repositories.ids import id_from_db, id_to_db
+from adapters.repositories.sqlite_account_repository import (
+    account_page_query,
+    create_account_error,
+    row_to_account,
+    update_balance_error,
+)
+
+
+# SQL jako stałe modułu: sqlite3 trzyma skompilowane zapytania w cache połączenia
+# (cached_statements) po tekście SQL, więc każde kolejne wywołanie pomija prepare.
+INSERT_ACCOUNT_SQL = """
+    INSERT INTO accounts (
+        account_id, owner_name, currency, balance, balance_minor,
+        created_at, created_at_us, updated_at, updated_at_us, status, version
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)
+"""
+
+SELECT_ACCOUNT_SQL = """
+    SELECT account_id, owner_name, currency, balance, created_at, updated_at, status, version,
+           balance_minor, created_at_us, updated_at_us
+    FROM accounts
+    WHERE account_id = ?
+"""
+
+SELECT_VERSION_SQL = "SELECT version FROM accounts WHERE account_id = ?"
+
+# expected_version = NULL wyłącza kontrolę wersji (zapis bezwarunkowy)
+UPDATE_BALANCE_SQL = """
+    UPDATE accounts
+    SET balance = ?, balance_minor = ?, updated_at = ?, updated_at_us = ?, version = version + 1
+    WHERE account_id = ? AND (?6 IS NULL OR version = ?6)
+"""
+
+LIST_ACCOUNTS_SQL = """
+    SELECT account_id, owner_name, currency, balance, created_at, updated_at, status, version,
+           balance_minor, created_at_us, updated_at_us
+    FROM accounts
+    ORDER BY created_at DESC
+"""
+
+LIST_ACCOUNTS_EPOCH_SQL = LIST_ACCOUNTS_SQL.replace("ORDER BY created_at DESC", "ORDER BY created_at_us DESC")
+
+
+def dbapi_connection(session: Session) -> sqlite3.Connection:
+    """Surowe połączenie sqlite3 bieżącej transakcji sesji (te same BEGIN/SAVEPOINT/COMMIT co ORM)."""
+    return session.connection().connection.driver_connection
+
+
+class Sqlite3AccountRepository(AccountRepository):
+    """
+    AccountRepository na gołym sqlite3: parametry pozycyjne, wiersze jako krotki.
+
+    Działa na połączeniu z sesji, więc dzieli transakcję (i SAVEPOINT-y) z resztą
+    jednostki pracy; błędy mapuje tak samo jak SqliteAccountRepository.
+    """
+
+    def __init__(self, session: Session, epoch_timestamps: bool = False, binary_ids: bool = False):
+        self._session = session
+        self._epoch_timestamps = epoch_timestamps
+        self._binary_ids = binary_ids
+
+    def create(self, account: Account) -> None:
+        """Zapisuje nowe konto."""
+        params = (
+            id_to_db(account.account_id, self._binary_ids),
+            account.owner_name,
+            account.currency.value,
+            str(account.balance) if isinstance(account.balance, Decimal) else account.balance,
+            to_minor(account.balance),
+            account.created_at.isoformat(),
+            to_epoch_us(account.created_at),
+            account.updated_at.isoformat(),
+            to_epoch_us(account.updated_at),
+            account.status.value,
+        )
+        try:
+            dbapi_connection(self._session).execute(INSERT_ACCOUNT_SQL, params)
+        except sqlite3.IntegrityError as e:
+            raise create_account_error(str(e), account)
+
+    def get(self, account_id: str) -> Account:
+        """Zwraca konto po ID lub rzuca AccountNotFound."""
+        account = self.get_by_id(account_id)
+        if account is None:
+            raise AccountNotFound(f"Account with id={account_id} does not exist")
+        return account
+
+    def get_by_id(self, account_id: str) -> Account | None:
+        """Zwraca konto lub None, nie rzuca wyjątku domenowego."""
+        row = dbapi_connection(self._session).execute(SELECT_ACCOUNT_SQL, (id_to_db(account_id, self._binary_ids),)).fetchone()
+        return row_to_account(row) if row is not None else None
+
+    def get_version(self, account_id: str) -> int | None:
+        """Zwraca samą wersję konta lub None."""
+        row = dbapi_connection(self._session).execute(SELECT_VERSION_SQL, (id_to_db(account_id, self._binary_ids),)).fetchone()
+        return row[0] if row is not None else None
+
+    def update_balance(self, account_id: str, new_balance: Decimal, expected_version: int | None = None) -> None:
+        """Aktualizuje saldo i znacznik czasu konta; z expected_version działa jak compare-and-swap."""
+        params = _balance_params(
+            id_to_db(account_id, self._binary_ids), new_balance, datetime.now(timezone.utc), expected_version
+        )
+        try:
+            cursor = dbapi_connection(self._session).execute(UPDATE_BALANCE_SQL, params)
+        except sqlite3.IntegrityError as e:
+            raise update_balance_error(str(e))
+        if cursor.rowcount == 0:
+            raise self._missing_or_conflict(account_id, expected_version)
+
+    def update_balances(
+        self,
+        balances: dict[str, Decimal],
+        expected_versions: dict[str, int] | None = None,
+    ) -> None:
+        """Aktualizuje salda wielu kont jednym executemany; przy błędzie rzuca BatchWriteError z błędami per konto."""
+        if not balances:
+            return
+
+        expected_versions = expected_versions or {}
+        updated_at = datetime.now(timezone.utc)
+        params = [
+            _balance_params(
+                id_to_db(account_id, self._binary_ids), new_balance, updated_at, expected_versions.get(account_id)
+            )
+            for account_id, new_balance in balances.items()
+        ]
+
+        savepoint = self._session.begin_nested()
+        try:
+            cursor = dbapi_connection(self._session).executemany(UPDATE_BALANCE_SQL, params)
+        except sqlite3.IntegrityError:
+            savepoint.rollback()
+        else:
+            if cursor.rowcount == len(params):
+                savepoint.commit()
+                return
+            savepoint.rollback()
+
+        failures = self._diagnose_balance_failures(params)
+        raise BatchWriteError(f"{len(failures)} of {len(params)} balance updates rejected", failures)
+
+    def list_all(self, limit: int | None = None) -> Sequence[Account]:
+        """Zwraca listę kont, najnowsze najpierw. Opcjonalny LIMIT."""
+        conn = dbapi_connection(self._session)
+        sql = LIST_ACCOUNTS_EPOCH_SQL if self._epoch_timestamps else LIST_ACCOUNTS_SQL
+        if limit is not None and limit > 0:
+            rows = conn.execute(sql + " LIMIT ?", (limit,)).fetchall()
+        else:
+            rows = conn.execute(sql).fetchall()
+        return LazyRows(rows, row_to_account)
+
+    def list_page(
+        self,
+        limit: int,
+        status: AccountStatus | None = None,
+        currency: CurrencyType | None = None,
+        owner_prefix: str | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+        after: tuple[datetime, str] | None = None,
+    ) -> Sequence[Account]:
+        """Zwraca stronę kont spełniających filtry, najnowsze najpierw (keyset po (created_at, account_id))."""
+        sql, params = account_page_query(
+            limit, status, currency, owner_prefix, created_from, created_to, after,
+            self._epoch_timestamps, self._binary_ids,
+        )
+        rows = dbapi_connection(self._session).execute(sql, params).fetchall()
+        return LazyRows(rows, row_to_account)
+
+    def _missing_or_conflict(self, account_id: str, expected_version: int | None) -> DomainError:
+        current_version = self.get_version(account_id)
+        if current_version is None:
+            return AccountNotFound(f"Account with id={account_id} not found")
+        return AccountVersionConflict(
+            f"Account id={account_id} is at version {current_version}, expected {expected_version}"
+        )
+
+    def _diagnose_balance_failures(self, params: list[tuple]) -> dict[str, DomainError]:
+        """Powtarza UPDATE konto po koncie w SAVEPOINT-ach, zbiera błędy i wszystko wycofuje."""
+        failures: dict[str, DomainError] = {}
+        outer = self._session.begin_nested()
+        try:
+            for row_params in params:
+                account_id = id_from_db(row_params[4])
+                row = self._session.begin_nested()
+                try:
+                    cursor = dbapi_connection(self._session).execute(UPDATE_BALANCE_SQL, row_params)
+                except sqlite3.IntegrityError as e:
+                    row.rollback()
+                    failures[account_id] = update_balance_error(str(e))
+                    continue
+                row.commit()
+                if cursor.rowcount == 0:
+                    failures[account_id] = self._missing_or_conflict(account_id, row_params[5])
+        finally:
+            outer.rollback()
+        return failures
+
+
+def _balance_params(account_id: str | bytes, new_balance: Decimal, updated_at: datetime, expected_version: int | None) -> tuple:
+    balance = str(new_balance) if isinstance(new_balance, Decimal) else new_balance
+    return (
+        balance,
+        to_minor(new_balance),
+        updated_at.isoformat(),
+        to_epoch_us(updated_at),
+        account_id,
+        expected_version,
+    )
@@ -0,0 +1,402 @@
+from collections.abc import Iterator, Sequence
+import sqlite3
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy.orm import Session
+
+from domain.ports.ports import TransactionRepository
+from domain.entities.entities import DailyTotals, Transaction
+from domain.errors import BalanceLedgerMismatch, BatchWriteError, DomainError
+from domain.types.transaction import TransactionType
+from adapters.repositories.sqlite3_account_repository import dbapi_connection
+from adapters.repositories.lazy_rows import LazyRows
+from adapters.repositories.money import decode_money, from_minor, to_minor
+from adapters.clock.system_clock import to_epoch_us
+from adapters.repositories.ids import id_to_db
+from adapters.repositories.transaction_repository import (
+    append_transaction_error,
+    daily_deltas,
+    daily_totals_query,
+    reaches_archive,
+    row_to_daily_totals,
+    row_to_transaction,
+    split_day_range,
+    _to_db_timestamp,
+)
+
+
+# SQL jako stałe modułu, żeby trafiać w cache skompilowanych zapytań sqlite3.
+APPEND_TRANSACTION_SQL = """
+    INSERT INTO transactions (
+        tx_id, account_id, type, amount, amount_minor, currency, created_at, created_at_us, related_account_id, note
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+UPSERT_LEDGER_SQL = """
+    INSERT INTO account_balances (account_id, balance, balance_minor, tx_count, updated_at, daily_totals_ready)
+    VALUES (?, ?, ?, ?, ?, 1)
+    ON CONFLICT (account_id) DO UPDATE SET
+        balance = ROUND(balance + excluded.balance, 2),
+        balance_minor = balance_minor + excluded.balance_minor,
+        tx_count = tx_count + excluded.tx_count,
+        updated_at = excluded.updated_at
+"""
+
+UPSERT_DAILY_TOTALS_SQL = """
+    INSERT INTO account_daily_totals (account_id, day, currency, inflow_minor, outflow_minor, tx_count)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT (account_id, day, currency) DO UPDATE SET
+        inflow_minor = inflow_minor + excluded.inflow_minor,
+        outflow_minor = outflow_minor + excluded.outflow_minor,
+        tx_count = tx_count + excluded.tx_count
+"""
+
+SELECT_DAILY_TOTALS_READY_SQL = "SELECT daily_totals_ready FROM account_balances WHERE account_id = ?"
+
+SELECT_LEDGER_BALANCE_SQL = "SELECT balance, balance_minor FROM account_balances WHERE account_id = ?"
+
+SELECT_HISTORY_BALANCE_SQL = """
+    SELECT
+        COALESCE((SELECT balance_minor FROM account_checkpoints WHERE account_id = ?1), 0)
+        + COALESCE(SUM(
+            CASE
+                WHEN type = 'DEPOSIT' THEN COALESCE(amount_minor, CAST(ROUND(amount * 100) AS INTEGER))
+                WHEN type = 'WITHDRAW' THEN -COALESCE(amount_minor, CAST(ROUND(amount * 100) AS INTEGER))
+                ELSE 0
+            END
+        ), 0)
+    FROM transactions
+    WHERE account_id = ?1
+"""
+
+LIST_TRANSACTIONS_SQL = """
+    SELECT tx_id, account_id, type, amount, currency, created_at, related_account_id, note, amount_minor, created_at_us
+    FROM transactions
+    WHERE account_id = ?
+"""
+
+# wiersze skopiowane do archiwum, ale jeszcze nieusunięte z gorącej tabeli, są za granicą
+LIST_ARCHIVED_TRANSACTIONS_SQL = """
+    SELECT tx_id, account_id, type, amount, currency, created_at, related_account_id, note, amount_minor, created_at_us
+    FROM archive.transactions
+    WHERE account_id = ? AND (created_at, tx_id) <= (?, ?)
+"""
+
+SELECT_CHECKPOINT_BOUNDARY_SQL = """
+    SELECT boundary_created_at, boundary_tx_id FROM account_checkpoints WHERE account_id = ?
+"""
+
+
+def _transaction_params(transaction: Transaction, binary_ids: bool) -> tuple:
+    return (
+        id_to_db(transaction.tx_id, binary_ids),
+        id_to_db(transaction.account_id, binary_ids),
+        transaction.type.value,
+        str(transaction.amount) if isinstance(transaction.amount, Decimal) else transaction.amount,
+        to_minor(transaction.amount),
+        transaction.currency.value,
+        transaction.occurred_at.isoformat(),
+        to_epoch_us(transaction.occurred_at),
+        id_to_db(transaction.related_account_id, binary_ids),
+        transaction.note,
+    )
+
+
+class Sqlite3TransactionsRepository(TransactionRepository):
+    """
+    TransactionRepository na gołym sqlite3 (parametry pozycyjne, wiersze jako krotki).
+
+    Ta sama transakcja co sesja ORM, ten sam ledger account_balances i te same
+    błędy domenowe co TransactionsRepository.
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        consistency_check: bool = False,
+        epoch_timestamps: bool = False,
+        binary_ids: bool = False,
+        archive: bool = False,
+    ):
+        self._session = session
+        self._consistency_check = consistency_check
+        self._epoch_timestamps = epoch_timestamps
+        self._binary_ids = binary_ids
+        self._archive = archive
+
+    def append(self, transaction: Transaction) -> None:
+        """Dodaje nowa transakcje do historii."""
+        conn = dbapi_connection(self._session)
+        try:
+            conn.execute(APPEND_TRANSACTION_SQL, _transaction_params(transaction, self._binary_ids))
+        except sqlite3.IntegrityError as e:
+            raise append_transaction_error(str(e), transaction)
+
+        self._apply_to_ledger(conn, [transaction])
+        self._apply_to_daily_totals(conn, [transaction])
+
+    def append_many(self, transactions: list[Transaction]) -> None:
+        """Dodaje wiele transakcji jednym executemany; przy błędzie rzuca BatchWriteError z błędami per wiersz."""
+        if not transactions:
+            return
+
+        try:
+            with self._session.begin_nested():
+                dbapi_connection(self._session).executemany(
+                    APPEND_TRANSACTION_SQL, [_transaction_params(transaction, self._binary_ids) for transaction in transactions]
+                )
+        except sqlite3.IntegrityError:
+            failures = self._diagnose_append_failures(transactions)
+            raise BatchWriteError(f"{len(failures)} of {len(transactions)} transactions rejected", failures)
+
+        conn = dbapi_connection(self._session)
+        self._apply_to_ledger(conn, transactions)
+        self._apply_to_daily_totals(conn, transactions)
+
+    def get_balance(self, account_id: str) -> Decimal:
+        """Zwraca saldo z ledgera (O(1)); w trybie spójności porównuje je z sumą historii."""
+        row = dbapi_connection(self._session).execute(SELECT_LEDGER_BALANCE_SQL, (id_to_db(account_id, self._binary_ids),)).fetchone()
+        balance = decode_money(row[0], row[1]) if row is not None else Decimal("0")
+
+        if self._consistency_check:
+            history_balance = self.get_balance_from_history(account_id)
+            if balance != history_balance:
+                raise BalanceLedgerMismatch(
+                    f"Ledger balance {balance} != history balance {history_balance} for account id={account_id}"
+                )
+
+        return balance
+
+    def get_balance_from_history(self, account_id: str) -> Decimal:
+        """Liczy saldo pełnym SUM po historii transakcji (wolne, do weryfikacji ledgera)."""
+        row = dbapi_connection(self._session).execute(SELECT_HISTORY_BALANCE_SQL, (id_to_db(account_id, self._binary_ids),)).fetchone()
+        return from_minor(row[0])
+
+    def list_for_account(
+        self,
+        account_id: str,
+        limit: int | None = None,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+        types: set[TransactionType] | None = None,
+        after: tuple[datetime, str] | None = None,
+    ) -> Sequence[Transaction]:
+        """Zwraca historię konta od najnowszych; gdy trzeba, dobiera starsze wiersze z archive.transactions."""
+        account_key = id_to_db(account_id, self._binary_ids)
+        rows = self._list_rows(LIST_TRANSACTIONS_SQL, [account_key], limit, date_from, date_to, types, after)
+
+        if self._archive and (limit is None or limit <= 0 or len(rows) < limit):
+            boundary = self._archive_boundary(account_key, date_from)
+            if boundary is not None:
+                remaining = limit - len(rows) if limit is not None and limit > 0 else None
+                rows += self._list_rows(
+                    LIST_ARCHIVED_TRANSACTIONS_SQL, [account_key, *boundary], remaining, date_from, date_to, types, after
+                )
+
+        return LazyRows(rows, row_to_transaction)
+
+    def iter_for_account(
+        self,
+        account_id: str,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+        types: set[TransactionType] | None = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Transaction]:
+        """Strumieniuje historię konta od najstarszych: najpierw archiwum, potem gorąca tabela, po batch_size wierszy."""
+        account_key = id_to_db(account_id, self._binary_ids)
+        boundary = self._archive_boundary(account_key, date_from) if self._archive else None
+        if boundary is not None:
+            yield from self._stream_rows(
+                LIST_ARCHIVED_TRANSACTIONS_SQL, [account_key, *boundary], date_from, date_to, types, batch_size
+            )
+        yield from self._stream_rows(LIST_TRANSACTIONS_SQL, [account_key], date_from, date_to, types, batch_size)
+
+    def daily_totals(
+        self,
+        account_id: str,
+        date_from: date | None = None,
+        date_to: date | None = None,
+    ) -> Sequence[DailyTotals] | None:
+        """Dzienne sumy konta z account_daily_totals (dni UTC, date_to wyłącznie); None, gdy nie są jeszcze gotowe."""
+        account_key = id_to_db(account_id, self._binary_ids)
+        if not self._daily_totals_ready(account_key):
+            return None
+        sql, params = daily_totals_query(
+            "day, currency, inflow_minor, outflow_minor, tx_count",
+            account_key,
+            date_from.isoformat() if date_from is not None else None,
+            date_to.isoformat() if date_to is not None else None,
+        )
+        rows = dbapi_connection(self._session).execute(sql + " ORDER BY day, currency", params).fetchall()
+        return [row_to_daily_totals(account_id, row) for row in rows]
+
+    def count_for_account(
+        self,
+        account_id: str,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+    ) -> int | None:
+        """Liczba transakcji w zakresie: pełne dni z account_daily_totals, brzegi z historii (jak TransactionsRepository)."""
+        account_key = id_to_db(account_id, self._binary_ids)
+        if not self._daily_totals_ready(account_key):
+            return None
+        if not self._archive and self._archive_boundary(account_key, date_from) is not None:
+            return None
+
+        conn = dbapi_connection(self._session)
+        full_days, edges = split_day_range(date_from, date_to)
+        count = 0
+        if full_days is not None:
+            sql, params = daily_totals_query("COALESCE(SUM(tx_count), 0)", account_key, *full_days)
+            count += conn.execute(sql, params).fetchone()[0]
+        for edge_from, edge_to in edges:
+            sources = [(LIST_TRANSACTIONS_SQL, [account_key])]
+            boundary = self._archive_boundary(account_key, edge_from) if self._archive else None
+            if boundary is not None:
+                sources.append((LIST_ARCHIVED_TRANSACTIONS_SQL, [account_key, *boundary]))
+            for base_sql, base_params in sources:
+                sql, params = self._list_query(base_sql, base_params, None, edge_from, edge_to, None, None)
+                count += conn.execute(f"SELECT COUNT(*) FROM ({sql})", params).fetchone()[0]
+        return count
+
+    def _daily_totals_ready(self, account_key) -> bool:
+        row = dbapi_connection(self._session).execute(SELECT_DAILY_TOTALS_READY_SQL, (account_key,)).fetchone()
+        # konto bez wiersza ledgera nie ma jeszcze żadnej transakcji
+        return row is None or bool(row[0])
+
+    def _archive_boundary(self, account_key, date_from: datetime | None) -> tuple | None:
+        boundary = dbapi_connection(self._session).execute(SELECT_CHECKPOINT_BOUNDARY_SQL, (account_key,)).fetchone()
+        if boundary is None or not reaches_archive(boundary[0], date_from):
+            return None
+        return boundary
+
+    def _stream_rows(
+        self,
+        sql: str,
+        params: list,
+        date_from: datetime | None,
+        date_to: datetime | None,
+        types: set[TransactionType] | None,
+        batch_size: int,
+    ) -> Iterator[Transaction]:
+        sql, params = self._list_query(sql, params, None, date_from, date_to, types, None, oldest_first=True)
+        # kursor sqlite3 krokuje zapytanie leniwie: fetchmany nie materializuje całego wyniku
+        cursor = dbapi_connection(self._session).execute(sql, params)
+        try:
+            while rows := cursor.fetchmany(batch_size):
+                for row in rows:
+                    yield row_to_transaction(row)
+        finally:
+            cursor.close()
+
+    def _list_rows(
+        self,
+        sql: str,
+        params: list,
+        limit: int | None,
+        date_from: datetime | None,
+        date_to: datetime | None,
+        types: set[TransactionType] | None,
+        after: tuple[datetime, str] | None,
+    ) -> list:
+        sql, params = self._list_query(sql, params, limit, date_from, date_to, types, after)
+        return dbapi_connection(self._session).execute(sql, params).fetchall()
+
+    def _list_query(
+        self,
+        sql: str,
+        params: list,
+        limit: int | None,
+        date_from: datetime | None,
+        date_to: datetime | None,
+        types: set[TransactionType] | None,
+        after: tuple[datetime, str] | None,
+        oldest_first: bool = False,
+    ) -> tuple[str, list]:
+        if self._epoch_timestamps:
+            created_column, to_db = "created_at_us", to_epoch_us
+        else:
+            created_column, to_db = "created_at", _to_db_timestamp
+
+        # date_from włącznie, date_to wyłącznie
+        if date_from is not None:
+            sql += f" AND {created_column} >= ?"
+            params.append(to_db(date_from))
+        if date_to is not None:
+            sql += f" AND {created_column} < ?"
+            params.append(to_db(date_to))
+        if types:
+            sql += f" AND type IN ({', '.join('?' * len(types))})"
+            params.extend(sorted(tx_type.value for tx_type in types))
+        if after is not None:
+            sql += f" AND ({created_column}, tx_id) < (?, ?)"
+            params.extend((to_db(after[0]), id_to_db(after[1], self._binary_ids)))
+
+        direction = "ASC" if oldest_first else "DESC"
+        sql += f" ORDER BY {created_column} {direction}, tx_id {direction}"
+        if limit is not None and limit > 0:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        return sql, params
+
+    def _apply_to_ledger(self, conn: sqlite3.Connection, transactions: list[Transaction]) -> None:
+        """Przesuwa salda w account_balances (ta sama transakcja SQL co INSERT); jeden wiersz per konto."""
+        deltas: dict[str, list] = {}
+        for transaction in transactions:
+            if transaction.type == TransactionType.DEPOSIT:
+                delta = to_minor(transaction.amount)
+            elif transaction.type == TransactionType.WITHDRAW:
+                delta = -to_minor(transaction.amount)
+            else:
+                delta = 0
+
+            entry = deltas.setdefault(transaction.account_id, [0, 0, None])
+            entry[0] += delta
+            entry[1] += 1
+            entry[2] = transaction.occurred_at.isoformat()
+
+        conn.executemany(
+            UPSERT_LEDGER_SQL,
+            [
+                (id_to_db(account_id, self._binary_ids), str(from_minor(delta)), delta, count, updated_at)
+                for account_id, (delta, count, updated_at) in deltas.items()
+            ],
+        )
+
+    def _apply_to_daily_totals(self, conn: sqlite3.Connection, transactions: list[Transaction]) -> None:
+        """Dopisuje transakcje do account_daily_totals (ta sama transakcja SQL co INSERT); jeden wiersz per dzień."""
+        conn.executemany(
+            UPSERT_DAILY_TOTALS_SQL,
+            [
+                (
+                    id_to_db(entry["account_id"], self._binary_ids),
+                    entry["day"],
+                    entry["currency"],
+                    entry["inflow_minor"],
+                    entry["outflow_minor"],
+                    entry["tx_count"],
+                )
+                for entry in daily_deltas(transactions).values()
+            ],
+        )
+
+    def _diagnose_append_failures(self, transactions: list[Transaction]) -> dict[int, DomainError]:
+        """Powtarza batch wiersz po wierszu w SAVEPOINT-ach, zbiera błędy i wszystko wycofuje."""
+        failures: dict[int, DomainError] = {}
+        outer = self._session.begin_nested()
+        try:
+            for index, transaction in enumerate(transactions):
+                row = self._session.begin_nested()
+                try:
+                    dbapi_connection(self._session).execute(APPEND_TRANSACTION_SQL, _transaction_params(transaction, self._binary_ids))
+                    row.commit()
+                except sqlite3.IntegrityError as e:
+                    row.rollback()
+                    failures[index] = append_transaction_error(str(e), transaction)
+        finally:
+            outer.rollback()
+        return failures
@@ -1,18 +1,154 @@
+from collections.abc import Sequence
 from domain.ports.ports import AccountRepository
 from domain.entities.entities import Account
 from decimal import Decimal
-from domain.errors import DomainError, AccountAlreadyExists, AccountNotFound
+from domain.errors import DomainError, AccountAlreadyExists, AccountNotFound, AccountVersionConflict, BatchWriteError
 from sqlalchemy.orm import Session 
 from sqlalchemy import text
 from sqlalchemy.exc import IntegrityError as SAIntegrityError
 from datetime import datetime, timezone
 from domain.types.account_status import AccountStatus
 from domain.types.currency import CurrencyType
+from adapters.repositories.lazy_rows import LazyRows
+from adapters.repositories.money import decode_money, to_minor
+from adapters.clock.system_clock import from_epoch_us, to_epoch_us
+from adapters.repositories.ids import id_from_db, id_to_db
+from adapters.repositories.transaction_repository import _to_db_timestamp
+
+
+# expected_version = NULL wyłącza kontrolę wersji (zapis bezwarunkowy)
+UPDATE_BALANCE_SQL = """
+    UPDATE accounts
+    SET
+        balance = :balance,
+        balance_minor = :balance_minor,
+        updated_at = :updated_at,
+        updated_at_us = :updated_at_us,
+        version = version + 1
+    WHERE account_id = :account_id
+      AND (:expected_version IS NULL OR version = :expected_version)
+"""
+
+
+def create_account_error(message: str, account: Account) -> DomainError:
+    """Mapuje komunikat IntegrityError z INSERT-a konta na błąd domenowy (wspólne dla adapterów SQLite)."""
+    if "UNIQUE constraint failed" in message and "accounts.account_id" in message:
+        return AccountAlreadyExists(f"Account with id={account.account_id} already exists")
+    elif "CHECK constraint failed" in message and "balance" in message:
+        return DomainError("Balance must be >= 0")
+    elif "CHECK constraint failed" in message and "currency" in message:
+        return DomainError("Invalid currency")
+    elif "CHECK constraint failed" in message and "status" in message:
+        return DomainError("Invalid status")
+    elif "NOT NULL constraint failed" in message:
+        return DomainError(f"Missing required field ({message.split(':')[-1].strip()})")
+    else:
+        return DomainError(f"Database constraint error: {message}")
+
+
+def row_to_account(row) -> Account:
+    """
+    Buduje Account z wiersza (account_id, owner_name, currency, balance, created_at, updated_at,
+    status, version, balance_minor, created_at_us, updated_at_us).
+    """
+    return Account(
+        account_id=id_from_db(row[0]),
+        owner_name=row[1],
+        currency=CurrencyType(row[2]),
+        balance=decode_money(row[3], row[8]),
+        created_at=from_epoch_us(row[9]) if row[9] is not None else datetime.fromisoformat(row[4]),
+        updated_at=from_epoch_us(row[10]) if row[10] is not None else datetime.fromisoformat(row[5]),
+        status=AccountStatus(row[6]),
+        version=row[7],
+    )
+
+
+def account_page_query(
+    limit: int,
+    status: AccountStatus | None,
+    currency: CurrencyType | None,
+    owner_prefix: str | None,
+    created_from: datetime | None,
+    created_to: datetime | None,
+    after: tuple[datetime, str] | None,
+    epoch_timestamps: bool = False,
+    binary_ids: bool = False,
+) -> tuple[str, dict]:
+    """
+    SELECT strony kont z filtrami (wspólny dla adapterów SQLite, parametry nazwane).
+
+    Filtry równościowe i keyset trafiają w indeksy idx_accounts_*_created_at*_id (migracja 8),
+    więc strona to przejście po indeksie od kursora, bez sortowania całej tabeli.
+    """
+    if epoch_timestamps:
+        created_column, to_db = "created_at_us", to_epoch_us
+    else:
+        created_column, to_db = "created_at", _to_db_timestamp
+
+    conditions: list[str] = []
+    params: dict = {"limit": limit}
+    if status is not None:
+        conditions.append("status = :status")
+        params["status"] = status.value
+    if currency is not None:
+        conditions.append("currency = :currency")
+        params["currency"] = currency.value
+    # prefiks jako zakres (LIKE nie korzysta z indeksu: domyślnie ignoruje wielkość liter)
+    if owner_prefix:
+        conditions.append("owner_name >= :owner_from")
+        params["owner_from"] = owner_prefix
+        upper = prefix_upper_bound(owner_prefix)
+        if upper is not None:
+            conditions.append("owner_name < :owner_to")
+            params["owner_to"] = upper
+    # created_from włącznie, created_to wyłącznie
+    if created_from is not None:
+        conditions.append(f"{created_column} >= :created_from")
+        params["created_from"] = to_db(created_from)
+    if created_to is not None:
+        conditions.append(f"{created_column} < :created_to")
+        params["created_to"] = to_db(created_to)
+    if after is not None:
+        conditions.append(f"({created_column}, account_id) < (:after_created_at, :after_account_id)")
+        params["after_created_at"] = to_db(after[0])
+        params["after_account_id"] = id_to_db(after[1], binary_ids)
+
+    sql = """
+        SELECT account_id, owner_name, currency, balance, created_at, updated_at, status, version,
+               balance_minor, created_at_us, updated_at_us
+        FROM accounts
+    """
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += f" ORDER BY {created_column} DESC, account_id DESC LIMIT :limit"
+    return sql, params
+
+
+def prefix_upper_bound(prefix: str) -> str | None:
+    """Najmniejszy napis większy od wszystkich zaczynających się od prefix (None = brak górnej granicy)."""
+    while prefix:
+        last = ord(prefix[-1])
+        if last < 0x10FFFF:
+            # surogaty (0xD800-0xDFFF) nie mają kodowania UTF-8, sqlite3 rzuciłby UnicodeEncodeError;
+            # w porządku bajtów UTF-8 po U+D7FF następuje od razu U+E000
+            following = last + 1 if not 0xD800 <= last + 1 <= 0xDFFF else 0xE000
+            return prefix[:-1] + chr(following)
+        prefix = prefix[:-1]
+    return None
+
+
+def update_balance_error(message: str) -> DomainError:
+    """Mapuje komunikat IntegrityError z UPDATE salda na błąd domenowy."""
+    if "CHECK constraint failed" in message and "balance" in message:
+        return DomainError("Balance must be >= 0")
+    return DomainError(f"Database constraint error: {message}")
 
 
 class SqliteAccountRepository(AccountRepository):
-    def __init__(self, session: Session):
+    def __init__(self, session: Session, epoch_timestamps: bool = False, binary_ids: bool = False):
         self._session = session
+        self._epoch_timestamps = epoch_timestamps
+        self._binary_ids = binary_ids
 
 
     def create(self, account: Account) -> None:
@@ -20,16 +156,25 @@ class SqliteAccountRepository(AccountRepository):
 
         create_account_entity_sql = """
             INSERT INTO 
-            accounts (account_id, owner_name, currency, balance, created_at, updated_at, status, version) 
-            VALUES(:account_id, :owner_name, :currency, :balance, :created_at, :updated_at, :status, :version)
+            accounts (
+                account_id, owner_name, currency, balance, balance_minor,
+                created_at, created_at_us, updated_at, updated_at_us, status, version
+            ) 
+            VALUES(
+                :account_id, :owner_name, :currency, :balance, :balance_minor,
+                :created_at, :created_at_us, :updated_at, :updated_at_us, :status, :version
+            )
         """
         params = {
-            'account_id' : account.account_id,
+            'account_id' : id_to_db(account.account_id, self._binary_ids),
             'owner_name' : account.owner_name,
             'currency' : account.currency.value,
             'balance' : str(account.balance) if isinstance(account.balance, Decimal) else account.balance,
+            'balance_minor' : to_minor(account.balance),
             'created_at' : account.created_at.isoformat(),
+            'created_at_us' : to_epoch_us(account.created_at),
             'updated_at': account.updated_at.isoformat(),
+            'updated_at_us': to_epoch_us(account.updated_at),
             'status' : account.status.value,
             'version' : 0, 
         }
@@ -37,50 +182,16 @@ class SqliteAccountRepository(AccountRepository):
         try:
             self._session.execute(text(create_account_entity_sql), params)
         except SAIntegrityError as e:
-            message = str(e.orig)
-            if "UNIQUE constraint failed" in message and "accounts.account_id" in message:
-                raise AccountAlreadyExists(f"Account with id={account.account_id} already exists")
-            elif "CHECK constraint failed" in message and "balance" in message:
-                raise DomainError("Balance must be >= 0")
-            elif "CHECK constraint failed" in message and "currency" in message:
-                raise DomainError("Invalid currency")
-            elif "CHECK constraint failed" in message and "status" in message:
-                raise DomainError("Invalid status")
-            elif "NOT NULL constraint failed" in message:
-                raise DomainError(f"Missing required field ({message.split(':')[-1].strip()})")
-            else:
-                raise DomainError(f"Database constraint error: {message}")
+            raise create_account_error(str(e.orig), account)
 
 
     def get(self, account_id: str) -> Account:
         """Zwraca konto po ID lub rzuca AccountNotFound."""
 
-        get_account_entity_sql = """
-            SELECT
-                account_id,
-                owner_name,
-                currency,
-                balance,
-                created_at,
-                updated_at,
-                status
-            FROM accounts
-            WHERE account_id = :account_id
-        """
-        result = self._session.execute(text(get_account_entity_sql),{"account_id": account_id})
-        row = result.mappings().fetchone()
-        if not row:
+        account = self.get_by_id(account_id)
+        if account is None:
             raise AccountNotFound(f"Account with id={account_id} does not exist")
-        
-        return Account(
-        account_id=row["account_id"],
-        owner_name=row["owner_name"],
-        currency=CurrencyType(row["currency"]),
-        balance=Decimal(row["balance"]),
-        created_at=datetime.fromisoformat(row["created_at"]),
-        updated_at=datetime.fromisoformat(row["updated_at"]),
-        status=AccountStatus(row["status"]),
-        )
+        return account
 
 
     def get_by_id(self, account_id: str) -> Account | None:
@@ -93,51 +204,132 @@ class SqliteAccountRepository(AccountRepository):
                 balance,
                 created_at,
                 updated_at,
-                status
+                status,
+                version,
+                balance_minor,
+                created_at_us,
+                updated_at_us
             FROM accounts
             WHERE account_id = :account_id
         """
-        result = self._session.execute(text(get_account_entity_sql), {"account_id": account_id})
-        row = result.mappings().fetchone()
+        row = self._session.execute(
+            text(get_account_entity_sql), {"account_id": id_to_db(account_id, self._binary_ids)}
+        ).fetchone()
         if not row:
             return None
 
-        return Account(
-            account_id=row["account_id"],
-            owner_name=row["owner_name"],
-            currency=CurrencyType(row["currency"]),
-            balance=Decimal(row["balance"]),
-            created_at=datetime.fromisoformat(row["created_at"]),
-            updated_at=datetime.fromisoformat(row["updated_at"]),
-            status=AccountStatus(row["status"]),
+        return row_to_account(row)
+
+
+
+    def get_version(self, account_id: str) -> int | None:
+        """Zwraca samą wersję konta (lekki odczyt do walidacji cache) lub None."""
+
+        return self._session.execute(
+            text("SELECT version FROM accounts WHERE account_id = :account_id"),
+            {"account_id": id_to_db(account_id, self._binary_ids)},
+        ).scalar_one_or_none()
+
+
+    def update_balance(self, account_id: str, new_balance: Decimal, expected_version: int | None = None) -> None:
+        """Aktualizuje saldo i znacznik czasu konta; z expected_version działa jak compare-and-swap."""
+
+        params = self._balance_params(account_id, new_balance, datetime.now(timezone.utc), expected_version)
+
+        try:
+            result = self._session.execute(text(UPDATE_BALANCE_SQL), params)
+        except SAIntegrityError as e:
+            raise update_balance_error(str(e.orig))
+        if result.rowcount == 0:
+            raise self._missing_or_conflict(account_id, expected_version)
+
+
+    def _missing_or_conflict(self, account_id: str, expected_version: int | None) -> DomainError:
+        """Ustala, czy UPDATE nie trafił, bo konta nie ma, czy bo zmieniła się wersja."""
+
+        current_version = self.get_version(account_id)
+        if current_version is None:
+            return AccountNotFound(f"Account with id={account_id} not found")
+        return AccountVersionConflict(
+            f"Account id={account_id} is at version {current_version}, expected {expected_version}"
         )
 
 
+    def update_balances(
+        self,
+        balances: dict[str, Decimal],
+        expected_versions: dict[str, int] | None = None,
+    ) -> None:
+        """Aktualizuje salda wielu kont jednym executemany; przy błędzie rzuca BatchWriteError z błędami per konto."""
 
-    def update_balance(self, account_id: str, new_balance: Decimal) -> None:
-        """Aktualizuje saldo i znacznik czasu konta."""
+        if not balances:
+            return
 
-        update_account_sql = """
-            UPDATE accounts
-            SET
-                balance = :balance,
-                updated_at = :updated_at,
-                version = version + 1
-            WHERE account_id = :account_id
-        """
+        expected_versions = expected_versions or {}
+        updated_at = datetime.now(timezone.utc)
+        params = [
+            self._balance_params(account_id, new_balance, updated_at, expected_versions.get(account_id))
+            for account_id, new_balance in balances.items()
+        ]
 
-        params = {
+        failures: dict[str, DomainError] = {}
+        savepoint = self._session.begin_nested()
+        try:
+            result = self._session.execute(text(UPDATE_BALANCE_SQL), params)
+        except SAIntegrityError:
+            savepoint.rollback()
+            failures = self._diagnose_balance_failures(params)
+        else:
+            if result.rowcount == len(params):
+                savepoint.commit()
+                return
+            savepoint.rollback()
+            failures = self._diagnose_balance_failures(params)
+
+        raise BatchWriteError(f"{len(failures)} of {len(params)} balance updates rejected", failures)
+
+
+    def _diagnose_balance_failures(self, params: list[dict]) -> dict[str, DomainError]:
+        """Powtarza UPDATE konto po koncie w SAVEPOINT-ach, zbiera błędy i wszystko wycofuje."""
+
+        failures: dict[str, DomainError] = {}
+        outer = self._session.begin_nested()
+        try:
+            for row_params in params:
+                account_id = id_from_db(row_params["account_id"])
+                row = self._session.begin_nested()
+                try:
+                    result = self._session.execute(text(UPDATE_BALANCE_SQL), row_params)
+                except SAIntegrityError as e:
+                    row.rollback()
+                    failures[account_id] = update_balance_error(str(e.orig))
+                    continue
+                row.commit()
+                if result.rowcount == 0:
+                    failures[account_id] = self._missing_or_conflict(account_id, row_params["expected_version"])
+        finally:
+            outer.rollback()
+        return failures
+
+
+    def _balance_params(
+        self,
+        account_id: str,
+        new_balance: Decimal,
+        updated_at: datetime,
+        expected_version: int | None = None,
+    ) -> dict:
+        return {
             "balance": str(new_balance) if isinstance(new_balance, Decimal) else new_balance,
-            "updated_at": datetime.now(timezone.utc).isoformat(),
-            "account_id": account_id,
+            "balance_minor": to_minor(new_balance),
+            "updated_at": updated_at.isoformat(),
+            "updated_at_us": to_epoch_us(updated_at),
+            "account_id": id_to_db(account_id, self._binary_ids),
+            "expected_version": expected_version,
         }
 
-        result = self._session.execute(text(update_account_sql), params)
-        if result.rowcount == 0:
-            raise AccountNotFound(f"Account with id={account_id} not found")
-
 
-    def list_all(self, limit: int | None = None) -> list[Account]:
+    def list_all(self, limit: int | None = None) -> Sequence[Account]:
         """Zwraca listę kont, najnowsze najpierw. Opcjonalny LIMIT."""
         base_sql = """
             SELECT
@@ -147,10 +339,14 @@ class SqliteAccountRepository(AccountRepository):
                 balance,
                 created_at,
                 updated_at,
-                status
+                status,
+                version,
+                balance_minor,
+                created_at_us,
+                updated_at_us
             FROM accounts
-            ORDER BY created_at DESC
         """
+        base_sql += " ORDER BY created_at_us DESC" if self._epoch_timestamps else " ORDER BY created_at DESC"
 
         if limit is not None and limit > 0:
             sql = base_sql + " LIMIT :limit"
@@ -159,20 +355,26 @@ class SqliteAccountRepository(AccountRepository):
             sql = base_sql
             params = {}
 
-        result = self._session.execute(text(sql), params)
-        rows = result.mappings().fetchall()
-
-        # Mapowanie rekordów → encje domenowe
-        accounts: list[Account] = [
-            Account(
-                account_id=row["account_id"],
-                owner_name=row["owner_name"],
-                currency=CurrencyType(row["currency"]),
-                balance=Decimal(row["balance"]),
-                created_at=datetime.fromisoformat(row["created_at"]),
-                updated_at=datetime.fromisoformat(row["updated_at"]),
-                status=AccountStatus(row["status"]),
-            )
-            for row in rows
-        ]
-        return accounts
\ No newline at end of file
+        rows = self._session.execute(text(sql), params).all()
+
+        # Mapowanie rekordów → encje domenowe dopiero przy dostępie
+        return LazyRows(rows, row_to_account)
+
+
+    def list_page(
+        self,
+        limit: int,
+        status: AccountStatus | None = None,
+        currency: CurrencyType | None = None,
+        owner_prefix: str | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+        after: tuple[datetime, str] | None = None,
+    ) -> Sequence[Account]:
+        """Zwraca stronę kont spełniających filtry, najnowsze najpierw (keyset po (created_at, account_id))."""
+        sql, params = account_page_query(
+            limit, status, currency, owner_prefix, created_from, created_to, after,
+            self._epoch_timestamps, self._binary_ids,
+        )
+        rows = self._session.execute(text(sql), params).all()
+        return LazyRows(rows, row_to_account)
@@ -1,83 +1,443 @@
+from collections.abc import Iterator, Sequence
 from domain.ports.ports import TransactionRepository
 from sqlalchemy.orm import Session
-from domain.entities.entities import Transaction
+from domain.entities.entities import DailyTotals, Transaction
 from sqlalchemy.exc import IntegrityError as SAIntegrityError
-from domain.errors import DomainError, TransactionAlreadyExists, AccountNotFound
+from domain.errors import (
+    DomainError,
+    TransactionAlreadyExists,
+    AccountNotFound,
+    BalanceLedgerMismatch,
+    BatchWriteError,
+)
 from sqlalchemy import text
 from decimal import Decimal
 from domain.types.currency import CurrencyType
 from domain.types.transaction import TransactionType
-from datetime import datetime
+from datetime import date, datetime, time, timedelta, timezone
+from adapters.repositories.lazy_rows import LazyRows
+from adapters.repositories.money import decode_money, from_minor, to_minor
+from adapters.clock.system_clock import from_epoch_us, to_epoch_us
+from adapters.repositories.ids import id_from_db, id_to_db
+
+
+APPEND_TRANSACTION_SQL = """
+    INSERT INTO 
+    transactions (tx_id, account_id, type, amount, amount_minor, currency, created_at, created_at_us, related_account_id, note) 
+    VALUES(:tx_id, :account_id, :type, :amount, :amount_minor, :currency, :created_at, :created_at_us, :related_account_id, :note)
+"""
+
+# Saldo ledgera: balance_minor NULL = wiersz sprzed backfillu, wtedy zostaje stara kolumna balance.
+# Nowy wiersz = pierwsza transakcja konta, więc jego dzienne sumy są od razu kompletne.
+UPSERT_LEDGER_SQL = """
+    INSERT INTO account_balances (account_id, balance, balance_minor, tx_count, updated_at, daily_totals_ready)
+    VALUES (:account_id, :delta, :delta_minor, :tx_count, :updated_at, 1)
+    ON CONFLICT (account_id) DO UPDATE SET
+        balance = ROUND(balance + excluded.balance, 2),
+        balance_minor = balance_minor + excluded.balance_minor,
+        tx_count = tx_count + excluded.tx_count,
+        updated_at = excluded.updated_at
+"""
+
+# Dzienne sumy (dzień UTC z created_at); przepływy jak w ledgerze, TRANSFER_* liczą się tylko do tx_count.
+UPSERT_DAILY_TOTALS_SQL = """
+    INSERT INTO account_daily_totals (account_id, day, currency, inflow_minor, outflow_minor, tx_count)
+    VALUES (:account_id, :day, :currency, :inflow_minor, :outflow_minor, :tx_count)
+    ON CONFLICT (account_id, day, currency) DO UPDATE SET
+        inflow_minor = inflow_minor + excluded.inflow_minor,
+        outflow_minor = outflow_minor + excluded.outflow_minor,
+        tx_count = tx_count + excluded.tx_count
+"""
+
+DAILY_TOTALS_READY_SQL = "SELECT daily_totals_ready FROM account_balances WHERE account_id = :account_id"
+
+# Suma historii w groszach (INTEGER, dokładna); transakcje bez backfillu przeliczane z amount.
+# Zarchiwizowaną część historii zastępuje saldo otwarcia z account_checkpoints.
+HISTORY_BALANCE_MINOR_SQL = """
+    SELECT
+        COALESCE((SELECT balance_minor FROM account_checkpoints WHERE account_id = :account_id), 0)
+        + COALESCE(SUM(
+            CASE
+                WHEN type = 'DEPOSIT' THEN COALESCE(amount_minor, CAST(ROUND(amount * 100) AS INTEGER))
+                WHEN type = 'WITHDRAW' THEN -COALESCE(amount_minor, CAST(ROUND(amount * 100) AS INTEGER))
+                ELSE 0
+            END
+        ), 0)
+    FROM transactions
+    WHERE account_id = :account_id
+"""
+
+CHECKPOINT_BOUNDARY_SQL = """
+    SELECT boundary_created_at, boundary_tx_id
+    FROM account_checkpoints
+    WHERE account_id = :account_id
+"""
+
+
+def append_transaction_error(message: str, transaction: Transaction) -> DomainError:
+    """Mapuje komunikat IntegrityError z INSERT-a transakcji na błąd domenowy (wspólne dla adapterów SQLite)."""
+    if "UNIQUE constraint failed" in message and "transactions.tx_id" in message:
+        return TransactionAlreadyExists(f"transaction with id={transaction.tx_id} already exists")
+    elif "FOREIGN KEY constraint failed" in message:
+        return AccountNotFound(f"No account id={transaction.account_id}")
+    elif "CHECK constraint failed" in message :
+        return DomainError("Constraint failed (amount>0, valid type/currency?)")
+    elif "NOT NULL constraint failed" in message:
+        return DomainError(f"Missing required field ({message.split(':')[-1].strip()})")
+    else:
+        return DomainError(f"Database constraint error: {message}")
 
 
 class TransactionsRepository(TransactionRepository):
-    def __init__(self, session: Session):
+    def __init__(
+        self,
+        session: Session,
+        consistency_check: bool = False,
+        epoch_timestamps: bool = False,
+        binary_ids: bool = False,
+        archive: bool = False,
+    ):
         self._session = session
+        self._consistency_check = consistency_check
+        # filtry zakresu, sortowanie i keyset po created_at_us (INTEGER) zamiast po tekście ISO
+        self._epoch_timestamps = epoch_timestamps
+        # ID jako 16-bajtowe BLOB-y (konwersja tylko w parametrach; odczyt rozpoznaje typ sam)
+        self._binary_ids = binary_ids
+        # podpięta baza archiwum: historia sięgająca przed saldo otwarcia czyta też archive.transactions
+        self._archive = archive
     
     def append(self, transaction: Transaction) -> None: 
         """Dodaje nowa transakcje do historii."""
 
-        append_transaction_sql = """
-            INSERT INTO 
-            transactions (tx_id, account_id, type, amount, currency, created_at, related_account_id, note) 
-            VALUES(:tx_id, :account_id, :type, :amount, :currency, :created_at, :related_account_id, :note)
-        """
+        try:
+            self._session.execute(text(APPEND_TRANSACTION_SQL), self._transaction_params(transaction))
+        except SAIntegrityError as e:
+            raise self._map_integrity_error(e, transaction)
+
+        self._apply_to_ledger([transaction])
+        self._apply_to_daily_totals([transaction])
+
+
+    def append_many(self, transactions: list[Transaction]) -> None:
+        """Dodaje wiele transakcji jednym executemany; przy błędzie rzuca BatchWriteError z błędami per wiersz."""
+
+        if not transactions:
+            return
 
-        params = {
-            'tx_id': transaction.tx_id,
-            'account_id': transaction.account_id,
+        params = [self._transaction_params(transaction) for transaction in transactions]
+
+        try:
+            with self._session.begin_nested():
+                self._session.execute(text(APPEND_TRANSACTION_SQL), params)
+        except SAIntegrityError:
+            failures = self._diagnose_append_failures(transactions)
+            raise BatchWriteError(f"{len(failures)} of {len(transactions)} transactions rejected", failures)
+
+        self._apply_to_ledger(transactions)
+        self._apply_to_daily_totals(transactions)
+
+
+    def _diagnose_append_failures(self, transactions: list[Transaction]) -> dict[int, DomainError]:
+        """Powtarza batch wiersz po wierszu w SAVEPOINT-ach, zbiera błędy i wszystko wycofuje."""
+
+        failures: dict[int, DomainError] = {}
+        outer = self._session.begin_nested()
+        try:
+            for index, transaction in enumerate(transactions):
+                row = self._session.begin_nested()
+                try:
+                    self._session.execute(text(APPEND_TRANSACTION_SQL), self._transaction_params(transaction))
+                    row.commit()
+                except SAIntegrityError as e:
+                    row.rollback()
+                    failures[index] = self._map_integrity_error(e, transaction)
+        finally:
+            outer.rollback()
+        return failures
+
+
+    def _transaction_params(self, transaction: Transaction) -> dict:
+        return {
+            'tx_id': id_to_db(transaction.tx_id, self._binary_ids),
+            'account_id': id_to_db(transaction.account_id, self._binary_ids),
             'type': transaction.type.value,
             "amount": str(transaction.amount) if isinstance(transaction.amount, Decimal) else transaction.amount,
+            "amount_minor": to_minor(transaction.amount),
             'currency': transaction.currency.value,
             'created_at': transaction.occurred_at.isoformat(),
-            'related_account_id': transaction.related_account_id,
+            'created_at_us': to_epoch_us(transaction.occurred_at),
+            'related_account_id': id_to_db(transaction.related_account_id, self._binary_ids),
             'note': transaction.note
         }
 
-        try:
-            self._session.execute(text(append_transaction_sql), params)
-        except SAIntegrityError as e:
-            message = str(e.orig)
-            if "UNIQUE constraint failed" in message and "transactions.tx_id" in message:
-                raise TransactionAlreadyExists(f"transaction with id={transaction.tx_id} already exists")
-            elif "FOREIGN KEY constraint failed" in message:
-                raise AccountNotFound(f"No account id={transaction.account_id}")
-            elif "CHECK constraint failed" in message :
-                raise DomainError("Constraint failed (amount>0, valid type/currency?)")
-            elif "NOT NULL constraint failed" in message:
-                raise DomainError(f"Missing required field ({message.split(':')[-1].strip()})")
+
+    def _map_integrity_error(self, e: SAIntegrityError, transaction: Transaction) -> DomainError:
+        return append_transaction_error(str(e.orig), transaction)
+
+
+    def _apply_to_ledger(self, transactions: list[Transaction]) -> None:
+        """Przesuwa salda w account_balances (ta sama transakcja SQL co INSERT); jeden wiersz per konto."""
+
+        deltas: dict[str, dict] = {}
+        for transaction in transactions:
+            if transaction.type == TransactionType.DEPOSIT:
+                delta = to_minor(transaction.amount)
+            elif transaction.type == TransactionType.WITHDRAW:
+                delta = -to_minor(transaction.amount)
             else:
-                raise DomainError(f"Database constraint error: {message}")
+                delta = 0
+
+            entry = deltas.setdefault(
+                transaction.account_id,
+                {"account_id": transaction.account_id, "delta_minor": 0, "tx_count": 0, "updated_at": None},
+            )
+            entry["delta_minor"] += delta
+            entry["tx_count"] += 1
+            entry["updated_at"] = transaction.occurred_at.isoformat()
+
+        params = [
+            {
+                **entry,
+                "account_id": id_to_db(entry["account_id"], self._binary_ids),
+                "delta": str(from_minor(entry["delta_minor"])),
+            }
+            for entry in deltas.values()
+        ]
+        self._session.execute(text(UPSERT_LEDGER_SQL), params)
+
+
+    def _apply_to_daily_totals(self, transactions: list[Transaction]) -> None:
+        """Dopisuje transakcje do account_daily_totals (ta sama transakcja SQL co INSERT); jeden wiersz per dzień."""
+
+        params = [
+            {**entry, "account_id": id_to_db(entry["account_id"], self._binary_ids)}
+            for entry in daily_deltas(transactions).values()
+        ]
+        self._session.execute(text(UPSERT_DAILY_TOTALS_SQL), params)
 
-    
 
     def get_balance(self, account_id: str) -> Decimal:
+        """Zwraca saldo z ledgera (O(1)); w trybie spójności porównuje je z sumą historii."""
+
         sql = """
-            SELECT
-                COALESCE(SUM(
-                    CASE 
-                        WHEN type = :deposit THEN amount
-                        WHEN type = :withdraw THEN -amount
-                        ELSE 0
-                    END
-                ), 0)
-            FROM transactions
+            SELECT balance, balance_minor
+            FROM account_balances
             WHERE account_id = :account_id
         """
+        row = self._session.execute(text(sql), {"account_id": id_to_db(account_id, self._binary_ids)}).fetchone()
+        balance = decode_money(row[0], row[1]) if row is not None else Decimal("0")
+
+        if self._consistency_check:
+            history_balance = self.get_balance_from_history(account_id)
+            if balance != history_balance:
+                raise BalanceLedgerMismatch(
+                    f"Ledger balance {balance} != history balance {history_balance} for account id={account_id}"
+                )
+
+        return balance
+
+
+    def get_balance_from_history(self, account_id: str) -> Decimal:
+        """Liczy saldo pełnym SUM po historii transakcji (wolne, do weryfikacji ledgera)."""
+
         result = self._session.execute(
-            text(sql),
-            {
-                "account_id": account_id,
-                "deposit": TransactionType.DEPOSIT.value,
-                "withdraw": TransactionType.WITHDRAW.value,
-            },
+            text(HISTORY_BALANCE_MINOR_SQL), {"account_id": id_to_db(account_id, self._binary_ids)}
         ).scalar_one()
+        return from_minor(result)
+
+
+    def daily_totals(
+        self,
+        account_id: str,
+        date_from: date | None = None,
+        date_to: date | None = None,
+    ) -> Sequence[DailyTotals] | None:
+        """
+        Zwraca dzienne sumy konta z account_daily_totals (dni UTC, date_to wyłącznie).
+
+        Obejmują też zarchiwizowaną historię (wiersze sum zostają po archiwizacji).
+        None, gdy historia konta sprzed migracji 7 nie jest jeszcze zsumowana.
+        """
+
+        if not self._daily_totals_ready(account_id):
+            return None
+        sql, params = daily_totals_query(
+            "day, currency, inflow_minor, outflow_minor, tx_count",
+            id_to_db(account_id, self._binary_ids),
+            date_from.isoformat() if date_from is not None else None,
+            date_to.isoformat() if date_to is not None else None,
+        )
+        rows = self._session.execute(text(sql + " ORDER BY day, currency"), params).all()
+        return [row_to_daily_totals(account_id, row) for row in rows]
+
+
+    def count_for_account(
+        self,
+        account_id: str,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+    ) -> int | None:
+        """
+        Liczba transakcji konta w zakresie (to, co zwróciłoby list_for_account bez limitu).
+
+        Pełne dni sumuje z account_daily_totals, a niepełne dni na brzegach zakresu liczy
+        z historii po indeksie konta. None, gdy sumy nie są gotowe albo zakres sięga
+        zarchiwizowanej historii bez podpiętego archiwum (listowanie jej wtedy nie widzi).
+        """
+
+        if not self._daily_totals_ready(account_id):
+            return None
+        if not self._archive and self._archive_boundary(account_id, date_from) is not None:
+            return None
+
+        full_days, edges = split_day_range(date_from, date_to)
+        count = 0
+        if full_days is not None:
+            sql, params = daily_totals_query(
+                "COALESCE(SUM(tx_count), 0)", id_to_db(account_id, self._binary_ids), *full_days
+            )
+            count += self._session.execute(text(sql), params).scalar_one()
+        for edge_from, edge_to in edges:
+            count += self._count_rows(account_id, edge_from, edge_to)
+        return count
 
-        return Decimal(str(result))
 
+    def _daily_totals_ready(self, account_id: str) -> bool:
+        row = self._session.execute(
+            text(DAILY_TOTALS_READY_SQL), {"account_id": id_to_db(account_id, self._binary_ids)}
+        ).fetchone()
+        # konto bez wiersza ledgera nie ma jeszcze żadnej transakcji
+        return row is None or bool(row[0])
 
-    def list_for_account(self, account_id: str, limit: int | None = None) -> list[Transaction]:
-        base_sql = """
+
+    def _count_rows(self, account_id: str, date_from: datetime | None, date_to: datetime | None) -> int:
+        """COUNT(*) historii w zakresie, z tymi samymi filtrami co list_for_account (także archiwum)."""
+
+        tables = [("transactions", None)]
+        boundary = self._archive_boundary(account_id, date_from) if self._archive else None
+        if boundary is not None:
+            tables.append(("archive.transactions", boundary))
+        count = 0
+        for table, table_boundary in tables:
+            sql, params = self._list_query(table, account_id, None, date_from, date_to, None, None, table_boundary)
+            count += self._session.execute(text(f"SELECT COUNT(*) FROM ({sql})"), params).scalar_one()
+        return count
+
+
+    def list_for_account(
+        self,
+        account_id: str,
+        limit: int | None = None,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+        types: set[TransactionType] | None = None,
+        after: tuple[datetime, str] | None = None,
+    ) -> Sequence[Transaction]:
+        """
+        Zwraca historię konta od najnowszych; filtry i keyset (created_at, tx_id) liczone w SQL.
+
+        Gdy gorąca tabela nie wypełni limitu, a zapytanie sięga przed saldo otwarcia,
+        resztę dobiera z archive.transactions (tam są wyłącznie starsze wiersze).
+        """
+
+        rows = self._list_rows("transactions", account_id, limit, date_from, date_to, types, after)
+
+        if self._archive and (limit is None or limit <= 0 or len(rows) < limit):
+            boundary = self._archive_boundary(account_id, date_from)
+            if boundary is not None:
+                remaining = limit - len(rows) if limit is not None and limit > 0 else None
+                rows += self._list_rows(
+                    "archive.transactions", account_id, remaining, date_from, date_to, types, after, boundary
+                )
+
+        return LazyRows(rows, row_to_transaction)
+
+
+    def _archive_boundary(self, account_id: str, date_from: datetime | None) -> tuple | None:
+        """Klucz (created_at, tx_id) ostatniej zarchiwizowanej transakcji, jeśli zapytanie po nią sięga."""
+
+        row = self._session.execute(
+            text(CHECKPOINT_BOUNDARY_SQL), {"account_id": id_to_db(account_id, self._binary_ids)}
+        ).fetchone()
+        if row is None or not reaches_archive(row[0], date_from):
+            return None
+        return tuple(row)
+
+
+    def iter_for_account(
+        self,
+        account_id: str,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+        types: set[TransactionType] | None = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Transaction]:
+        """
+        Strumieniuje historię konta od najstarszych (wyciąg); w pamięci jest najwyżej batch_size wierszy.
+
+        Kursor zostaje otwarty między porcjami (yield_per), więc całość czyta jeden
+        snapshot bazy. Najpierw archiwum (wiersze do granicy salda otwarcia), potem gorąca tabela.
+        """
+
+        boundary = self._archive_boundary(account_id, date_from) if self._archive else None
+        if boundary is not None:
+            yield from self._stream_rows(
+                "archive.transactions", account_id, date_from, date_to, types, boundary, batch_size
+            )
+        yield from self._stream_rows("transactions", account_id, date_from, date_to, types, None, batch_size)
+
+
+    def _stream_rows(
+        self,
+        table: str,
+        account_id: str,
+        date_from: datetime | None,
+        date_to: datetime | None,
+        types: set[TransactionType] | None,
+        boundary: tuple | None,
+        batch_size: int,
+    ) -> Iterator[Transaction]:
+        sql, params = self._list_query(
+            table, account_id, None, date_from, date_to, types, None, boundary, oldest_first=True
+        )
+        result = self._session.execute(text(sql), params, execution_options={"yield_per": batch_size})
+        try:
+            for rows in result.partitions():
+                for row in rows:
+                    yield row_to_transaction(row)
+        finally:
+            # przerwany eksport nie zostawia otwartego kursora
+            result.close()
+
+
+    def _list_rows(
+        self,
+        table: str,
+        account_id: str,
+        limit: int | None,
+        date_from: datetime | None,
+        date_to: datetime | None,
+        types: set[TransactionType] | None,
+        after: tuple[datetime, str] | None,
+        boundary: tuple | None = None,
+    ) -> list:
+        sql, params = self._list_query(table, account_id, limit, date_from, date_to, types, after, boundary)
+        return self._session.execute(text(sql), params).all()
+
+
+    def _list_query(
+        self,
+        table: str,
+        account_id: str,
+        limit: int | None,
+        date_from: datetime | None,
+        date_to: datetime | None,
+        types: set[TransactionType] | None,
+        after: tuple[datetime, str] | None,
+        boundary: tuple | None = None,
+        oldest_first: bool = False,
+    ) -> tuple[str, dict]:
+        base_sql = f"""
             SELECT
                 tx_id, 
                 account_id, 
@@ -86,32 +446,181 @@ class TransactionsRepository(TransactionRepository):
                 currency, 
                 created_at, 
                 related_account_id, 
-                note
-            FROM transactions
+                note,
+                amount_minor,
+                created_at_us
+            FROM {table}
             WHERE account_id = :account_id
-            ORDER BY created_at DESC
         """
+        params: dict = {"account_id": id_to_db(account_id, self._binary_ids)}
+        conditions: list[str] = []
+        if self._epoch_timestamps:
+            created_column, to_db = "created_at_us", to_epoch_us
+        else:
+            created_column, to_db = "created_at", _to_db_timestamp
+
+        # date_from włącznie, date_to wyłącznie
+        if date_from is not None:
+            conditions.append(f"{created_column} >= :date_from")
+            params["date_from"] = to_db(date_from)
+        if date_to is not None:
+            conditions.append(f"{created_column} < :date_to")
+            params["date_to"] = to_db(date_to)
+
+        if types:
+            placeholders = []
+            for i, tx_type in enumerate(sorted(types, key=lambda t: t.value)):
+                params[f"type_{i}"] = tx_type.value
+                placeholders.append(f":type_{i}")
+            conditions.append(f"type IN ({', '.join(placeholders)})")
+
+        if after is not None:
+            conditions.append(f"({created_column}, tx_id) < (:after_created_at, :after_tx_id)")
+            params["after_created_at"] = to_db(after[0])
+            params["after_tx_id"] = id_to_db(after[1], self._binary_ids)
+
+        # wiersze skopiowane do archiwum, ale jeszcze nieusunięte z gorącej tabeli, są za granicą
+        if boundary is not None:
+            conditions.append("(created_at, tx_id) <= (:boundary_created_at, :boundary_tx_id)")
+            params["boundary_created_at"], params["boundary_tx_id"] = boundary
+
+        sql = base_sql
+        for condition in conditions:
+            sql += f" AND {condition}"
+        direction = "ASC" if oldest_first else "DESC"
+        sql += f" ORDER BY {created_column} {direction}, tx_id {direction}"
 
         if limit is not None and limit > 0:
-            sql = base_sql + " LIMIT :limit"
-            params = {"account_id": account_id, "limit": limit}
-        else:
-            sql = base_sql
-            params = {"account_id": account_id}
-
-        result = self._session.execute(text(sql), params)
-        rows = result.mappings().fetchall()
-
-        return [
-            Transaction(
-                tx_id=row["tx_id"],
-                type=TransactionType(row["type"]),
-                account_id=row["account_id"],
-                amount=Decimal(row["amount"]),
-                currency=CurrencyType(row["currency"]),
-                occurred_at=datetime.fromisoformat(row["created_at"]),
-                related_account_id=row["related_account_id"],
-                note=row["note"],
-            )
-            for row in rows
-        ]
\ No newline at end of file
+            sql += " LIMIT :limit"
+            params["limit"] = limit
+
+        return sql, params
+
+
+def row_to_transaction(row) -> Transaction:
+    """
+    Buduje Transaction z wiersza (tx_id, account_id, type, amount, currency, created_at,
+    related_account_id, note, amount_minor, created_at_us).
+    """
+    return Transaction(
+        tx_id=id_from_db(row[0]),
+        account_id=id_from_db(row[1]),
+        type=TransactionType(row[2]),
+        amount=decode_money(row[3], row[8]),
+        currency=CurrencyType(row[4]),
+        occurred_at=from_epoch_us(row[9]) if row[9] is not None else datetime.fromisoformat(row[5]),
+        related_account_id=id_from_db(row[6]),
+        note=row[7],
+    )
+
+
+def row_to_daily_totals(account_id: str, row) -> DailyTotals:
+    """Buduje DailyTotals z wiersza (day, currency, inflow_minor, outflow_minor, tx_count)."""
+    return DailyTotals(
+        account_id=account_id,
+        day=date.fromisoformat(row[0]),
+        currency=CurrencyType(row[1]),
+        inflow=from_minor(row[2]),
+        outflow=from_minor(row[3]),
+        count=row[4],
+    )
+
+
+def daily_deltas(transactions: list[Transaction]) -> dict[tuple, dict]:
+    """Przyrosty account_daily_totals z transakcji, zsumowane per (konto, dzień UTC, waluta)."""
+    deltas: dict[tuple, dict] = {}
+    for transaction in transactions:
+        day = utc_day(transaction.occurred_at)
+        entry = deltas.setdefault(
+            (transaction.account_id, day, transaction.currency),
+            {
+                "account_id": transaction.account_id,
+                "day": day,
+                "currency": transaction.currency.value,
+                "inflow_minor": 0,
+                "outflow_minor": 0,
+                "tx_count": 0,
+            },
+        )
+        if transaction.type == TransactionType.DEPOSIT:
+            entry["inflow_minor"] += to_minor(transaction.amount)
+        elif transaction.type == TransactionType.WITHDRAW:
+            entry["outflow_minor"] += to_minor(transaction.amount)
+        entry["tx_count"] += 1
+    return deltas
+
+
+def daily_totals_query(columns: str, account_key, day_from: str | None, day_to: str | None) -> tuple[str, dict]:
+    """SELECT z account_daily_totals dla konta i zakresu dni 'YYYY-MM-DD' (day_to wyłącznie; None = bez granicy)."""
+    sql = f"SELECT {columns} FROM account_daily_totals WHERE account_id = :account_id"
+    params: dict = {"account_id": account_key}
+    if day_from is not None:
+        sql += " AND day >= :day_from"
+        params["day_from"] = day_from
+    if day_to is not None:
+        sql += " AND day < :day_to"
+        params["day_to"] = day_to
+    return sql, params
+
+
+def utc_day(value: datetime) -> str:
+    """Dzień UTC jako 'YYYY-MM-DD' (to samo co date(created_at) w SQLite; czas bez strefy = UTC)."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.date().isoformat()
+
+
+def split_day_range(
+    date_from: datetime | None,
+    date_to: datetime | None,
+) -> tuple[tuple[str | None, str | None] | None, list[tuple[datetime | None, datetime | None]]]:
+    """
+    Dzieli zakres [date_from, date_to) na pełne dni UTC i niepełne kawałki na brzegach.
+
+    Zwraca (pierwszy dzień, dzień za ostatnim) pełnych dni (None = bez granicy; całość None,
+    gdy pełnych dni nie ma) oraz listę brzegowych zakresów do policzenia z historii.
+    """
+    start = _as_utc(date_from) if date_from is not None else None
+    end = _as_utc(date_to) if date_to is not None else None
+    first = _next_midnight(start) if start is not None else None
+    last = datetime.combine(end.date(), time(), timezone.utc) if end is not None else None
+
+    if first is not None and last is not None and first > last:
+        # zakres w obrębie jednego dnia
+        return None, [(start, end)] if start < end else []
+
+    edges = []
+    if start is not None and start != first:
+        edges.append((start, first))
+    if end is not None and end != last:
+        edges.append((last, end))
+    if first is not None and first == last:
+        return None, edges
+    return (
+        first.date().isoformat() if first is not None else None,
+        last.date().isoformat() if last is not None else None,
+    ), edges
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _next_midnight(value: datetime) -> datetime:
+    """value, jeśli to północ UTC, inaczej północ następnego dnia."""
+    midnight = datetime.combine(value.date(), time(), timezone.utc)
+    return midnight if midnight == value else midnight + timedelta(days=1)
+
+
+def reaches_archive(boundary_created_at: str, date_from: datetime | None) -> bool:
+    """Czy zakres od date_from obejmuje zarchiwizowaną część historii (created_at <= granica)."""
+    return date_from is None or _to_db_timestamp(date_from) <= boundary_created_at
+
+
+def _to_db_timestamp(value: datetime) -> str:
+    """Normalizuje datetime do formatu kolumny created_at (ISO-8601 w UTC)."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat()
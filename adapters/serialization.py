@@ -0,0 +1,95 @@
+import dataclasses
+import types
+import typing
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from enum import Enum
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+def to_jsonable(value: Any) -> Any:
+    """Zamienia DTO (dataclass) na struktury JSON: Decimal -> str, datetime/date -> ISO, Enum -> value."""
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {field.name: to_jsonable(getattr(value, field.name)) for field in dataclasses.fields(value)}
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [to_jsonable(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): to_jsonable(item) for key, item in value.items()}
+    return value
+
+
+def from_jsonable(cls: type[T], payload: dict) -> T:
+    """Buduje komendę (dataclass z application/dto/requests) z dict-a JSON; rzuca ValueError przy złych danych."""
+    if not isinstance(payload, dict):
+        raise ValueError("Expected a JSON object")
+
+    hints = typing.get_type_hints(cls)
+    kwargs = {}
+    for field in dataclasses.fields(cls):
+        if field.name not in payload:
+            continue
+        try:
+            kwargs[field.name] = _coerce(hints[field.name], payload[field.name])
+        except (ValueError, TypeError, InvalidOperation):
+            raise ValueError(f"Invalid value for '{field.name}'")
+
+    unknown = set(payload) - {field.name for field in dataclasses.fields(cls)}
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+
+    try:
+        return cls(**kwargs)
+    except TypeError:
+        missing = [
+            field.name for field in dataclasses.fields(cls)
+            if field.name not in kwargs
+            and field.default is dataclasses.MISSING
+            and field.default_factory is dataclasses.MISSING
+        ]
+        raise ValueError(f"Missing fields: {', '.join(missing)}")
+
+
+def _coerce(hint: Any, value: Any) -> Any:
+    origin = typing.get_origin(hint)
+
+    if origin in (typing.Union, types.UnionType):
+        if value is None:
+            return None
+        inner = [arg for arg in typing.get_args(hint) if arg is not type(None)]
+        return _coerce(inner[0], value)
+
+    if origin in (set, list):
+        (item_hint,) = typing.get_args(hint)
+        if isinstance(value, str):
+            value = [part for part in value.split(",") if part]
+        return origin(_coerce(item_hint, item) for item in value)
+
+    if hint is Decimal:
+        if isinstance(value, float):
+            raise ValueError("Amounts must be strings or integers, not floats")
+        result = Decimal(str(value))
+        # NaN / Infinity przeszłyby do use-case'u i wywróciły porównanie kwoty (InvalidOperation)
+        if not result.is_finite():
+            raise ValueError("Amounts must be finite")
+        return result
+    if hint is datetime:
+        return datetime.fromisoformat(value)
+    if hint is date:
+        return date.fromisoformat(value)
+    if isinstance(hint, type) and issubclass(hint, Enum):
+        return hint(value)
+    if hint is int:
+        return int(value)
+    if hint is str:
+        if not isinstance(value, str):
+            raise ValueError("Expected a string")
+        return value
+    return value
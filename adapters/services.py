@@ -0,0 +1,231 @@
+from contextlib import asynccontextmanager
+from functools import lru_cache
+
+from config.config import (
+    BALANCE_CONSISTENCY_CHECK,
+    REPOSITORY_BACKEND,
+    TIMESTAMP_STORAGE,
+    ID_PROVIDER,
+    ID_STORAGE,
+    ARCHIVE_PATH,
+    SHARD_COUNT,
+    SHARD_DIR,
+    ACCOUNT_CACHE_SIZE,
+    ACCOUNT_CACHE_BALANCES,
+    ACCOUNT_CACHE_VERIFY_VERSION,
+)
+from adapters.repositories.sqlite_account_repository import SqliteAccountRepository
+from adapters.repositories.cached_account_repository import AccountCache, CachedAccountRepository
+from adapters.repositories.transaction_repository import TransactionsRepository
+from adapters.repositories.sqlite3_account_repository import Sqlite3AccountRepository
+from adapters.repositories.sqlite3_transaction_repository import Sqlite3TransactionsRepository
+from adapters.clock.system_clock import SystemClock
+from adapters.id_provider.id_provider import UUIDIdProvider, UUID7IdProvider
+
+from application.use_cases.create_account import CreateAccountUseCase
+from application.use_cases.deposit import DepositUseCase
+from application.use_cases.withdraw import WithdrawUseCase
+from application.use_cases.transfer import TransferUseCase
+from application.use_cases.get_balance import GetBalanceUseCase
+from application.use_cases.list_transactions import ListTransactionsUseCase
+from application.use_cases.export_transactions import ExportTransactionsUseCase
+from application.use_cases.get_account_summary import GetAccountSummaryUseCase
+from application.use_cases.list_accounts import ListAccountsUseCase
+
+
+# --------- infra: UoW + DI (wspólne dla CLI, HTTP, batch, group commit) --------- #
+
+REPOSITORY_BACKENDS = {
+    "sqlalchemy": (SqliteAccountRepository, TransactionsRepository),
+    "sqlite3": (Sqlite3AccountRepository, Sqlite3TransactionsRepository),
+}
+
+if REPOSITORY_BACKEND not in REPOSITORY_BACKENDS:
+    raise ValueError(
+        f"Unknown BANK_REPOSITORY_BACKEND '{REPOSITORY_BACKEND}' (expected one of: {', '.join(REPOSITORY_BACKENDS)})"
+    )
+
+TIMESTAMP_STORAGES = ("iso", "epoch_us")
+
+if TIMESTAMP_STORAGE not in TIMESTAMP_STORAGES:
+    raise ValueError(
+        f"Unknown BANK_TIMESTAMP_STORAGE '{TIMESTAMP_STORAGE}' (expected one of: {', '.join(TIMESTAMP_STORAGES)})"
+    )
+
+EPOCH_TIMESTAMPS = TIMESTAMP_STORAGE == "epoch_us"
+
+ID_PROVIDERS = {provider.name: provider for provider in (UUIDIdProvider, UUID7IdProvider)}
+ID_STORAGES = ("text", "blob")
+
+if ID_PROVIDER not in ID_PROVIDERS:
+    raise ValueError(f"Unknown BANK_ID_PROVIDER '{ID_PROVIDER}' (expected one of: {', '.join(ID_PROVIDERS)})")
+if ID_STORAGE not in ID_STORAGES:
+    raise ValueError(f"Unknown BANK_ID_STORAGE '{ID_STORAGE}' (expected one of: {', '.join(ID_STORAGES)})")
+
+BINARY_IDS = ID_STORAGE == "blob"
+
+# historia sprzed salda otwarcia czytana z podpiętej bazy archiwum
+ARCHIVE = ARCHIVE_PATH is not None
+
+# jeden generator na proces: UUIDv7 pilnuje monotoniczności między sesjami i wątkami
+id_provider = ID_PROVIDERS[ID_PROVIDER]()
+
+# jeden cache na proces, współdzielony przez wszystkie sesje (i wątki)
+account_cache = AccountCache(ACCOUNT_CACHE_SIZE) if ACCOUNT_CACHE_SIZE > 0 else None
+
+
+def _repositories(session, backend: str):
+    """Para (repozytorium kont, repozytorium transakcji) na danej sesji, z cache kont i ustawieniami z configu."""
+    account_repo_cls, tx_repo_cls = REPOSITORY_BACKENDS[backend]
+    account_repo = account_repo_cls(session, epoch_timestamps=EPOCH_TIMESTAMPS, binary_ids=BINARY_IDS)
+    if account_cache is not None:
+        account_repo = CachedAccountRepository(
+            account_repo,
+            account_cache,
+            session,
+            cache_balances=ACCOUNT_CACHE_BALANCES,
+            verify_version=ACCOUNT_CACHE_VERIFY_VERSION,
+        )
+    tx_repo = tx_repo_cls(
+        session,
+        consistency_check=BALANCE_CONSISTENCY_CHECK,
+        epoch_timestamps=EPOCH_TIMESTAMPS,
+        binary_ids=BINARY_IDS,
+        archive=ARCHIVE,
+    )
+    return account_repo, tx_repo
+
+
+class Services:
+    """
+    Use-case'y jednej jednostki pracy.
+
+    Z read_session (ReadSessionLocal) saldo i historia idą przez silnik tylko do
+    odczytu; bez niej wszystko działa na `session` (np. group commit, batch).
+    """
+
+    def __init__(self, session, backend: str = REPOSITORY_BACKEND, read_session=None):
+        account_repo, tx_repo = _repositories(session, backend)
+        if read_session is not None:
+            read_account_repo, read_tx_repo = _repositories(read_session, backend)
+        else:
+            read_account_repo, read_tx_repo = account_repo, tx_repo
+        clock = SystemClock()
+        idp = id_provider
+
+        self.create_account = CreateAccountUseCase(account_repo, tx_repo, clock, idp)
+        self.deposit = DepositUseCase(account_repo, tx_repo, clock, idp)
+        self.withdraw = WithdrawUseCase(account_repo, tx_repo, clock, idp)
+        self.transfer = TransferUseCase(account_repo, tx_repo, clock, idp)
+        self.get_balance = GetBalanceUseCase(read_account_repo, read_tx_repo, clock)
+        self.list_transactions = ListTransactionsUseCase(read_account_repo, read_tx_repo)
+        self.export_transactions = ExportTransactionsUseCase(read_account_repo, read_tx_repo)
+        self.get_account_summary = GetAccountSummaryUseCase(read_account_repo, read_tx_repo)
+        self.list_accounts = ListAccountsUseCase(read_account_repo)
+
+
+# sharding włączony dla BANK_SHARD_COUNT >= 2
+SHARDED = SHARD_COUNT > 1
+
+
+@lru_cache(maxsize=None)
+def shard_set():
+    """Jeden ShardSet (silniki shardów + koordynator) na proces."""
+    from adapters.sharding.shard_set import ShardSet
+
+    return ShardSet(
+        SHARD_DIR,
+        SHARD_COUNT,
+        repositories=lambda session: _repositories(session, REPOSITORY_BACKEND),
+        binary_ids=BINARY_IDS,
+    )
+
+
+class ShardedServices:
+    """Use-case'y na ShardedSession: każde konto (z historią i saldem) żyje na shardzie wskazanym przez hash ID."""
+
+    def __init__(self, session):
+        from adapters.repositories.sharded_repositories import (
+            ShardedAccountRepository,
+            ShardedTransactionsRepository,
+        )
+
+        account_repo = ShardedAccountRepository(session)
+        tx_repo = ShardedTransactionsRepository(session)
+        clock = SystemClock()
+        idp = id_provider
+
+        self.create_account = CreateAccountUseCase(account_repo, tx_repo, clock, idp)
+        self.deposit = DepositUseCase(account_repo, tx_repo, clock, idp)
+        self.withdraw = WithdrawUseCase(account_repo, tx_repo, clock, idp)
+        self.transfer = TransferUseCase(account_repo, tx_repo, clock, idp)
+        self.get_balance = GetBalanceUseCase(account_repo, tx_repo, clock)
+        self.list_transactions = ListTransactionsUseCase(account_repo, tx_repo)
+        self.export_transactions = ExportTransactionsUseCase(account_repo, tx_repo)
+        self.get_account_summary = GetAccountSummaryUseCase(account_repo, tx_repo)
+        self.list_accounts = ListAccountsUseCase(account_repo)
+
+
+class AsyncServices:
+    """
+    Kontener use-case'ów asynchronicznych na jednej AsyncSession (jedna jednostka pracy).
+
+    Z read_session (AsyncReadSessionLocal) saldo, historia i lista kont idą przez
+    silnik tylko do odczytu, jak w Services.
+    """
+
+    def __init__(self, session, read_session=None):
+        from application.use_cases.create_account import AsyncCreateAccountUseCase
+        from application.use_cases.deposit import AsyncDepositUseCase
+        from application.use_cases.withdraw import AsyncWithdrawUseCase
+        from application.use_cases.transfer import AsyncTransferUseCase
+        from application.use_cases.get_balance import AsyncGetBalanceUseCase
+        from application.use_cases.list_transactions import AsyncListTransactionsUseCase
+        from application.use_cases.list_accounts import AsyncListAccountsUseCase
+
+        account_repo, tx_repo = _async_repositories(session)
+        if read_session is not None:
+            read_account_repo, read_tx_repo = _async_repositories(read_session)
+        else:
+            read_account_repo, read_tx_repo = account_repo, tx_repo
+        clock = SystemClock()
+        idp = id_provider
+
+        self.create_account = AsyncCreateAccountUseCase(account_repo, tx_repo, clock, idp)
+        self.deposit = AsyncDepositUseCase(account_repo, tx_repo, clock, idp)
+        self.withdraw = AsyncWithdrawUseCase(account_repo, tx_repo, clock, idp)
+        self.transfer = AsyncTransferUseCase(account_repo, tx_repo, clock, idp)
+        self.get_balance = AsyncGetBalanceUseCase(read_account_repo, read_tx_repo, clock)
+        self.list_transactions = AsyncListTransactionsUseCase(read_account_repo, read_tx_repo)
+        self.list_accounts = AsyncListAccountsUseCase(read_account_repo)
+
+
+def _async_repositories(session):
+    """Para asynchronicznych repozytoriów (kont, transakcji) na danej AsyncSession."""
+    from adapters.repositories.async_sqlite_account_repository import AsyncSqliteAccountRepository
+    from adapters.repositories.async_transaction_repository import AsyncTransactionsRepository
+
+    account_repo = AsyncSqliteAccountRepository(session, epoch_timestamps=EPOCH_TIMESTAMPS, binary_ids=BINARY_IDS)
+    tx_repo = AsyncTransactionsRepository(
+        session,
+        consistency_check=BALANCE_CONSISTENCY_CHECK,
+        epoch_timestamps=EPOCH_TIMESTAMPS,
+        binary_ids=BINARY_IDS,
+        archive=ARCHIVE,
+    )
+    return account_repo, tx_repo
+
+
+@asynccontextmanager
+async def async_services():
+    """Otwiera AsyncSession (i sesję tylko do odczytu), daje AsyncServices i robi COMMIT (albo ROLLBACK przy błędzie)."""
+    from async_db import AsyncReadSessionLocal, AsyncSessionLocal
+
+    # obie sesje łączą się leniwie: odczyt nie otwiera połączenia do zapisu i odwrotnie
+    async with AsyncSessionLocal() as session, AsyncReadSessionLocal() as read_session:
+        try:
+            yield AsyncServices(session, read_session=read_session)
+            await session.commit()
+        except BaseException:
+            await session.rollback()
+            raise
@@ -0,0 +1,275 @@
+import hashlib
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session, sessionmaker
+
+from adapters.repositories.ids import id_to_db
+from adapters.sharding.transfer_log import ABORTED, COMMITTED, TransferLog, TransferLogEntry
+from application.retry import RetryPolicy
+from domain.entities.entities import Transaction
+from domain.errors import BatchWriteError, CrossShardCommitError, TransactionAlreadyExists
+from domain.types.transaction import TransactionType
+
+
+# Wpis PREPARED młodszy niż to okno może jeszcze kończyć proces, który go zapisał
+# (COMMIT shardu czeka najwyżej busy_timeout), więc recovery go nie rusza.
+RECOVERY_GRACE = timedelta(seconds=60)
+
+TX_EXISTS_SQL = "SELECT 1 FROM transactions WHERE tx_id = :tx_id"
+
+
+def shard_for(account_id: str, shard_count: int) -> int:
+    """Numer shardu konta: stabilny hash ID (w przeciwieństwie do hash() ten sam w każdym procesie)."""
+    digest = hashlib.blake2b(account_id.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % shard_count
+
+
+# Konto z related_account_id leży zwykle w innym pliku, a klucz obcy SQLite nie sięga
+# poza plik; istnienie obu kont i tak sprawdzają use-case'y przed zapisem.
+def _disable_foreign_keys(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=OFF")
+    cursor.close()
+
+
+@dataclass
+class RecoveryReport:
+    committed: int = 0
+    aborted: int = 0
+
+
+class ShardSet:
+    """
+    N plików SQLite (shard-00.db ...) z osobnym silnikiem i pulą każdy, plus baza koordynatora.
+
+    Każdy shard ma własny WAL i własny lock zapisu, więc zapisy na różnych
+    shardach (z różnych procesów) nie czekają na siebie.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        shard_count: int,
+        repositories: Callable[[Session], tuple],
+        binary_ids: bool = False,
+    ):
+        from db import install_sqlite_hooks
+
+        if shard_count < 2:
+            raise ValueError("ShardSet needs at least 2 shards")
+        directory.mkdir(parents=True, exist_ok=True)
+
+        self.shard_count = shard_count
+        self._repositories = repositories
+        self._binary_ids = binary_ids
+        self.engines = []
+        self.session_factories = []
+        for shard in range(shard_count):
+            shard_engine = create_engine(f"sqlite:///{directory / f'shard-{shard:02d}.db'}", echo=False, future=True)
+            install_sqlite_hooks(shard_engine)
+            event.listen(shard_engine, "connect", _disable_foreign_keys)
+            self.engines.append(shard_engine)
+            self.session_factories.append(sessionmaker(bind=shard_engine, autoflush=False, autocommit=False))
+
+        self.transfer_log = TransferLog(directory / "coordinator.db", shard_count)
+
+    def shard_for(self, account_id: str) -> int:
+        return shard_for(account_id, self.shard_count)
+
+    def session(self) -> "ShardedSession":
+        return ShardedSession(self)
+
+    def repositories(self, session: Session) -> tuple:
+        """Para (repozytorium kont, repozytorium transakcji) na sesji jednego shardu."""
+        return self._repositories(session)
+
+    def recover(self, grace: timedelta = RECOVERY_GRACE) -> RecoveryReport:
+        """Dokańcza albo porzuca zapisy między shardami przerwane awarią (wpisy PREPARED starsze niż `grace`)."""
+        report = RecoveryReport()
+        for entry in self.transfer_log.pending(datetime.now(timezone.utc) - grace):
+            if self.recover_entry(entry):
+                report.committed += 1
+            else:
+                report.aborted += 1
+        return report
+
+    def recover_entry(self, entry: TransferLogEntry) -> bool:
+        """
+        Shard główny (obciążany) robi COMMIT pierwszy, więc decyduje jego stan: bez jego
+        nóg zapis nie zaszedł nigdzie (ABORTED), z nimi resztę nóg odtwarzamy (COMMITTED).
+        """
+        primary_legs = entry.legs[entry.primary_shard]
+        with self.session_factories[entry.primary_shard]() as session:
+            applied = self._legs_applied(session, primary_legs)
+        if not applied:
+            self.transfer_log.finish(entry.log_id, ABORTED)
+            return False
+
+        for shard, transactions in entry.legs.items():
+            if shard != entry.primary_shard:
+                RetryPolicy().run(lambda: self._redo_legs(shard, transactions))
+        self.transfer_log.finish(entry.log_id, COMMITTED)
+        return True
+
+    def _legs_applied(self, session: Session, transactions: list[Transaction]) -> bool:
+        # nogi jednego shardu idą jednym COMMIT-em: wystarczy sprawdzić pierwszą
+        tx_id = id_to_db(transactions[0].tx_id, self._binary_ids)
+        return session.execute(text(TX_EXISTS_SQL), {"tx_id": tx_id}).first() is not None
+
+    def _redo_legs(self, shard: int, transactions: list[Transaction]) -> None:
+        """Dopisuje nogi na shardzie i przesuwa salda kont o ich sumę (idempotentne po tx_id)."""
+        session = self.session_factories[shard]()
+        try:
+            if self._legs_applied(session, transactions):
+                return
+            account_repo, tx_repo = self.repositories(session)
+            try:
+                tx_repo.append_many(transactions)
+            except BatchWriteError as e:
+                # równoległy proces zdążył dokończyć ten sam wpis
+                if all(isinstance(failure, TransactionAlreadyExists) for failure in e.failures.values()):
+                    session.rollback()
+                    return
+                raise
+            for account_id, delta in balance_deltas(transactions).items():
+                account = account_repo.get(account_id)
+                account_repo.update_balance(account_id, account.balance + delta, expected_version=account.version)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def dispose(self) -> None:
+        for shard_engine in self.engines:
+            shard_engine.dispose()
+        self.transfer_log.dispose()
+
+
+def balance_deltas(transactions: list[Transaction]) -> dict[str, Decimal]:
+    """Zmiana salda per konto wynikająca z listy transakcji."""
+    deltas: dict[str, Decimal] = {}
+    for transaction in transactions:
+        if transaction.type == TransactionType.DEPOSIT:
+            delta = transaction.amount
+        elif transaction.type == TransactionType.WITHDRAW:
+            delta = -transaction.amount
+        else:
+            delta = Decimal("0")
+        deltas[transaction.account_id] = deltas.get(transaction.account_id, Decimal("0")) + delta
+    return deltas
+
+
+class ShardedSession:
+    """
+    Jednostka pracy nad wieloma shardami: sesja per shard otwierana leniwie.
+
+    COMMIT dotykający jednego shardu jest zwykłym lokalnym COMMIT-em. Gdy zapis
+    obejmuje kilka shardów: (1) wpis PREPARED z nogami w dzienniku koordynatora,
+    (2) COMMIT shardu obciążanego, (3) COMMIT pozostałych, (4) wpis COMMITTED.
+    Awarię między (2) a (4) naprawia ShardSet.recover(); uznania nie mogą się nie
+    udać z powodu salda, więc odtwarzanie zawsze dochodzi do końca.
+    """
+
+    def __init__(self, shard_set: ShardSet):
+        self.shard_set = shard_set
+        self._sessions: dict[int, Session] = {}
+        self._repositories: dict[int, tuple] = {}
+        self._written: set[int] = set()
+        self._legs: dict[int, list[Transaction]] = {}
+
+    def shard_for(self, account_id: str) -> int:
+        return self.shard_set.shard_for(account_id)
+
+    def session(self, shard: int) -> Session:
+        if shard not in self._sessions:
+            self._sessions[shard] = self.shard_set.session_factories[shard]()
+        return self._sessions[shard]
+
+    def repositories(self, shard: int) -> tuple:
+        if shard not in self._repositories:
+            self._repositories[shard] = self.shard_set.repositories(self.session(shard))
+        return self._repositories[shard]
+
+    def mark_written(self, shard: int, transactions: list[Transaction] | None = None) -> None:
+        """Odnotowuje zapis na shardzie (i dopisane transakcje, potrzebne do odtworzenia po awarii)."""
+        self._written.add(shard)
+        if transactions:
+            self._legs.setdefault(shard, []).extend(transactions)
+
+    def commit(self) -> None:
+        try:
+            if len(self._written) > 1:
+                self._commit_cross_shard()
+            else:
+                for session in self._sessions.values():
+                    session.commit()
+        finally:
+            self._written.clear()
+            self._legs.clear()
+
+    def _commit_cross_shard(self) -> None:
+        written = sorted(self._written)
+        debited = [
+            shard for shard in written
+            if any(transaction.type == TransactionType.WITHDRAW for transaction in self._legs.get(shard, ()))
+        ]
+        if len(debited) > 1 or any(not self._legs.get(shard) for shard in written):
+            self.rollback()
+            raise CrossShardCommitError(
+                "Cross-shard writes must append transactions on every shard and debit at most one of them"
+            )
+
+        transfer_log = self.shard_set.transfer_log
+        primary = debited[0] if debited else written[0]
+        log_id = transfer_log.prepare(primary, {shard: self._legs[shard] for shard in written})
+
+        try:
+            self._sessions[primary].commit()
+        except Exception:
+            self.rollback()
+            transfer_log.finish(log_id, ABORTED)
+            raise
+
+        failed = False
+        for shard, session in self._sessions.items():
+            if shard == primary:
+                continue
+            try:
+                session.commit()
+            except Exception:
+                session.rollback()
+                failed = failed or shard in self._written
+
+        if not failed:
+            transfer_log.finish(log_id, COMMITTED)
+            return
+
+        # shard główny już zatwierdzony: dokańczamy od razu z dziennika, a jeśli i to
+        # się nie uda, wpis zostaje PREPARED dla `recover-shards`
+        entry = transfer_log.get(log_id)
+        try:
+            if entry is not None:
+                self.shard_set.recover_entry(entry)
+        except Exception as e:
+            raise CrossShardCommitError(
+                f"Write committed on shard {primary} but not on the others; recovery log entry {log_id} is pending"
+            ) from e
+
+    def rollback(self) -> None:
+        for session in self._sessions.values():
+            session.rollback()
+        self._written.clear()
+        self._legs.clear()
+
+    def close(self) -> None:
+        for session in self._sessions.values():
+            session.close()
+        self._sessions.clear()
+        self._repositories.clear()
@@ -0,0 +1,158 @@
+import json
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sqlalchemy import create_engine, text
+
+from adapters.serialization import from_jsonable, to_jsonable
+from domain.entities.entities import Transaction
+
+
+PREPARED = "PREPARED"
+COMMITTED = "COMMITTED"
+ABORTED = "ABORTED"
+
+create_transfer_log_table_sql = """
+CREATE TABLE IF NOT EXISTS transfer_log (
+    log_id TEXT PRIMARY KEY NOT NULL,
+    status TEXT NOT NULL CHECK (status IN ('PREPARED','COMMITTED','ABORTED')),
+    primary_shard INTEGER NOT NULL,
+    legs TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+)
+"""
+
+# recovery czyta tylko niedokończone wpisy; zakończone zostają jako ślad audytowy
+create_transfer_log_pending_index_sql = """
+CREATE INDEX IF NOT EXISTS idx_transfer_log_prepared
+ON transfer_log (created_at) WHERE status = 'PREPARED'
+"""
+
+create_shard_meta_table_sql = """
+CREATE TABLE IF NOT EXISTS shard_meta (
+    key TEXT PRIMARY KEY NOT NULL,
+    value TEXT NOT NULL
+)
+"""
+
+PENDING_SQL = """
+    SELECT log_id, primary_shard, legs, created_at
+    FROM transfer_log
+    WHERE status = 'PREPARED' AND created_at < :cutoff
+    ORDER BY created_at
+"""
+
+
+@dataclass(frozen=True)
+class TransferLogEntry:
+    log_id: str
+    primary_shard: int
+    legs: dict[int, list[Transaction]]
+    created_at: datetime
+
+
+def ensure_transfer_log(dbapi_connection, shard_count: int) -> None:
+    """Zakłada tabele koordynatora i pilnuje, żeby katalog shardów nie był otwarty z inną liczbą shardów."""
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(create_transfer_log_table_sql)
+        cursor.execute(create_transfer_log_pending_index_sql)
+        cursor.execute(create_shard_meta_table_sql)
+        cursor.execute(
+            "INSERT OR IGNORE INTO shard_meta (key, value) VALUES ('shard_count', ?)", (str(shard_count),)
+        )
+        cursor.execute("SELECT value FROM shard_meta WHERE key = 'shard_count'")
+        stored = int(cursor.fetchone()[0])
+    finally:
+        cursor.close()
+    if stored != shard_count:
+        raise ValueError(f"Shard directory was created with BANK_SHARD_COUNT={stored}, not {shard_count}")
+
+
+class TransferLog:
+    """
+    Dziennik zapisów obejmujących kilka shardów, w osobnej bazie koordynatora.
+
+    Wpis PREPARED (z pełną treścią nóg per shard) jest trwały, zanim którykolwiek
+    shard zrobi COMMIT; dzięki temu recovery może dokończyć albo porzucić zapis po awarii.
+    """
+
+    def __init__(self, path: Path, shard_count: int):
+        from db import install_sqlite_hooks
+
+        self._engine = create_engine(f"sqlite:///{path}", echo=False, future=True)
+        # decyzja koordynatora musi przeżyć awarię zasilania niezależnie od BANK_SQLITE_PROFILE
+        install_sqlite_hooks(
+            self._engine,
+            profile="durable",
+            schema=lambda dbapi_connection: ensure_transfer_log(dbapi_connection, shard_count),
+        )
+
+    def prepare(self, primary_shard: int, legs: dict[int, list[Transaction]]) -> str:
+        """Zapisuje (COMMIT) wpis PREPARED i zwraca jego log_id."""
+        log_id = str(uuid.uuid4())
+        now = datetime.now(timezone.utc).isoformat()
+        payload = json.dumps({str(shard): to_jsonable(transactions) for shard, transactions in legs.items()})
+        with self._engine.begin() as conn:
+            conn.execute(
+                text("""
+                    INSERT INTO transfer_log (log_id, status, primary_shard, legs, created_at, updated_at)
+                    VALUES (:log_id, :status, :primary_shard, :legs, :created_at, :updated_at)
+                """),
+                {
+                    "log_id": log_id,
+                    "status": PREPARED,
+                    "primary_shard": primary_shard,
+                    "legs": payload,
+                    "created_at": now,
+                    "updated_at": now,
+                },
+            )
+        return log_id
+
+    def finish(self, log_id: str, status: str) -> bool:
+        """Zamyka wpis PREPARED (COMMITTED/ABORTED); False, gdy ktoś zamknął go wcześniej."""
+        with self._engine.begin() as conn:
+            result = conn.execute(
+                text("""
+                    UPDATE transfer_log SET status = :status, updated_at = :updated_at
+                    WHERE log_id = :log_id AND status = 'PREPARED'
+                """),
+                {"log_id": log_id, "status": status, "updated_at": datetime.now(timezone.utc).isoformat()},
+            )
+        return result.rowcount == 1
+
+    def get(self, log_id: str) -> TransferLogEntry | None:
+        """Zwraca niedokończony wpis po ID lub None."""
+        with self._engine.connect() as conn:
+            row = conn.execute(
+                text("SELECT log_id, primary_shard, legs, created_at FROM transfer_log "
+                     "WHERE log_id = :log_id AND status = 'PREPARED'"),
+                {"log_id": log_id},
+            ).fetchone()
+        return _row_to_entry(row) if row is not None else None
+
+    def pending(self, older_than: datetime) -> list[TransferLogEntry]:
+        """Wpisy PREPARED starsze niż `older_than` (młodsze mogą jeszcze kończyć się w innym procesie)."""
+        with self._engine.connect() as conn:
+            rows = conn.execute(text(PENDING_SQL), {"cutoff": older_than.isoformat()}).all()
+        return [_row_to_entry(row) for row in rows]
+
+    def dispose(self) -> None:
+        self._engine.dispose()
+
+
+def _row_to_entry(row) -> TransferLogEntry:
+    legs = {
+        int(shard): [from_jsonable(Transaction, item) for item in items]
+        for shard, items in json.loads(row[2]).items()
+    }
+    return TransferLogEntry(
+        log_id=row[0],
+        primary_shard=row[1],
+        legs=legs,
+        created_at=datetime.fromisoformat(row[3]),
+    )
@@ -0,0 +1,20 @@
+from decimal import Decimal
+
+from application.errors import InvalidRequestError
+
+# jak MINOR_UNIT_EXPONENT w adapters/repositories/money.py: kwoty zapisywane są w groszach/centach
+AMOUNT_DECIMAL_PLACES = 2
+# saldo w groszach musi się zmieścić w INTEGER SQLite (int64), z zapasem na sumy wielu wpłat
+MAX_AMOUNT = Decimal(10) ** 15
+
+
+def validate_amount(amount: Decimal, label: str = "Amount") -> None:
+    """Rzuca InvalidRequestError dla kwoty wejściowej poza zakresem albo z ułamkiem groszy."""
+    # copy_abs() nie przechodzi przez kontekst decimal, więc 1E+999999999 nie rzuca Overflow
+    if amount.copy_abs() >= MAX_AMOUNT:
+        raise InvalidRequestError(f"{label} {amount} must be less than {MAX_AMOUNT:,}")
+    # cyfry poniżej grosza wprost z krotki: scaleb() przy 1E-999999999 zaokrągliłby do zera
+    _, digits, exponent = amount.as_tuple()
+    below_minor = -exponent - AMOUNT_DECIMAL_PLACES
+    if below_minor > 0 and any(digits[-below_minor:]):
+        raise InvalidRequestError(f"{label} {amount} has more than {AMOUNT_DECIMAL_PLACES} decimal places")
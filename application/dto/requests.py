@@ -1,40 +1,41 @@
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
+from domain.types.account_status import AccountStatus
 from domain.types.currency import CurrencyType
 from domain.types.transaction import TransactionType
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CreateAccountCommand:
     """Żądanie utworzenia konta."""
     owner_name: str
     currency: CurrencyType
     initial_deposit: Decimal = field(default=Decimal("0"))
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DepositCommand:
     account_id: str
     amount: Decimal = field(default=Decimal("0"))
     note: str | None = None
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class WithdrawCommand:
     account_id: str
     amount: Decimal = field(default=Decimal("0"))
     note: str | None = None
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TransferCommand:
     from_account_id: str
     to_account_id: str
     amount: Decimal = field(default=Decimal("0"))
     note: str | None = None
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class GetBalanceCommand:
     account_id: str
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ListTransactionsCommand:
     account_id: str
     date_from: datetime | None = None
@@ -42,3 +43,30 @@ class ListTransactionsCommand:
     limit: int = field(default=100)
     cursor: str | None = None
     type_filter: set[TransactionType] | None = None
+
+@dataclass(frozen=True, slots=True)
+class ExportTransactionsCommand:
+    """Żądanie wyciągu: cała historia konta (w zakresie dat), od najstarszych."""
+    account_id: str
+    date_from: datetime | None = None
+    date_to: datetime | None = None
+    type_filter: set[TransactionType] | None = None
+    batch_size: int = field(default=1000)
+
+@dataclass(frozen=True, slots=True)
+class GetAccountSummaryCommand:
+    """Podsumowanie konta za pełne dni UTC [date_from, date_to) z dziennych sum."""
+    account_id: str
+    date_from: date | None = None
+    date_to: date | None = None
+
+@dataclass(frozen=True, slots=True)
+class ListAccountsCommand:
+    """Strona listy kont (najnowsze najpierw); created_from włącznie, created_to wyłącznie."""
+    status: AccountStatus | None = None
+    currency: CurrencyType | None = None
+    owner_prefix: str | None = None
+    created_from: datetime | None = None
+    created_to: datetime | None = None
+    limit: int = field(default=100)
+    cursor: str | None = None
@@ -1,11 +1,11 @@
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 from domain.types.account_status import AccountStatus
 from domain.types.currency import CurrencyType
 from domain.types.transaction import TransactionType
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CreateAccountResult:
     account_id: str
     owner_name: str
@@ -14,21 +14,21 @@ class CreateAccountResult:
     created_at: datetime
     initial_balance: Decimal = field(default=Decimal("0"))
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DepositResult:
     account_id: str
     transaction_id: str
     new_balance: Decimal
     occurred_at: datetime
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class WithdrawResult:
     account_id: str
     transaction_id: str
     new_balance: Decimal
     occurred_at: datetime
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TransferResult:
     transfer_id: str
     from_account_id: str
@@ -39,13 +39,13 @@ class TransferResult:
     from_new_balance: Decimal
     to_new_balance: Decimal
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class GetBalanceResult:
     account_id: str
     balance: Decimal
     as_of: datetime
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TransactionItem:
     transaction_id: str
     type: TransactionType
@@ -54,9 +54,44 @@ class TransactionItem:
     related_account_id: str | None = None
     note: str | None = None
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ListTransactionsResult:
     account_id: str
     items: list[TransactionItem]
     next_cursor: str | None = None
     total_count: int | None = None
+
+@dataclass(frozen=True, slots=True)
+class DailyTotalsItem:
+    day: date
+    currency: CurrencyType
+    inflow: Decimal
+    outflow: Decimal
+    net: Decimal
+    count: int
+
+@dataclass(frozen=True, slots=True)
+class AccountSummaryResult:
+    account_id: str
+    currency: CurrencyType
+    date_from: date | None
+    date_to: date | None
+    inflow: Decimal
+    outflow: Decimal
+    net: Decimal
+    count: int
+    days: list[DailyTotalsItem] = field(default_factory=list)
+
+@dataclass(frozen=True, slots=True)
+class AccountItem:
+    account_id: str
+    owner_name: str
+    currency: CurrencyType
+    balance: Decimal
+    status: AccountStatus
+    created_at: datetime
+
+@dataclass(frozen=True, slots=True)
+class ListAccountsResult:
+    items: list[AccountItem]
+    next_cursor: str | None = None
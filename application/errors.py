@@ -53,6 +53,11 @@ class SameAccountTransferNotAllowedError(DomainError):
     pass
 
 
+class DailyTotalsUnavailableError(ApplicationError):
+    """Raised when daily totals of an account are not backfilled yet (run migrate-daily-totals)."""
+    pass
+
+
 # --- Validation / input ---
 class InvalidRequestError(DomainError):
     """Raised when a use-case or domain rule receives invalid input."""
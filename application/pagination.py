@@ -0,0 +1,22 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from application.errors import InvalidRequestError
+
+
+def encode_cursor(created_at: datetime, key: str) -> str:
+    """Koduje pozycję keyset (created_at, id) jako nieprzezroczysty token."""
+    payload = json.dumps([created_at.isoformat(), key], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """Odtwarza pozycję keyset z tokenu; rzuca InvalidRequestError dla złego kursora."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, key = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(created_at), str(key)
+    except (binascii.Error, UnicodeError, ValueError, TypeError):
+        raise InvalidRequestError("Invalid cursor")
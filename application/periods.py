@@ -0,0 +1,28 @@
+from datetime import date, datetime, timezone
+
+from application.errors import InvalidRequestError
+
+
+def as_utc(value: datetime) -> datetime:
+    """Sprowadza datetime do UTC; naiwny traktujemy jako UTC (jak _to_db_timestamp w repozytoriach)."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def as_utc_day(value: date) -> date:
+    """Dzień UTC dla date albo datetime (datetime to podklasa date, ale nie da się ich porównać)."""
+    if isinstance(value, datetime):
+        return as_utc(value).date()
+    return value
+
+
+def validate_period(
+    start: datetime | None,
+    end: datetime | None,
+    start_name: str = "date_from",
+    end_name: str = "date_to",
+) -> None:
+    """Rzuca InvalidRequestError, gdy początek okresu jest po końcu (naiwne i świadome strefy porównywalne)."""
+    if start is not None and end is not None and as_utc(start) > as_utc(end):
+        raise InvalidRequestError(f"{start_name} must not be after {end_name}")
@@ -0,0 +1,46 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, TypeVar
+
+from domain.errors import AccountVersionConflict, BatchWriteError
+
+T = TypeVar("T")
+
+
+def is_version_conflict(error: Exception) -> bool:
+    """Czy błąd oznacza przegrany wyścig o wersję konta (także wewnątrz BatchWriteError)."""
+    if isinstance(error, AccountVersionConflict):
+        return True
+    if isinstance(error, BatchWriteError):
+        return any(isinstance(failure, AccountVersionConflict) for failure in error.failures.values())
+    return False
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Ograniczone ponawianie operacji po konflikcie wersji, z wykładniczym backoffem."""
+    max_attempts: int = 3
+    backoff_seconds: float = 0.005
+
+    def run(self, operation: Callable[[], T]) -> T:
+        attempt = 1
+        while True:
+            try:
+                return operation()
+            except (AccountVersionConflict, BatchWriteError) as e:
+                if not is_version_conflict(e) or attempt >= self.max_attempts:
+                    raise
+            time.sleep(self.backoff_seconds * 2 ** (attempt - 1))
+            attempt += 1
+
+    async def run_async(self, operation: Callable[[], Awaitable[T]]) -> T:
+        attempt = 1
+        while True:
+            try:
+                return await operation()
+            except (AccountVersionConflict, BatchWriteError) as e:
+                if not is_version_conflict(e) or attempt >= self.max_attempts:
+                    raise
+            await asyncio.sleep(self.backoff_seconds * 2 ** (attempt - 1))
+            attempt += 1
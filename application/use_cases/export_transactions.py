@@ -0,0 +1,37 @@
+from collections.abc import Iterator
+
+from application.dto.requests import ExportTransactionsCommand
+from application.dto.responses import TransactionItem
+from application.errors import AccountNotFoundError, InvalidRequestError
+from application.periods import validate_period
+from application.use_cases.list_transactions import to_transaction_item
+
+
+class ExportTransactionsUseCase:
+    def __init__(self, account_repo, transaction_repo):
+        self.account_repo = account_repo
+        self.transaction_repo = transaction_repo
+
+    def execute(self, cmd: ExportTransactionsCommand) -> Iterator[TransactionItem]:
+        """
+        Sprawdza żądanie od razu i zwraca generator pozycji wyciągu (od najstarszych).
+
+        Wiersze są czytane z bazy dopiero przy iteracji, porcjami po cmd.batch_size,
+        więc sesja musi być otwarta, dopóki wynik nie zostanie skonsumowany.
+        """
+        account = self.account_repo.get_by_id(cmd.account_id)
+        if account is None:
+            raise AccountNotFoundError("Account not found")
+
+        if cmd.batch_size <= 0:
+            raise InvalidRequestError("Batch size must be positive")
+        validate_period(cmd.date_from, cmd.date_to)
+
+        transactions = self.transaction_repo.iter_for_account(
+            account_id=cmd.account_id,
+            date_from=cmd.date_from,
+            date_to=cmd.date_to,
+            types=cmd.type_filter,
+            batch_size=cmd.batch_size,
+        )
+        return (to_transaction_item(tx) for tx in transactions)
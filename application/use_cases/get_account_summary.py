@@ -0,0 +1,56 @@
+from decimal import Decimal
+
+from application.dto.requests import GetAccountSummaryCommand
+from application.dto.responses import AccountSummaryResult, DailyTotalsItem
+from application.errors import AccountNotFoundError, DailyTotalsUnavailableError, InvalidRequestError
+from application.periods import as_utc_day
+
+
+class GetAccountSummaryUseCase:
+    """Wpływy, wypływy i liczba transakcji konta za okres z dziennych sum (bez skanowania historii)."""
+
+    def __init__(self, account_repo, transaction_repo):
+        self.account_repo = account_repo
+        self.transaction_repo = transaction_repo
+
+    def execute(self, cmd: GetAccountSummaryCommand) -> AccountSummaryResult:
+        account = self.account_repo.get_by_id(cmd.account_id)
+        if account is None:
+            raise AccountNotFoundError("Account not found")
+
+        date_from = as_utc_day(cmd.date_from) if cmd.date_from is not None else None
+        date_to = as_utc_day(cmd.date_to) if cmd.date_to is not None else None
+        if date_from is not None and date_to is not None and date_from > date_to:
+            raise InvalidRequestError("date_from must not be after date_to")
+
+        totals = self.transaction_repo.daily_totals(cmd.account_id, date_from, date_to)
+        if totals is None:
+            raise DailyTotalsUnavailableError(
+                "Daily totals for this account are not backfilled yet (run migrate-daily-totals)"
+            )
+
+        days = [
+            DailyTotalsItem(
+                day=entry.day,
+                currency=entry.currency,
+                inflow=entry.inflow,
+                outflow=entry.outflow,
+                net=entry.inflow - entry.outflow,
+                count=entry.count,
+            )
+            for entry in totals
+        ]
+        inflow = sum((item.inflow for item in days), Decimal("0.00"))
+        outflow = sum((item.outflow for item in days), Decimal("0.00"))
+
+        return AccountSummaryResult(
+            account_id=cmd.account_id,
+            currency=account.currency,
+            date_from=date_from,
+            date_to=date_to,
+            inflow=inflow,
+            outflow=outflow,
+            net=inflow - outflow,
+            count=sum(item.count for item in days),
+            days=days,
+        )
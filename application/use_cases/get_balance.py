@@ -23,3 +23,24 @@ class GetBalanceUseCase:
             balance=balance,
             as_of=as_of,
         )
+
+
+class AsyncGetBalanceUseCase:
+    def __init__(self, account_repo, transaction_repo, clock):
+        self.account_repo = account_repo
+        self.transaction_repo = transaction_repo
+        self.clock = clock
+
+    async def execute(self, cmd: GetBalanceCommand) -> GetBalanceResult:
+        account = await self.account_repo.get_by_id(cmd.account_id)
+        if account is None:
+            raise AccountNotFoundError("Account not found")
+
+        as_of = self.clock.now()
+        balance = await self.transaction_repo.get_balance(cmd.account_id)
+
+        return GetBalanceResult(
+            account_id=cmd.account_id,
+            balance=balance,
+            as_of=as_of,
+        )
@@ -0,0 +1,82 @@
+from application.dto.requests import ListAccountsCommand
+from application.dto.responses import AccountItem, ListAccountsResult
+from application.errors import InvalidRequestError
+from application.pagination import encode_cursor, decode_cursor
+from application.periods import validate_period
+
+
+class ListAccountsUseCase:
+    def __init__(self, account_repo):
+        self.account_repo = account_repo
+
+    def execute(self, cmd: ListAccountsCommand) -> ListAccountsResult:
+        after = _validate(cmd)
+
+        # Pobieramy o jeden rekord więcej, żeby wiedzieć, czy istnieje następna strona.
+        accounts = self.account_repo.list_page(
+            limit=cmd.limit + 1,
+            status=cmd.status,
+            currency=cmd.currency,
+            owner_prefix=cmd.owner_prefix,
+            created_from=cmd.created_from,
+            created_to=cmd.created_to,
+            after=after,
+        )
+
+        return _build_page(cmd, accounts)
+
+
+class AsyncListAccountsUseCase:
+    def __init__(self, account_repo):
+        self.account_repo = account_repo
+
+    async def execute(self, cmd: ListAccountsCommand) -> ListAccountsResult:
+        after = _validate(cmd)
+
+        accounts = await self.account_repo.list_page(
+            limit=cmd.limit + 1,
+            status=cmd.status,
+            currency=cmd.currency,
+            owner_prefix=cmd.owner_prefix,
+            created_from=cmd.created_from,
+            created_to=cmd.created_to,
+            after=after,
+        )
+
+        return _build_page(cmd, accounts)
+
+
+def _validate(cmd: ListAccountsCommand):
+    """Sprawdza parametry listowania i zwraca zdekodowaną pozycję kursora (albo None)."""
+    if cmd.limit <= 0:
+        raise InvalidRequestError("Limit must be positive")
+
+    validate_period(cmd.created_from, cmd.created_to, "created_from", "created_to")
+
+    return decode_cursor(cmd.cursor) if cmd.cursor else None
+
+
+def _build_page(cmd: ListAccountsCommand, accounts) -> ListAccountsResult:
+    """Przycina wynik (limit + 1) do strony i wylicza kursor następnej strony."""
+    next_cursor = None
+    if len(accounts) > cmd.limit:
+        accounts = accounts[:cmd.limit]
+        last = accounts[-1]
+        next_cursor = encode_cursor(last.created_at, last.account_id)
+
+    return ListAccountsResult(
+        items=[to_account_item(account) for account in accounts],
+        next_cursor=next_cursor,
+    )
+
+
+def to_account_item(account) -> AccountItem:
+    """Account (domena) -> AccountItem (DTO odpowiedzi)."""
+    return AccountItem(
+        account_id=account.account_id,
+        owner_name=account.owner_name,
+        currency=account.currency,
+        balance=account.balance,
+        status=account.status,
+        created_at=account.created_at,
+    )
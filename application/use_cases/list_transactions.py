@@ -1,6 +1,8 @@
 from application.dto.requests import ListTransactionsCommand
 from application.dto.responses import ListTransactionsResult, TransactionItem
 from application.errors import AccountNotFoundError, InvalidRequestError
+from application.pagination import encode_cursor, decode_cursor
+from application.periods import validate_period
 
 
 class ListTransactionsUseCase:
@@ -13,31 +15,91 @@ class ListTransactionsUseCase:
         if account is None:
             raise AccountNotFoundError("Account not found")
 
-        if cmd.limit <= 0:
-            raise InvalidRequestError("Limit must be positive")
+        after = _validate(cmd)
 
-        # Na tym etapie wspieramy tylko account_id + limit.
-        # date_from, date_to, type_filter, cursor ignorujemy (są pod przyszłą rozbudowę).
+        # Pobieramy o jeden rekord więcej, żeby wiedzieć, czy istnieje następna strona.
         transactions = self.transaction_repo.list_for_account(
             account_id=cmd.account_id,
-            limit=cmd.limit,
+            limit=cmd.limit + 1,
+            date_from=cmd.date_from,
+            date_to=cmd.date_to,
+            types=cmd.type_filter,
+            after=after,
         )
+        total_count = None
+        if not cmd.type_filter:
+            total_count = self.transaction_repo.count_for_account(cmd.account_id, cmd.date_from, cmd.date_to)
 
-        items = [
-            TransactionItem(
-                transaction_id=tx.tx_id,
-                type=tx.type,
-                amount=tx.amount,
-                occurred_at=tx.occurred_at,
-                related_account_id=tx.related_account_id,
-                note=tx.note,
-            )
-            for tx in transactions
-        ]
-
-        return ListTransactionsResult(
+        return _build_page(cmd, transactions, total_count)
+
+
+class AsyncListTransactionsUseCase:
+    def __init__(self, account_repo, transaction_repo):
+        self.account_repo = account_repo
+        self.transaction_repo = transaction_repo
+
+    async def execute(self, cmd: ListTransactionsCommand) -> ListTransactionsResult:
+        account = await self.account_repo.get_by_id(cmd.account_id)
+        if account is None:
+            raise AccountNotFoundError("Account not found")
+
+        after = _validate(cmd)
+
+        transactions = await self.transaction_repo.list_for_account(
             account_id=cmd.account_id,
-            items=items,
-            next_cursor=None,
-            total_count=None,
+            limit=cmd.limit + 1,
+            date_from=cmd.date_from,
+            date_to=cmd.date_to,
+            types=cmd.type_filter,
+            after=after,
         )
+        total_count = None
+        if not cmd.type_filter:
+            total_count = await self.transaction_repo.count_for_account(cmd.account_id, cmd.date_from, cmd.date_to)
+
+        return _build_page(cmd, transactions, total_count)
+
+
+def _validate(cmd: ListTransactionsCommand):
+    """Sprawdza parametry listowania i zwraca zdekodowaną pozycję kursora (albo None)."""
+    if cmd.limit <= 0:
+        raise InvalidRequestError("Limit must be positive")
+
+    validate_period(cmd.date_from, cmd.date_to)
+
+    return decode_cursor(cmd.cursor) if cmd.cursor else None
+
+
+def _build_page(cmd: ListTransactionsCommand, transactions, total_count: int | None = None) -> ListTransactionsResult:
+    """
+    Przycina wynik (limit + 1) do strony i wylicza kursor następnej strony.
+
+    total_count (wszystkie strony, z dziennych sum) jest None przy filtrze typu albo
+    gdy sumy konta nie są jeszcze gotowe.
+    """
+    next_cursor = None
+    if len(transactions) > cmd.limit:
+        transactions = transactions[:cmd.limit]
+        last = transactions[-1]
+        next_cursor = encode_cursor(last.occurred_at, last.tx_id)
+
+    items = [to_transaction_item(tx) for tx in transactions]
+
+    return ListTransactionsResult(
+        account_id=cmd.account_id,
+        items=items,
+        next_cursor=next_cursor,
+        total_count=total_count,
+    )
+
+
+def to_transaction_item(tx) -> TransactionItem:
+    """Transaction (domena) -> TransactionItem (DTO odpowiedzi)."""
+    return TransactionItem(
+        transaction_id=tx.tx_id,
+        type=tx.type,
+        amount=tx.amount,
+        occurred_at=tx.occurred_at,
+        related_account_id=tx.related_account_id,
+        note=tx.note,
+    )
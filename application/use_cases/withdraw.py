@@ -1,28 +1,35 @@
 from decimal import Decimal
 from application.dto.requests import WithdrawCommand
 from application.dto.responses import WithdrawResult
+from application.amounts import validate_amount
 from application.errors import (
     InvalidRequestError,
     AccountNotFoundError,
     AccountInactiveError,
     InsufficientFundsError,
 )
+from application.retry import RetryPolicy
 from domain.entities.entities import Transaction
 from domain.types.transaction import TransactionType
 from domain.types.account_status import AccountStatus
 
 
 class WithdrawUseCase:
-    def __init__(self, account_repo, transaction_repo, clock, id_provider):
+    def __init__(self, account_repo, transaction_repo, clock, id_provider, retry_policy: RetryPolicy | None = None):
         self.account_repo = account_repo
         self.transaction_repo = transaction_repo
         self.clock = clock
         self.id_provider = id_provider
+        self.retry_policy = retry_policy or RetryPolicy()
 
     def execute(self, cmd: WithdrawCommand) -> WithdrawResult:
         if cmd.amount <= Decimal("0"):
             raise InvalidRequestError("Withdraw amount must be positive")
+        validate_amount(cmd.amount)
 
+        return self.retry_policy.run(lambda: self._execute_once(cmd))
+
+    def _execute_once(self, cmd: WithdrawCommand) -> WithdrawResult:
         account = self.account_repo.get_by_id(cmd.account_id)
         if account is None:
             raise AccountNotFoundError("Account not found")
@@ -34,6 +41,10 @@ class WithdrawUseCase:
         if current_balance < cmd.amount:
             raise InsufficientFundsError("Insufficient funds")
 
+        # Najpierw compare-and-swap salda: przy konflikcie wersji nic jeszcze nie zapisaliśmy.
+        new_balance = account.balance - cmd.amount
+        self.account_repo.update_balance(account.account_id, new_balance, expected_version=account.version)
+
         now = self.clock.now()
         tx_id = self.id_provider.generate_id()
 
@@ -48,8 +59,6 @@ class WithdrawUseCase:
             note=cmd.note,
         )
         self.transaction_repo.append(txn)
-        new_balance = account.balance - cmd.amount
-        self.account_repo.update_balance(account.account_id, new_balance)
 
         #new_balance = self.transaction_repo.get_balance(cmd.account_id)
 
@@ -59,3 +68,56 @@ class WithdrawUseCase:
             new_balance=new_balance,
             occurred_at=now,
         )
+
+
+class AsyncWithdrawUseCase:
+    def __init__(self, account_repo, transaction_repo, clock, id_provider, retry_policy: RetryPolicy | None = None):
+        self.account_repo = account_repo
+        self.transaction_repo = transaction_repo
+        self.clock = clock
+        self.id_provider = id_provider
+        self.retry_policy = retry_policy or RetryPolicy()
+
+    async def execute(self, cmd: WithdrawCommand) -> WithdrawResult:
+        if cmd.amount <= Decimal("0"):
+            raise InvalidRequestError("Withdraw amount must be positive")
+        validate_amount(cmd.amount)
+
+        return await self.retry_policy.run_async(lambda: self._execute_once(cmd))
+
+    async def _execute_once(self, cmd: WithdrawCommand) -> WithdrawResult:
+        account = await self.account_repo.get_by_id(cmd.account_id)
+        if account is None:
+            raise AccountNotFoundError("Account not found")
+
+        if account.status != AccountStatus.ACTIVE:
+            raise AccountInactiveError("Cannot withdraw from inactive account")
+
+        current_balance = await self.transaction_repo.get_balance(cmd.account_id)
+        if current_balance < cmd.amount:
+            raise InsufficientFundsError("Insufficient funds")
+
+        new_balance = account.balance - cmd.amount
+        await self.account_repo.update_balance(account.account_id, new_balance, expected_version=account.version)
+
+        now = self.clock.now()
+        tx_id = self.id_provider.generate_id()
+
+        txn = Transaction(
+            tx_id=tx_id,
+            type=TransactionType.WITHDRAW,
+            account_id=cmd.account_id,
+            amount=cmd.amount,
+            currency=account.currency,
+            occurred_at=now,
+            related_account_id=None,
+            note=cmd.note,
+        )
+        await self.transaction_repo.append(txn)
+
+        return WithdrawResult(
+            account_id=cmd.account_id,
+            transaction_id=tx_id,
+            new_balance=new_balance,
+            occurred_at=now,
+        )
@@ -0,0 +1,21 @@
+from urllib.parse import quote
+
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from config.config import ARCHIVE_PATH, SQLITE_PATH
+from db import engine, install_read_only_hooks, install_sqlite_hooks  # hooki migrują schemat przy pierwszym połączeniu
+
+# aiosqlite trzyma wątek na połączenie z puli: przy zamykaniu procesu trzeba wywołać
+# `await async_engine.dispose()` i `await async_read_engine.dispose()`, inaczej interpreter nie wyjdzie.
+async_engine = create_async_engine(f"sqlite+aiosqlite:///{SQLITE_PATH}", echo=False)
+install_sqlite_hooks(async_engine.sync_engine, archive_path=ARCHIVE_PATH)
+
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+# Odczyty (saldo, historia, lista kont) jak read_engine w db.py: mode=ro, query_only i odroczony
+# BEGIN, więc nie biorą locka zapisu, który silnik zapisu zakłada od BEGIN IMMEDIATE.
+async_read_engine = create_async_engine(
+    f"sqlite+aiosqlite:///file:{quote(str(SQLITE_PATH.resolve()))}?mode=ro&uri=true", echo=False
+)
+install_read_only_hooks(async_read_engine.sync_engine, engine, archive_path=ARCHIVE_PATH)
+
+AsyncReadSessionLocal = async_sessionmaker(bind=async_read_engine, autoflush=False, expire_on_commit=False)
@@ -0,0 +1,173 @@
+"""
+Account listing: keyset pages with filters (indexes from schema v8) vs the same pages without them vs list_all.
+
+Świeża baza z --accounts kontami (jeden INSERT ... SELECT z rekurencyjnym CTE, losowe
+status/waluta/właściciel/czas utworzenia). "keyset" to ListAccountsUseCase przechodzący
+--pages stron po --limit kont dla kilku zestawów filtrów (czas wszystkich stron), "no index"
+to to samo po DROP indeksów idx_accounts_* (stan sprzed migracji 8), "list_all" to
+dotychczasowa droga: list_all() i filtrowanie encji w Pythonie. Szczytowe RSS mierzone w osobnym procesie na wariant.
+
+Uruchamianie (z katalogu głównego projektu):
+    python -m benchmarks.account_listing --accounts 1000000
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timezone
+
+SEED_SQL = """
+    WITH RECURSIVE
+        n(i) AS (SELECT 0 UNION ALL SELECT i + 1 FROM n WHERE i + 1 < :accounts),
+        r AS MATERIALIZED (
+            SELECT
+                i,
+                :start + abs(random()) % :span AS us,
+                abs(random()) % 100 AS status,
+                abs(random()) % 26 AS letter
+            FROM n
+        )
+    INSERT INTO accounts (
+        account_id, owner_name, currency, balance, balance_minor,
+        created_at, created_at_us, updated_at, updated_at_us, status, version
+    )
+    SELECT
+        printf('00000000-0000-4000-8000-%012d', i),
+        char(65 + letter) || printf('owner%07d', i),
+        CASE i % 2 WHEN 0 THEN 'PLN' ELSE 'EUR' END,
+        0,
+        0,
+        strftime('%Y-%m-%dT%H:%M:%S', us / 1000000, 'unixepoch') || printf('.%06d+00:00', us % 1000000),
+        us,
+        strftime('%Y-%m-%dT%H:%M:%S', us / 1000000, 'unixepoch') || printf('.%06d+00:00', us % 1000000),
+        us,
+        CASE WHEN status < 90 THEN 'ACTIVE' WHEN status < 97 THEN 'BLOCKED' ELSE 'CLOSED' END,
+        0
+    FROM r
+"""
+
+# (opis, filtry ListAccountsCommand)
+QUERIES = [
+    ("all", {}),
+    ("status=BLOCKED", {"status": "BLOCKED"}),
+    ("currency=EUR", {"currency": "EUR"}),
+    ("owner prefix Q", {"owner_prefix": "Q"}),
+    ("created in 2023", {
+        "created_from": datetime(2023, 1, 1, tzinfo=timezone.utc),
+        "created_to": datetime(2024, 1, 1, tzinfo=timezone.utc),
+    }),
+]
+
+
+def _seed(db_path: str, accounts: int) -> float:
+    from db import ensure_schema
+
+    started = time.perf_counter()
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=OFF")
+    ensure_schema(conn)
+    start = int(datetime(2021, 1, 1, tzinfo=timezone.utc).timestamp()) * 10**6
+    conn.execute("BEGIN")
+    conn.execute(SEED_SQL, {"accounts": accounts, "start": start, "span": 3 * 365 * 86400 * 10**6})
+    conn.execute("COMMIT")
+    conn.execute("ANALYZE")
+    conn.close()
+    return time.perf_counter() - started
+
+
+def _run(db_path: str, variant: str, pages: int, limit: int) -> list[tuple[str, float, int]]:
+    os.environ["BANK_SQLITE_PATH"] = db_path
+    os.environ["BANK_ACCOUNT_CACHE_SIZE"] = "0"
+
+    from db import ReadSessionLocal
+    from adapters.services import Services
+    from application.dto.requests import ListAccountsCommand
+    from domain.types.account_status import AccountStatus
+    from domain.types.currency import CurrencyType
+
+    results = []
+    session = ReadSessionLocal()
+    try:
+        services = Services(session, read_session=session)
+        for name, filters in QUERIES:
+            filters = dict(filters)
+            if "status" in filters:
+                filters["status"] = AccountStatus(filters["status"])
+            if "currency" in filters:
+                filters["currency"] = CurrencyType(filters["currency"])
+
+            started = time.perf_counter()
+            if variant == "list_all":
+                rows = sum(1 for _ in _filtered(services.list_accounts.account_repo.list_all(), filters))
+                rows = min(rows, pages * limit)
+            else:
+                rows = 0
+                cursor = None
+                for _ in range(pages):
+                    page = services.list_accounts.execute(ListAccountsCommand(limit=limit, cursor=cursor, **filters))
+                    rows += len(page.items)
+                    cursor = page.next_cursor
+                    if cursor is None:
+                        break
+            results.append((name, time.perf_counter() - started, rows))
+    finally:
+        session.close()
+    results.append(("peak MB", resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 0))
+    return results
+
+
+def _filtered(accounts, filters: dict):
+    for account in accounts:
+        if "status" in filters and account.status != filters["status"]:
+            continue
+        if "currency" in filters and account.currency != filters["currency"]:
+            continue
+        if "owner_prefix" in filters and not account.owner_name.startswith(filters["owner_prefix"]):
+            continue
+        if "created_from" in filters and not filters["created_from"] <= account.created_at < filters["created_to"]:
+            continue
+        yield account
+
+
+def _drop_indexes(db_path: str) -> None:
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    for (name,) in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_accounts_%'"
+    ).fetchall():
+        conn.execute(f"DROP INDEX {name}")
+    conn.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Keyset account listing vs unindexed listing vs list_all")
+    parser.add_argument("--accounts", type=int, default=1_000_000)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    ctx = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bank.db")
+        with ctx.Pool(1) as pool:
+            seeded = pool.apply(_seed, (db_path, args.accounts))
+        print(f"seeded {args.accounts} accounts in {seeded:.1f}s; {args.pages} pages x {args.limit} per query")
+        print(f"{'variant':<10}{'query':<18}{'ms':>10}{'rows':>8}")
+        for variant in ("keyset", "list_all", "no index"):
+            if variant == "no index":
+                # ostatni wariant: indeksy nie wracają, ensure_schema uznaje migrację 8 za wykonaną
+                _drop_indexes(db_path)
+            with ctx.Pool(1) as pool:
+                results = pool.apply(_run, (db_path, variant, args.pages, args.limit))
+            for name, elapsed, rows in results:
+                if name == "peak MB":
+                    print(f"{variant:<10}{'peak RSS (MB)':<18}{elapsed:>10.1f}")
+                    continue
+                print(f"{variant:<10}{name:<18}{elapsed * 1000:>10.1f}{rows:>8}")
+
+
+if __name__ == "__main__":
+    main()
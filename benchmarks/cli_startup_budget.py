@@ -0,0 +1,60 @@
+"""
+Import-time budget for the CLI: `python -m adapters.cli.main --help` must not pull in heavy modules.
+
+Sprawdza (w świeżym procesie, przez `-X importtime`), że import CLI nie ładuje
+SQLAlchemy ani Rich i mieści się w budżecie czasu. Kod wyjścia 1 = budżet przekroczony.
+
+Uruchamianie (z katalogu głównego projektu):
+    python -m benchmarks.cli_startup_budget --budget-ms 150
+"""
+import argparse
+import re
+import subprocess
+import sys
+
+FORBIDDEN_MODULES = ("sqlalchemy", "rich.console", "db", "adapters.services")
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s+)(\S+)$")
+
+
+def measure_imports(module: str) -> dict[str, int]:
+    """Zwraca {moduł: skumulowany czas importu w µs} dla modułów zaimportowanych przez `module`."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings = {}
+    for line in completed.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            timings[match.group(4)] = int(match.group(2))
+    return timings
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", default="adapters.cli.main")
+    parser.add_argument("--budget-ms", type=float, default=150.0, help="Max cumulative import time of the CLI module")
+    parser.add_argument("--top", type=int, default=10, help="How many of the slowest imports to print")
+    args = parser.parse_args(argv)
+
+    timings = measure_imports(args.module)
+    total_ms = timings.get(args.module, 0) / 1000
+
+    print(f"{args.module}: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    for name, micros in sorted(timings.items(), key=lambda item: item[1], reverse=True)[1:args.top + 1]:
+        print(f"  {micros / 1000:8.1f} ms  {name}")
+
+    failures = [f"imports {name} at startup" for name in FORBIDDEN_MODULES if name in timings]
+    if total_ms > args.budget_ms:
+        failures.append(f"{total_ms:.1f} ms exceeds the {args.budget_ms:.0f} ms budget")
+
+    for failure in failures:
+        print(f"FAIL: {args.module} {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
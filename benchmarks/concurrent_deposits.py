@@ -0,0 +1,87 @@
+"""
+Concurrent deposits: --processes processes x --deposits deposits on one account, exit code 1 on any lost write.
+
+Świeża baza z jednym kontem; każdy proces robi po --deposits wpłat 1.00 (COMMIT po każdej)
+przez DepositUseCase, jak komenda `deposit` CLI. Sprawdza, że żadna wpłata nie została
+odrzucona (ani AccountVersionConflict po wyczerpaniu prób, ani "database is locked"),
+a saldo i liczba transakcji zgadzają się z liczbą wpłat.
+
+Uruchamianie (z katalogu głównego projektu):
+    python -m benchmarks.concurrent_deposits --processes 4 --deposits 100
+"""
+import argparse
+import multiprocessing
+import sys
+import tempfile
+import time
+from collections import Counter
+from decimal import Decimal
+
+from benchmarks.sharded_writes import _configure, _run, _setup
+
+
+def _worker(directory: str, account_id: str, deposits: int) -> Counter:
+    _configure(directory, 1)
+    from application.dto.requests import DepositCommand
+
+    outcomes = Counter()
+    for _ in range(deposits):
+        try:
+            _run(lambda s: s.deposit.execute(DepositCommand(account_id=account_id, amount=Decimal("1.00"))))
+            outcomes["ok"] += 1
+        except Exception as e:
+            outcomes[f"{type(e).__name__}: {str(e).splitlines()[0][:60]}"] += 1
+    return outcomes
+
+
+def _verify(directory: str, account_id: str) -> tuple[Decimal, int]:
+    _configure(directory, 1)
+    from application.dto.requests import GetBalanceCommand, ListTransactionsCommand
+
+    balance = _run(lambda s: s.get_balance.execute(GetBalanceCommand(account_id=account_id))).balance
+    count = _run(lambda s: s.list_transactions.execute(
+        ListTransactionsCommand(account_id=account_id, limit=1)
+    )).total_count
+    return balance, count
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Concurrent deposits on one account from several processes")
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--deposits", type=int, default=100, help="Deposits per process")
+    args = parser.parse_args(argv)
+
+    ctx = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        with ctx.Pool(1) as pool:
+            (account_id,) = pool.apply(_setup, (tmp, 1, 1))
+
+        started = time.perf_counter()
+        with ctx.Pool(args.processes) as pool:
+            results = pool.starmap(_worker, [(tmp, account_id, args.deposits)] * args.processes)
+        elapsed = time.perf_counter() - started
+
+        with ctx.Pool(1) as pool:
+            balance, count = pool.apply(_verify, (tmp, account_id))
+
+    outcomes = sum(results, Counter())
+    expected = args.processes * args.deposits
+    print(f"{expected} deposits from {args.processes} processes in {elapsed:.2f}s ({expected / elapsed:.0f}/s)")
+    for outcome, n in outcomes.most_common():
+        print(f"  {n:6d}  {outcome}")
+
+    failures = []
+    if outcomes["ok"] != expected:
+        failures.append(f"{expected - outcomes['ok']} of {expected} deposits failed")
+    # _setup zakłada konto z wpłatą początkową 1000 (jedna transakcja)
+    if balance != Decimal("1000") + expected:
+        failures.append(f"balance {balance} != {Decimal('1000') + expected}")
+    if count != expected + 1:
+        failures.append(f"{count} transactions != {expected + 1}")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
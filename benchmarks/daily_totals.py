@@ -0,0 +1,126 @@
+"""
+Daily totals rollup: account summary and ListTransactionsResult.total_count vs scanning the history.
+
+Świeża baza z --rows transakcjami na --accounts kont w trzech latach (seed jak w
+benchmarks.report_engine, z pominięciem append), potem ledger jak w migracji 2 i backfill
+account_daily_totals jobem z adapters/jobs/daily_totals.py. Dla --queries losowych kont i okresów "rollup"
+to GetAccountSummaryUseCase i count_for_account (sumy dni + brzegi zakresu z indeksu),
+"scan" to te same liczby jako SUM/COUNT po transactions z filtrem na created_at.
+
+Uruchamianie (z katalogu głównego projektu):
+    python -m benchmarks.daily_totals --rows 1000000 --accounts 100
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+
+SCAN_SUMMARY_SQL = """
+    SELECT SUM(CASE type WHEN 'DEPOSIT' THEN amount_minor ELSE 0 END),
+           SUM(CASE type WHEN 'WITHDRAW' THEN amount_minor ELSE 0 END),
+           COUNT(*)
+    FROM transactions
+    WHERE account_id = ? AND created_at >= ? AND created_at < ?
+"""
+
+SCAN_COUNT_SQL = "SELECT COUNT(*) FROM transactions WHERE account_id = ? AND created_at >= ? AND created_at < ?"
+
+
+def _account_id(number: int) -> str:
+    return f"00000000-0000-4000-8000-{number:012d}"
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Daily totals rollup vs history scan benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--accounts", type=int, default=100)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--days", type=int, default=90, help="Length of the queried period")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bank.db")
+        os.environ["BANK_SQLITE_PATH"] = db_path
+        os.environ["BANK_ACCOUNT_CACHE_SIZE"] = "0"
+
+        from benchmarks.report_engine import YEARS, _seed
+
+        seeded = _seed(db_path, args.rows, args.accounts)
+        print(f"seeded {args.rows} transactions / {args.accounts} accounts in {seeded:.1f}s")
+
+        from db import ReadSessionLocal, backfill_account_balances_sql, engine
+        from adapters.jobs.daily_totals import backfill_daily_totals
+        from adapters.repositories.transaction_repository import _to_db_timestamp
+        from adapters.services import Services
+        from application.dto.requests import GetAccountSummaryCommand
+
+        # seed pomija append, więc wiersze ledgera (daily_totals_ready = 0) jak przy migracji 2
+        conn = sqlite3.connect(db_path)
+        with conn:
+            conn.execute(backfill_account_balances_sql)
+        conn.close()
+
+        report = backfill_daily_totals(engine)
+        print(f"backfill: {report.accounts} accounts, {report.days} days in {report.elapsed:.1f}s")
+
+        rng = random.Random(7)
+        first_day = date(2021, 1, 1)
+        periods = []
+        for _ in range(args.queries):
+            start = first_day + timedelta(days=rng.randrange(YEARS * 365 - args.days))
+            periods.append((_account_id(rng.randint(1, args.accounts)), start, start + timedelta(days=args.days)))
+
+        session = ReadSessionLocal()
+        services = Services(session, read_session=session)
+        repo = services.get_account_summary.transaction_repo
+        conn = sqlite3.connect(db_path)
+        try:
+            timings = {}
+
+            started = time.perf_counter()
+            rollup = [
+                services.get_account_summary.execute(GetAccountSummaryCommand(account_id, start, end)).count
+                for account_id, start, end in periods
+            ]
+            timings["summary rollup"] = time.perf_counter() - started
+
+            bounds = [(a, _midnight(s), _midnight(e)) for a, s, e in periods]
+            started = time.perf_counter()
+            scan = [
+                conn.execute(SCAN_SUMMARY_SQL, (a, _to_db_timestamp(s), _to_db_timestamp(e))).fetchone()[2]
+                for a, s, e in bounds
+            ]
+            timings["summary scan"] = time.perf_counter() - started
+            assert rollup == scan, "rollup and scan disagree"
+
+            # zakres w środku dnia: pełne dni z sum, dwa brzegi z indeksu
+            shifted = [(a, s + timedelta(hours=13), e + timedelta(hours=5)) for a, s, e in bounds]
+            started = time.perf_counter()
+            rollup = [repo.count_for_account(a, s, e) for a, s, e in shifted]
+            timings["count rollup"] = time.perf_counter() - started
+
+            started = time.perf_counter()
+            scan = [
+                conn.execute(SCAN_COUNT_SQL, (a, _to_db_timestamp(s), _to_db_timestamp(e))).fetchone()[0]
+                for a, s, e in shifted
+            ]
+            timings["count scan"] = time.perf_counter() - started
+            assert rollup == scan, "rollup and scan disagree"
+        finally:
+            conn.close()
+            session.close()
+
+        print(f"{'variant':<16}{'ms/query':>10}")
+        for variant, elapsed in timings.items():
+            print(f"{variant:<16}{elapsed / args.queries * 1000:>10.2f}")
+
+
+def _midnight(day: date) -> datetime:
+    return datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+
+
+if __name__ == "__main__":
+    main()
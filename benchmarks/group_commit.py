@@ -0,0 +1,165 @@
+"""
+Group commit: --threads threads x --deposits deposits, COMMIT per command vs GroupCommitExecutor.
+
+Świeża baza z --accounts kontami; każdy wątek robi wpłaty 1.00 na losowe konta. "per command"
+to sesja i COMMIT na wpłatę (jak CLI i serwer HTTP bez --group-commit), "group commit" to
+GroupCommitExecutor (SAVEPOINT na komendę, jeden COMMIT na paczkę). Potem kontrola sald i
+testy awarii writera: sesja, której nie da się otworzyć (Future dostaje błąd, executor
+działa dalej), i writer, który pada (czekające Future dostają błąd, submit() rzuca).
+Kod wyjścia 1, jeśli któraś kontrola nie przejdzie.
+
+Uruchamianie (z katalogu głównego projektu):
+    python -m benchmarks.group_commit --threads 8 --deposits 200
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from decimal import Decimal
+
+
+class _BrokenSession:
+    """Sesja, której close() rzuca: wywraca wątek writera poza obsługą błędów paczki."""
+
+    def __init__(self, session):
+        self._session = session
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+    def close(self):
+        self._session.close()
+        raise RuntimeError("injected close() failure")
+
+
+def _deposit_threads(threads: int, deposits: int, account_ids: list[str], deposit) -> float:
+    from application.dto.requests import DepositCommand
+
+    def worker(seed: int) -> None:
+        rng = random.Random(seed)
+        for _ in range(deposits):
+            deposit(DepositCommand(account_id=rng.choice(account_ids), amount=Decimal("1.00")))
+
+    workers = [threading.Thread(target=worker, args=(seed,)) for seed in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return time.perf_counter() - started
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Group commit vs COMMIT per command, plus writer failure checks")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--deposits", type=int, default=200, help="Deposits per thread")
+    parser.add_argument("--accounts", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["BANK_SQLITE_PATH"] = os.path.join(tmp, "bank.db")
+        os.environ["BANK_ACCOUNT_CACHE_SIZE"] = "0"
+
+        from db import SessionLocal
+        from adapters.group_commit.group_commit_executor import GroupCommitExecutor
+        from adapters.services import Services
+        from application.dto.requests import CreateAccountCommand, DepositCommand, GetBalanceCommand
+        from domain.types.currency import CurrencyType
+
+        def per_command(use_case: str, cmd):
+            session = SessionLocal()
+            try:
+                result = getattr(Services(session), use_case).execute(cmd)
+                session.commit()
+                return result
+            except Exception:
+                session.rollback()
+                raise
+            finally:
+                session.close()
+
+        account_ids = [
+            per_command("create_account", CreateAccountCommand(owner_name="bench", currency=CurrencyType.PLN)).account_id
+            for _ in range(args.accounts)
+        ]
+
+        total = args.threads * args.deposits
+        timings = {}
+        timings["per command"] = _deposit_threads(
+            args.threads, args.deposits, account_ids, lambda cmd: per_command("deposit", cmd)
+        )
+        with GroupCommitExecutor(SessionLocal, Services) as executor:
+            timings["group commit"] = _deposit_threads(
+                args.threads, args.deposits, account_ids, lambda cmd: executor.execute("deposit", cmd)
+            )
+
+        print(f"{total} deposits from {args.threads} threads per variant")
+        print(f"{'variant':<14}{'deposits/s':>12}")
+        for variant, elapsed in timings.items():
+            print(f"{variant:<14}{total / elapsed:>12.0f}")
+
+        failures = []
+        balance = sum(
+            per_command("get_balance", GetBalanceCommand(account_id=account_id)).balance
+            for account_id in account_ids
+        )
+        if balance != 2 * total:
+            failures.append(f"sum of balances {balance} != {2 * total}")
+
+        deposit = DepositCommand(account_id=account_ids[0], amount=Decimal("1.00"))
+
+        # sesja, której nie da się otworzyć: błąd trafia do Future, kolejna paczka przechodzi
+        calls = []
+
+        def flaky_session():
+            calls.append(None)
+            if len(calls) == 1:
+                raise RuntimeError("injected session failure")
+            return SessionLocal()
+
+        with GroupCommitExecutor(flaky_session, Services) as executor:
+            try:
+                executor.execute("deposit", deposit, timeout=5)
+                failures.append("session failure: future did not fail")
+            except TimeoutError:
+                failures.append("session failure: future never resolved")
+            except RuntimeError:
+                pass
+            try:
+                executor.execute("deposit", deposit, timeout=5)
+            except Exception as e:
+                failures.append(f"session failure: next batch failed ({e!r})")
+
+        # writer pada poza obsługą paczki: Future kończą się błędem, submit() rzuca;
+        # traceback wątku writera jest tu oczekiwany, więc go nie drukujemy
+        threading.excepthook = lambda hook_args: None
+        executor = GroupCommitExecutor(lambda: _BrokenSession(SessionLocal()), Services)
+        futures = [executor.submit("deposit", deposit) for _ in range(3)]
+        for future in futures:
+            try:
+                future.result(timeout=5)
+                failures.append("writer failure: future got a result")
+            except TimeoutError:
+                failures.append("writer failure: future never resolved")
+            except RuntimeError:
+                pass
+        try:
+            executor.submit("deposit", deposit)
+            failures.append("writer failure: submit() accepted work on a dead writer")
+        except RuntimeError:
+            pass
+        executor.close()
+        threading.excepthook = threading.__excepthook__
+
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        if not failures:
+            print("failure checks: ok")
+        return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
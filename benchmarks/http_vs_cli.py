@@ -0,0 +1,81 @@
+"""
+Latency: long-lived HTTP adapter vs one CLI process per operation.
+
+Uruchamianie (z katalogu głównego projektu, najlepiej na osobnej bazie):
+    BANK_SQLITE_PATH=/tmp/bench.db python -m benchmarks.http_vs_cli --requests 500 --cli-runs 10
+"""
+import argparse
+import http.client
+import json
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+
+def _percentiles(samples: list[float]) -> str:
+    samples = sorted(samples)
+    p50 = statistics.median(samples)
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    return f"n={len(samples):5d}  p50={p50 * 1000:8.2f} ms  p95={p95 * 1000:8.2f} ms"
+
+
+def bench_http(account_id: str, port: int, requests: int) -> list[float]:
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    samples = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        conn.request("GET", f"/accounts/{account_id}/balance")
+        response = conn.getresponse()
+        response.read()
+        samples.append(time.perf_counter() - started)
+        assert response.status == 200, response.status
+    conn.close()
+    return samples
+
+
+def bench_cli(account_id: str, runs: int) -> list[float]:
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-m", "adapters.cli.main", "balance", "--account-id", account_id],
+            check=True,
+            capture_output=True,
+        )
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--cli-runs", type=int, default=10)
+    args = parser.parse_args()
+
+    from adapters.http.server import BankHTTPServer
+
+    server = BankHTTPServer(("127.0.0.1", 0))
+    port = server.server_port
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    conn.request(
+        "POST", "/accounts",
+        body=json.dumps({"owner_name": "bench", "currency": "PLN", "initial_deposit": "100"}),
+        headers={"Content-Type": "application/json"},
+    )
+    account_id = json.loads(conn.getresponse().read())["account_id"]
+    conn.close()
+
+    bench_http(account_id, port, 20)  # rozgrzewka
+    print(f"HTTP balance : {_percentiles(bench_http(account_id, port, args.requests))}")
+    print(f"CLI  balance : {_percentiles(bench_cli(account_id, args.cli_runs))}")
+
+    server.shutdown()
+    server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Insert throughput and file size: uuid4 vs uuid7 keys, stored as TEXT vs 16-byte BLOB.
+
+Każdy wariant dostaje świeżą bazę w katalogu tymczasowym (schemat z db.ensure_schema)
+i wstawia te same wiersze transakcji porcjami po --batch; przy losowych kluczach
+indeksy PK i (account_id, ...) rosną w losowych miejscach B-drzewa, przy UUIDv7
+dopisywane są na prawej krawędzi.
+
+Uruchamianie (z katalogu głównego projektu):
+    python -m benchmarks.id_layouts --rows 100000
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+import uuid
+
+
+def _run(db_path: str, provider, binary: bool, rows: int, batch: int, accounts: int) -> tuple[float, int]:
+    from db import ensure_schema
+
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    ensure_schema(conn)
+
+    def to_db(value: str):
+        return uuid.UUID(value).bytes if binary else value
+
+    account_ids = [to_db(account_id) for account_id in provider.generate_ids(accounts)]
+    conn.execute("BEGIN")
+    conn.executemany(
+        "INSERT INTO accounts (account_id, owner_name, currency, balance, created_at, updated_at, status)"
+        " VALUES (?, 'bench', 'PLN', 0, '2024-01-01T00:00:00+00:00', '2024-01-01T00:00:00+00:00', 'ACTIVE')",
+        [(account_id,) for account_id in account_ids],
+    )
+    conn.execute("COMMIT")
+
+    started = time.perf_counter()
+    for offset in range(0, rows, batch):
+        count = min(batch, rows - offset)
+        tx_ids = provider.generate_ids(count)
+        conn.execute("BEGIN")
+        conn.executemany(
+            "INSERT INTO transactions (tx_id, account_id, type, amount, amount_minor, currency, created_at)"
+            " VALUES (?, ?, 'DEPOSIT', '1.00', 100, 'PLN', '2024-01-01T00:00:00+00:00')",
+            [(to_db(tx_id), account_ids[(offset + i) % accounts]) for i, tx_id in enumerate(tx_ids)],
+        )
+        conn.execute("COMMIT")
+    elapsed = time.perf_counter() - started
+
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    conn.close()
+    return elapsed, os.path.getsize(db_path)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="uuid4/uuid7 x TEXT/BLOB insert benchmark")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--accounts", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    from adapters.id_provider.id_provider import UUIDIdProvider, UUID7IdProvider
+
+    variants = [
+        ("uuid4 text", UUIDIdProvider(), False),
+        ("uuid4 blob", UUIDIdProvider(), True),
+        ("uuid7 text", UUID7IdProvider(), False),
+        ("uuid7 blob", UUID7IdProvider(), True),
+    ]
+    print(f"{'variant':<14}{'rows/s':>12}{'file MB':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, provider, binary in variants:
+            db_path = os.path.join(tmp, label.replace(" ", "_") + ".db")
+            elapsed, size = _run(db_path, provider, binary, args.rows, args.batch, args.accounts)
+            print(f"{label:<14}{args.rows / elapsed:>12.0f}{size / 1_048_576:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+Report engine: NumPy columnar aggregation vs SQLite GROUP BY vs row-by-row Python over entities.
+
+Świeża baza z --rows transakcjami rozłożonymi losowo na --accounts kont i trzy lata
+(wstawiane jednym INSERT ... SELECT z rekurencyjnym CTE, indeksy budowane po wstawieniu).
+Każdy wariant działa w osobnym procesie (spawn), żeby szczytowe RSS dotyczyło tylko
+jego. "numpy *" to TransactionReports (porcje po --chunk-size wierszy), "sql daily"
+to ten sam raport dzienny jako GROUP BY w SQLite, zamieniony na te same wiersze
+PeriodTotals co rows() raportu NumPy, "python daily" to dotychczasowa droga:
+iter_for_account dla każdego konta i sumowanie encji Transaction (Decimal) w dict.
+
+Uruchamianie (z katalogu głównego projektu):
+    python -m benchmarks.report_engine --rows 10000000
+    python -m benchmarks.report_engine --rows 1000000 --no-python
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import sqlite3
+import tempfile
+import time
+from datetime import date, datetime, timezone
+
+YEARS = 3
+
+# r jako MATERIALIZED: każda losowa wartość liczona raz na wiersz (bez spłaszczenia do wyrażeń wyżej)
+SEED_SQL = """
+    WITH RECURSIVE
+        n(i) AS (SELECT 0 UNION ALL SELECT i + 1 FROM n WHERE i + 1 < :rows),
+        r AS MATERIALIZED (
+            SELECT
+                i,
+                1 + abs(random()) % :accounts AS account,
+                :start + abs(random()) % :span AS us,
+                1 + abs(random()) % 99999 AS minor,
+                CASE WHEN abs(random()) % 100 < 55 THEN 'DEPOSIT' ELSE 'WITHDRAW' END AS type
+            FROM n
+        )
+    INSERT INTO transactions (tx_id, account_id, type, amount, amount_minor, currency, created_at, created_at_us)
+    SELECT
+        printf('%08x-0000-4000-8000-%012x', i / 4294967296, i % 4294967296),
+        printf('00000000-0000-4000-8000-%012d', account),
+        type,
+        printf('%d.%02d', minor / 100, minor % 100),
+        minor,
+        CASE account % 2 WHEN 0 THEN 'PLN' ELSE 'EUR' END,
+        strftime('%Y-%m-%dT%H:%M:%S', us / 1000000, 'unixepoch') || printf('.%06d+00:00', us % 1000000),
+        us
+    FROM r
+"""
+
+SQL_DAILY = """
+    SELECT account_id, currency, substr(created_at, 1, 10),
+           SUM(CASE type WHEN 'DEPOSIT' THEN amount_minor ELSE 0 END),
+           SUM(CASE type WHEN 'WITHDRAW' THEN amount_minor ELSE 0 END),
+           COUNT(*)
+    FROM transactions
+    GROUP BY 1, 2, 3
+"""
+
+
+def _seed(db_path: str, rows: int, accounts: int) -> float:
+    from db import ensure_schema
+
+    started = time.perf_counter()
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=OFF")
+    ensure_schema(conn)
+    indexes = conn.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = 'transactions' AND sql IS NOT NULL"
+    ).fetchall()
+    conn.execute("BEGIN")
+    for name, _ in indexes:
+        conn.execute(f"DROP INDEX {name}")
+    conn.executemany(
+        "INSERT INTO accounts (account_id, owner_name, currency, balance, created_at, updated_at, status)"
+        " VALUES (printf('00000000-0000-4000-8000-%012d', ?), 'bench', ?, 0,"
+        " '2020-01-01T00:00:00+00:00', '2020-01-01T00:00:00+00:00', 'ACTIVE')",
+        ((i, ("PLN", "EUR")[i % 2]) for i in range(1, accounts + 1)),
+    )
+    start = int(datetime(2021, 1, 1, tzinfo=timezone.utc).timestamp()) * 10**6
+    conn.execute(
+        SEED_SQL, {"rows": rows, "accounts": accounts, "start": start, "span": YEARS * 365 * 86400 * 10**6}
+    )
+    for _, sql in indexes:
+        conn.execute(sql)
+    conn.execute("COMMIT")
+    conn.execute("ANALYZE")
+    conn.close()
+    return time.perf_counter() - started
+
+
+def _run(db_path: str, variant: str, chunk_size: int) -> tuple[float, int, float]:
+    os.environ["BANK_SQLITE_PATH"] = db_path
+    os.environ["BANK_ACCOUNT_CACHE_SIZE"] = "0"
+
+    # importy (SQLAlchemy, NumPy) poza pomiarem
+    from db import read_engine
+    from adapters.reporting.columnar import ColumnarSource
+    from adapters.reporting.reports import TransactionReports
+
+    reports = TransactionReports(ColumnarSource(read_engine, chunk_size=chunk_size))
+    started = time.perf_counter()
+    if variant == "sql daily":
+        conn = sqlite3.connect(db_path)
+        groups = _count(_sql_daily_rows(conn.execute(SQL_DAILY)))
+        conn.close()
+    elif variant == "python daily":
+        groups = _python_daily(db_path)
+    elif variant == "numpy daily":
+        groups = _count(reports.period_totals("day").rows())
+    elif variant == "numpy monthly":
+        groups = _count(reports.period_totals("month").rows())
+    elif variant == "numpy top":
+        groups = _count(reports.top_accounts(10).rows())
+    else:
+        account_id = "00000000-0000-4000-8000-000000000001"
+        groups = _count(reports.balance_series(account_id).rows())
+    elapsed = time.perf_counter() - started
+
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return elapsed, groups, peak_mb
+
+
+def _count(rows) -> int:
+    # wiersze tylko przeliczane (jak przy strumieniowym wypisywaniu), bez listy w pamięci
+    return sum(1 for _ in rows)
+
+
+def _sql_daily_rows(cursor):
+    from adapters.reporting.reports import PeriodTotals
+    from adapters.repositories.money import from_minor
+    from domain.types.currency import CurrencyType
+
+    for account_id, currency, day, inflow, outflow, count in cursor:
+        yield PeriodTotals(
+            account_id=account_id,
+            currency=CurrencyType(currency),
+            period_start=date.fromisoformat(day),
+            inflow=from_minor(inflow),
+            outflow=from_minor(outflow),
+            net=from_minor(inflow - outflow),
+            count=count,
+        )
+
+
+def _python_daily(db_path: str) -> int:
+    from db import ReadSessionLocal
+    from adapters.services import Services
+    from domain.types.transaction import TransactionType
+
+    conn = sqlite3.connect(db_path)
+    accounts = [row[0] for row in conn.execute("SELECT account_id FROM accounts")]
+    conn.close()
+
+    totals: dict = {}
+    session = ReadSessionLocal()
+    try:
+        repo = Services(session, backend="sqlite3").list_transactions.transaction_repo
+        for account_id in accounts:
+            for tx in repo.iter_for_account(account_id, batch_size=10000):
+                key = (account_id, tx.currency, tx.occurred_at.date())
+                inflow, outflow, count = totals.get(key, (0, 0, 0))
+                if tx.type == TransactionType.DEPOSIT:
+                    inflow += tx.amount
+                elif tx.type == TransactionType.WITHDRAW:
+                    outflow += tx.amount
+                totals[key] = (inflow, outflow, count + 1)
+    finally:
+        session.close()
+    return len(totals)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Columnar NumPy reports vs SQL and row-by-row benchmark")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--accounts", type=int, default=10_000)
+    parser.add_argument("--chunk-size", type=int, default=65536)
+    parser.add_argument("--no-python", action="store_true", help="Skip the slow row-by-row Python variant")
+    args = parser.parse_args(argv)
+
+    variants = ["numpy daily", "numpy monthly", "numpy top", "numpy balance", "sql daily"]
+    if not args.no_python:
+        variants.append("python daily")
+
+    ctx = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bank.db")
+        with ctx.Pool(1) as pool:
+            seeded = pool.apply(_seed, (db_path, args.rows, args.accounts))
+        print(f"seeded {args.rows} transactions / {args.accounts} accounts in {seeded:.1f}s")
+        print(f"{'variant':<16}{'seconds':>10}{'rows/s':>14}{'groups':>10}{'peak MB':>10}")
+        for variant in variants:
+            # świeży proces na wariant: ru_maxrss to szczyt całego procesu
+            with ctx.Pool(1) as pool:
+                elapsed, groups, peak_mb = pool.apply(_run, (db_path, variant, args.chunk_size))
+            print(f"{variant:<16}{elapsed:>10.2f}{args.rows / elapsed:>14.0f}{groups:>10}{peak_mb:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
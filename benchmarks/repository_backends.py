@@ -0,0 +1,115 @@
+"""
+Per-call cost of the repository adapters: SQLAlchemy (Session + text() + mappings) vs raw sqlite3.
+
+Mierzy pojedyncze wywołania portów (bez use-case'ów i bez cache kont) na tej
+samej bazie i w tej samej transakcji, więc różnica to narzut samego adaptera.
+
+Uruchamianie (z katalogu głównego projektu, najlepiej na osobnej bazie):
+    BANK_SQLITE_PATH=/tmp/bench_repos.db python -m benchmarks.repository_backends --calls 20000
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+
+
+def _seed(session_factory, accounts: int, history: int) -> list[str]:
+    from uuid import uuid4
+    from adapters.repositories.sqlite3_account_repository import Sqlite3AccountRepository
+    from adapters.repositories.sqlite3_transaction_repository import Sqlite3TransactionsRepository
+    from domain.entities.entities import Account, Transaction
+    from domain.types.account_status import AccountStatus
+    from domain.types.currency import CurrencyType
+    from domain.types.transaction import TransactionType
+
+    session = session_factory()
+    account_repo = Sqlite3AccountRepository(session)
+    tx_repo = Sqlite3TransactionsRepository(session)
+    now = datetime.now(timezone.utc)
+    account_ids = []
+    for _ in range(accounts):
+        account = Account(
+            account_id=str(uuid4()),
+            owner_name="bench",
+            currency=CurrencyType.PLN,
+            balance=Decimal("0"),
+            created_at=now,
+            updated_at=now,
+            status=AccountStatus.ACTIVE,
+        )
+        account_repo.create(account)
+        tx_repo.append_many([
+            Transaction(
+                tx_id=str(uuid4()),
+                type=TransactionType.DEPOSIT,
+                account_id=account.account_id,
+                amount=Decimal("1.00"),
+                currency=CurrencyType.PLN,
+                occurred_at=now,
+            )
+            for _ in range(history)
+        ])
+        account_ids.append(account.account_id)
+    session.commit()
+    session.close()
+    return account_ids
+
+
+def _time_per_call(operation, account_ids: list[str], calls: int, rounds: int) -> float:
+    """Mediana (z `rounds` przebiegów) czasu jednego wywołania w µs."""
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for i in range(calls):
+            operation(account_ids[i % len(account_ids)])
+        samples.append((time.perf_counter() - started) / calls * 1_000_000)
+    return statistics.median(samples)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="SQLAlchemy vs sqlite3 repository adapters")
+    parser.add_argument("--accounts", type=int, default=1000)
+    parser.add_argument("--history", type=int, default=20, help="Transactions per account")
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    from db import SessionLocal
+    from adapters.repositories.sqlite_account_repository import SqliteAccountRepository
+    from adapters.repositories.transaction_repository import TransactionsRepository
+    from adapters.repositories.sqlite3_account_repository import Sqlite3AccountRepository
+    from adapters.repositories.sqlite3_transaction_repository import Sqlite3TransactionsRepository
+
+    account_ids = _seed(SessionLocal, args.accounts, args.history)
+    backends = {
+        "sqlalchemy": (SqliteAccountRepository, TransactionsRepository),
+        "sqlite3": (Sqlite3AccountRepository, Sqlite3TransactionsRepository),
+    }
+
+    results: dict[str, dict[str, float]] = {}
+    for name, (account_repo_cls, tx_repo_cls) in backends.items():
+        session = SessionLocal()
+        account_repo = account_repo_cls(session)
+        tx_repo = tx_repo_cls(session)
+        operations = {
+            "account get_by_id": account_repo.get_by_id,
+            "account get_version": account_repo.get_version,
+            "ledger get_balance": tx_repo.get_balance,
+            "list_for_account(20)": lambda account_id: tx_repo.list_for_account(account_id, limit=20),
+        }
+        results[name] = {
+            label: _time_per_call(operation, account_ids, args.calls, args.rounds)
+            for label, operation in operations.items()
+        }
+        session.rollback()
+        session.close()
+
+    print(f"{'operation':<24}{'sqlalchemy µs':>15}{'sqlite3 µs':>13}{'speedup':>10}")
+    for label in results["sqlalchemy"]:
+        slow, fast = results["sqlalchemy"][label], results["sqlite3"][label]
+        print(f"{label:<24}{slow:>15.1f}{fast:>13.1f}{slow / fast:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Write throughput: one bank.db vs BANK_SHARD_COUNT hash-sharded files.
+
+Każdy wariant dostaje świeży katalog; --processes procesów robi po --commits
+wpłat (COMMIT po każdej) na kontach "swojej" partycji (hash account_id modulo
+liczba procesów, jak przy routingu po shardach). Przy jednym pliku wszyscy stoją
+w kolejce do jednego locka WAL, przy shardach tylko procesy trafiające w ten sam
+plik. Osobno mierzony jest koszt przelewu (jeden proces): lokalnego i między
+shardami (dziennik koordynatora + dwa COMMIT-y).
+
+"locked" to wpłaty odrzucone przez SQLite jako "database is locked" (rywalizacja o zapis).
+
+Uruchamianie (z katalogu głównego projektu):
+    python -m benchmarks.sharded_writes --processes 4 --shards 4 --commits 300
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+from decimal import Decimal
+
+
+def _configure(directory: str, shards: int) -> None:
+    # config czyta zmienne przy imporcie, a procesy są uruchamiane metodą spawn
+    os.environ["BANK_SQLITE_PATH"] = os.path.join(directory, "bank.db")
+    os.environ["BANK_SHARD_DIR"] = os.path.join(directory, "shards")
+    os.environ["BANK_SHARD_COUNT"] = str(shards)
+    os.environ["BANK_ACCOUNT_CACHE_SIZE"] = "0"
+
+
+def _unit_of_work():
+    from adapters.services import SHARDED
+
+    if SHARDED:
+        from adapters.services import ShardedServices, shard_set
+        session = shard_set().session()
+        return session, ShardedServices(session)
+
+    from db import SessionLocal
+    from adapters.services import Services
+    session = SessionLocal()
+    return session, Services(session)
+
+
+def _run(operation):
+    session, services = _unit_of_work()
+    try:
+        result = operation(services)
+        session.commit()
+        return result
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def _setup(directory: str, shards: int, accounts: int) -> list[str]:
+    _configure(directory, shards)
+    from application.dto.requests import CreateAccountCommand
+    from domain.types.currency import CurrencyType
+
+    return [
+        _run(lambda s: s.create_account.execute(
+            CreateAccountCommand(owner_name="bench", currency=CurrencyType.PLN, initial_deposit=Decimal("1000"))
+        )).account_id
+        for _ in range(accounts)
+    ]
+
+
+def _deposit_worker(directory: str, shards: int, account_ids: list[str], commits: int, seed: int) -> tuple[int, int]:
+    _configure(directory, shards)
+    from sqlalchemy.exc import OperationalError
+    from application.dto.requests import DepositCommand
+
+    rng = random.Random(seed)
+    ok = locked = 0
+    for _ in range(commits):
+        account_id = rng.choice(account_ids)
+        try:
+            _run(lambda s: s.deposit.execute(DepositCommand(account_id=account_id, amount=Decimal("1.00"))))
+            ok += 1
+        except OperationalError:
+            locked += 1
+    return ok, locked
+
+
+def _transfer_worker(directory: str, shards: int, account_ids: list[str], transfers: int) -> dict[str, float]:
+    _configure(directory, shards)
+    from adapters.services import SHARDED
+    from application.dto.requests import TransferCommand
+
+    def shard_of(account_id: str) -> int:
+        if not SHARDED:
+            return 0
+        from adapters.services import shard_set
+        return shard_set().shard_for(account_id)
+
+    same = [(a, b) for a in account_ids for b in account_ids if a != b and shard_of(a) == shard_of(b)]
+    cross = [(a, b) for a in account_ids for b in account_ids if shard_of(a) != shard_of(b)]
+
+    results = {}
+    for label, pairs in (("local transfers/s", same), ("cross-shard transfers/s", cross)):
+        if not pairs:
+            results[label] = float("nan")
+            continue
+        started = time.perf_counter()
+        for i in range(transfers):
+            source, target = pairs[i % len(pairs)]
+            _run(lambda s: s.transfer.execute(TransferCommand(source, target, Decimal("0.01"))))
+        results[label] = transfers / (time.perf_counter() - started)
+    return results
+
+
+def _bench(shards: int, args) -> dict[str, float]:
+    from adapters.sharding.shard_set import shard_for
+
+    ctx = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as directory, ctx.Pool(args.processes) as pool:
+        account_ids = pool.apply(_setup, (directory, shards, args.accounts))
+        partitions = [
+            [account_id for account_id in account_ids if shard_for(account_id, args.processes) == worker]
+            for worker in range(args.processes)
+        ]
+        started = time.perf_counter()
+        results = pool.starmap(
+            _deposit_worker,
+            [(directory, shards, partition, args.commits, seed) for seed, partition in enumerate(partitions)],
+        )
+        elapsed = time.perf_counter() - started
+
+        metrics = {
+            "deposits/s": sum(ok for ok, _ in results) / elapsed,
+            "locked": float(sum(locked for _, locked in results)),
+        }
+        metrics.update(pool.apply(_transfer_worker, (directory, shards, account_ids, args.transfers)))
+        return metrics
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Single-file vs sharded SQLite write benchmark")
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--shards", type=int, default=4)
+    parser.add_argument("--accounts", type=int, default=64)
+    parser.add_argument("--commits", type=int, default=300, help="Deposit commits per process")
+    parser.add_argument("--transfers", type=int, default=300, help="Transfers per kind (local / cross-shard)")
+    args = parser.parse_args(argv)
+
+    results = {"1 file": _bench(0, args), f"{args.shards} shards": _bench(args.shards, args)}
+
+    metrics = list(next(iter(results.values())))
+    print(f"{'layout':<12}" + "".join(f"{metric:>25}" for metric in metrics))
+    for layout, values in results.items():
+        print(f"{layout:<12}" + "".join(f"{values[metric]:>25.0f}" for metric in metrics))
+
+
+if __name__ == "__main__":
+    main()
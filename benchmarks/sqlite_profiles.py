@@ -0,0 +1,124 @@
+"""
+Write and read throughput of the PRAGMA profiles (config.SQLITE_PROFILES).
+
+Każdy profil dostaje świeżą bazę i własny engine z install_sqlite_hooks(profile=...),
+po czym mierzy:
+  * commits/s    - wpłaty przez DepositUseCase, COMMIT po każdej (koszt fsync),
+  * bulk rows/s  - append_many po --batch transakcji na COMMIT,
+  * reads/s      - get_balance + list_for_account(limit=50) dla losowych kont.
+
+Uruchamianie (z katalogu głównego projektu):
+    python -m benchmarks.sqlite_profiles --accounts 200 --history 500
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+
+
+def _bench_profile(db_path: str, profile: str, args) -> dict[str, float]:
+    from uuid import uuid4
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from db import install_sqlite_hooks
+    from adapters.services import Services
+    from adapters.repositories.transaction_repository import TransactionsRepository
+    from application.dto.requests import CreateAccountCommand, DepositCommand
+    from domain.entities.entities import Transaction
+    from domain.types.currency import CurrencyType
+    from domain.types.transaction import TransactionType
+
+    engine = create_engine(f"sqlite:///{db_path}")
+    install_sqlite_hooks(engine, profile=profile)
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+
+    account_ids = []
+    for _ in range(args.accounts):
+        with session_factory() as session:
+            result = Services(session).create_account.execute(
+                CreateAccountCommand(owner_name="bench", currency=CurrencyType.PLN, initial_deposit=Decimal("0"))
+            )
+            session.commit()
+        account_ids.append(result.account_id)
+
+    # pojedyncze COMMIT-y
+    started = time.perf_counter()
+    for i in range(args.commits):
+        with session_factory() as session:
+            Services(session).deposit.execute(
+                DepositCommand(account_id=account_ids[i % len(account_ids)], amount=Decimal("1.00"))
+            )
+            session.commit()
+    commits_per_s = args.commits / (time.perf_counter() - started)
+
+    # hurtowe dopisywanie historii
+    now = datetime.now(timezone.utc)
+    rows = args.accounts * args.history
+    started = time.perf_counter()
+    pending: list[Transaction] = []
+    for account_id in account_ids:
+        for _ in range(args.history):
+            pending.append(Transaction(
+                tx_id=str(uuid4()),
+                type=TransactionType.DEPOSIT,
+                account_id=account_id,
+                amount=Decimal("1.00"),
+                currency=CurrencyType.PLN,
+                occurred_at=now,
+            ))
+            if len(pending) == args.batch:
+                with session_factory() as session:
+                    TransactionsRepository(session).append_many(pending)
+                    session.commit()
+                pending = []
+    if pending:
+        with session_factory() as session:
+            TransactionsRepository(session).append_many(pending)
+            session.commit()
+    bulk_rows_per_s = rows / (time.perf_counter() - started)
+
+    # odczyty (bez cache kont: repozytorium bezpośrednio)
+    engine.dispose()
+    rng = random.Random(42)
+    started = time.perf_counter()
+    with session_factory() as session:
+        repo = TransactionsRepository(session)
+        for _ in range(args.reads):
+            account_id = rng.choice(account_ids)
+            repo.get_balance(account_id)
+            repo.list_for_account(account_id, limit=50)[-1]
+    reads_per_s = args.reads / (time.perf_counter() - started)
+
+    engine.dispose()
+    return {"commits/s": commits_per_s, "bulk rows/s": bulk_rows_per_s, "reads/s": reads_per_s}
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="SQLite PRAGMA profile benchmark")
+    parser.add_argument("--accounts", type=int, default=200)
+    parser.add_argument("--history", type=int, default=500, help="Bulk-loaded transactions per account")
+    parser.add_argument("--batch", type=int, default=1000, help="Transactions per bulk COMMIT")
+    parser.add_argument("--commits", type=int, default=500, help="Single-deposit commits")
+    parser.add_argument("--reads", type=int, default=5000)
+    parser.add_argument("--profiles", nargs="*", default=None, help="Default: all from config.SQLITE_PROFILES")
+    args = parser.parse_args(argv)
+
+    from config.config import SQLITE_PROFILES
+
+    profiles = args.profiles or list(SQLITE_PROFILES)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for profile in profiles:
+            results[profile] = _bench_profile(os.path.join(tmp, f"{profile}.db"), profile, args)
+
+    metrics = list(next(iter(results.values())))
+    print(f"{'profile':<12}" + "".join(f"{metric:>14}" for metric in metrics))
+    for profile, values in results.items():
+        print(f"{profile:<12}" + "".join(f"{values[metric]:>14.0f}" for metric in metrics))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Statement export: full list_for_account + Rich-style materialization vs streaming iter_for_account.
+
+Jedno konto z --rows transakcjami (wstawione bezpośrednio przez sqlite3 do świeżej
+bazy). Każdy wariant działa w osobnym procesie (spawn), żeby szczytowe RSS
+(ru_maxrss) dotyczyło tylko jego. "list" to dotychczasowa droga: fetchall całej
+historii, lista DTO, potem CSV; "stream" to eksport przez ExportTransactionsUseCase
+porcjami po --batch-size. "first row ms" mierzy czas do zapisania pierwszego wiersza.
+
+Uruchamianie (z katalogu głównego projektu):
+    python -m benchmarks.statement_export --rows 500000
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import sqlite3
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+ACCOUNT_ID = "00000000-0000-4000-8000-000000000001"
+
+
+def _seed(db_path: str, rows: int) -> None:
+    from db import ensure_schema
+
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    ensure_schema(conn)
+    conn.execute("BEGIN")
+    conn.execute(
+        "INSERT INTO accounts (account_id, owner_name, currency, balance, created_at, updated_at, status)"
+        " VALUES (?, 'bench', 'PLN', 0, '2020-01-01T00:00:00+00:00', '2020-01-01T00:00:00+00:00', 'ACTIVE')",
+        (ACCOUNT_ID,),
+    )
+    start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    conn.executemany(
+        "INSERT INTO transactions (tx_id, account_id, type, amount, amount_minor, currency, created_at, note)"
+        " VALUES (?, ?, 'DEPOSIT', '1.00', 100, 'PLN', ?, 'bench')",
+        (
+            (str(uuid.uuid4()), ACCOUNT_ID, (start + timedelta(seconds=i)).isoformat())
+            for i in range(rows)
+        ),
+    )
+    conn.execute("COMMIT")
+    conn.close()
+
+
+def _export(db_path: str, backend: str, mode: str, batch_size: int) -> tuple[float, float, float]:
+    os.environ["BANK_SQLITE_PATH"] = db_path
+    os.environ["BANK_ACCOUNT_CACHE_SIZE"] = "0"
+    from db import ReadSessionLocal
+    from adapters.cli.export import write_items
+    from adapters.services import Services
+    from application.dto.requests import ExportTransactionsCommand
+    from application.use_cases.list_transactions import to_transaction_item
+
+    class FirstRow:
+        """Plik-zaślepka (jak /dev/null), notujący moment pierwszego wiersza danych."""
+
+        def __init__(self):
+            self.lines = 0
+            self.first = None
+
+        def write(self, data: str) -> int:
+            self.lines += data.count("\n")
+            if self.first is None and self.lines >= 2:
+                self.first = time.perf_counter()
+            return len(data)
+
+    session = ReadSessionLocal()
+    try:
+        services = Services(session, backend=backend)
+        sink = FirstRow()
+        started = time.perf_counter()
+        if mode == "list":
+            transactions = services.list_transactions.transaction_repo.list_for_account(ACCOUNT_ID)
+            items = [to_transaction_item(tx) for tx in transactions]
+        else:
+            items = services.export_transactions.execute(
+                ExportTransactionsCommand(account_id=ACCOUNT_ID, batch_size=batch_size)
+            )
+        count = write_items(items, sink, "csv")
+        elapsed = time.perf_counter() - started
+    finally:
+        session.close()
+
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return count / elapsed, (sink.first - started) * 1000, peak_mb
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Materialized vs streaming statement export benchmark")
+    parser.add_argument("--rows", type=int, default=500000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    ctx = multiprocessing.get_context("spawn")
+    print(f"{'variant':<18}{'rows/s':>12}{'first row ms':>15}{'peak MB':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bank.db")
+        with ctx.Pool(1) as pool:
+            pool.apply(_seed, (db_path, args.rows))
+        for backend in ("sqlalchemy", "sqlite3"):
+            for mode in ("list", "stream"):
+                # świeży proces na wariant: ru_maxrss to szczyt całego procesu
+                with ctx.Pool(1) as pool:
+                    rate, first_ms, peak_mb = pool.apply(_export, (db_path, backend, mode, args.batch_size))
+                print(f"{backend + ' ' + mode:<18}{rate:>12.0f}{first_ms:>15.1f}{peak_mb:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
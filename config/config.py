@@ -8,4 +8,66 @@ BASE_DIR = Path(__file__).resolve().parents[1]
 DATA_DIR = BASE_DIR / "data"
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 
-SQLITE_PATH = Path(os.getenv("BANK_SQLITE_PATH", DATA_DIR / "bank.db"))
\ No newline at end of file
+SQLITE_PATH = Path(os.getenv("BANK_SQLITE_PATH", DATA_DIR / "bank.db"))
+
+# profil PRAGMA ustawiany na każdym nowym połączeniu (per proces): "durable" | "balanced" | "bulk-load"
+SQLITE_PROFILE = os.getenv("BANK_SQLITE_PROFILE", "durable")
+
+SQLITE_PROFILES: dict[str, dict[str, int | str]] = {
+    # COMMIT czeka na fsync WAL: zatwierdzona transakcja przeżyje też awarię zasilania
+    "durable": {
+        "synchronous": "FULL",
+    },
+    # fsync tylko przy checkpoincie: awaria zasilania może zgubić ostatnie COMMIT-y, ale nie psuje bazy
+    "balanced": {
+        "synchronous": "NORMAL",
+        "cache_size": -65536,          # 64 MiB (ujemne = KiB)
+        "mmap_size": 268435456,        # 256 MiB
+        "temp_store": "MEMORY",
+    },
+    # import/odtwarzanie danych: bez fsync i z rzadkimi checkpointami; tylko gdy dane da się wgrać ponownie
+    "bulk-load": {
+        "synchronous": "OFF",
+        "cache_size": -262144,         # 256 MiB
+        "mmap_size": 1073741824,       # 1 GiB
+        "temp_store": "MEMORY",
+        "wal_autocheckpoint": 10000,
+    },
+}
+
+# tryb spójności: get_balance porównuje ledger z pełną sumą historii
+BALANCE_CONSISTENCY_CHECK = os.getenv("BANK_BALANCE_CONSISTENCY_CHECK", "0") == "1"
+
+# adaptery repozytoriów: "sqlalchemy" (Session + text()) albo "sqlite3" (gołe sqlite3, krotki)
+REPOSITORY_BACKEND = os.getenv("BANK_REPOSITORY_BACKEND", "sqlalchemy")
+
+# zapis czasu: "iso" (filtry i sortowanie po tekstowym created_at) albo "epoch_us"
+# (po kolumnach *_us w mikrosekundach od epoki; przełączać po `migrate-timestamps`)
+TIMESTAMP_STORAGE = os.getenv("BANK_TIMESTAMP_STORAGE", "iso")
+
+# generator ID: "uuid4" (losowe) albo "uuid7" (rosnące w czasie, dopisywane na końcu indeksów)
+ID_PROVIDER = os.getenv("BANK_ID_PROVIDER", "uuid4")
+# ID w bazie: "text" (36 znaków) albo "blob" (16 bajtów; najpierw `migrate-ids` na zatrzymanej aplikacji)
+ID_STORAGE = os.getenv("BANK_ID_STORAGE", "text")
+
+# baza archiwum starych transakcji (ATTACH ... AS archive, przenosi je `archive`); brak = bez archiwum
+ARCHIVE_PATH = Path(os.environ["BANK_ARCHIVE_PATH"]) if os.getenv("BANK_ARCHIVE_PATH") else None
+
+# sharding: konta (z historią) rozkładane hashem account_id na N plików SQLite, każdy z własnym
+# writerem; 0 lub 1 = jeden plik SQLITE_PATH. Liczby shardów nie zmienia się po zapisaniu danych.
+SHARD_COUNT = int(os.getenv("BANK_SHARD_COUNT", "0"))
+SHARD_DIR = Path(os.getenv("BANK_SHARD_DIR", DATA_DIR / "shards"))
+
+# group commit: ile komend / ile ms czeka writer zanim zrobi COMMIT
+GROUP_COMMIT_MAX_BATCH = int(os.getenv("BANK_GROUP_COMMIT_MAX_BATCH", "256"))
+GROUP_COMMIT_MAX_DELAY_MS = float(os.getenv("BANK_GROUP_COMMIT_MAX_DELAY_MS", "5"))
+
+# serwer HTTP/JSON
+HTTP_HOST = os.getenv("BANK_HTTP_HOST", "127.0.0.1")
+HTTP_PORT = int(os.getenv("BANK_HTTP_PORT", "8080"))
+
+# cache kont w procesie (0 = wyłączony); salda w cache tylko na żądanie
+ACCOUNT_CACHE_SIZE = int(os.getenv("BANK_ACCOUNT_CACHE_SIZE", "10000"))
+ACCOUNT_CACHE_BALANCES = os.getenv("BANK_ACCOUNT_CACHE_BALANCES", "0") == "1"
+# przy każdym trafieniu porównaj wersję z bazą (gdy konta zmieniają też inne procesy)
+ACCOUNT_CACHE_VERIFY_VERSION = os.getenv("BANK_ACCOUNT_CACHE_VERIFY_VERSION", "0") == "1"
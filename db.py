@@ -1,10 +1,12 @@
-from sqlalchemy import create_engine, text
+from datetime import datetime, timezone
+from urllib.parse import quote
+
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
-from config.config import SQLITE_PATH
+from config.config import ARCHIVE_PATH, SQLITE_PATH, SQLITE_PROFILE, SQLITE_PROFILES
 
-engine = create_engine(f"sqlite:///{SQLITE_PATH}", echo=False, future=True)
 
-create_accounts_table_sql = text("""
+create_accounts_table_sql = """
 CREATE TABLE IF NOT EXISTS accounts (
     account_id TEXT PRIMARY KEY NOT NULL,
     owner_name TEXT NOT NULL,
@@ -15,9 +17,9 @@ CREATE TABLE IF NOT EXISTS accounts (
     status TEXT NOT NULL CHECK (status IN ('ACTIVE','BLOCKED','CLOSED')),
     version INTEGER NOT NULL DEFAULT 0
 )
-""")
+"""
 
-create_transactions_table_sql = text("""
+create_transactions_table_sql = """
 CREATE TABLE IF NOT EXISTS transactions (
     tx_id TEXT PRIMARY KEY NOT NULL,
     account_id TEXT NOT NULL REFERENCES accounts(account_id),
@@ -28,19 +30,407 @@ CREATE TABLE IF NOT EXISTS transactions (
     related_account_id TEXT NULL REFERENCES accounts(account_id),
     note TEXT NULL
 )
-""")
+"""
+
+# Indeksy pod keyset (created_at, tx_id) oraz filtr typu; stary indeks bez tx_id jest zbędny.
+drop_legacy_transactions_index_sql = """
+DROP INDEX IF EXISTS idx_transactions_account_created_at
+"""
+
+create_transactions_index_sql = """
+CREATE INDEX IF NOT EXISTS idx_transactions_account_created_at_tx
+ON transactions (account_id, created_at DESC, tx_id DESC)
+"""
+
+create_transactions_type_index_sql = """
+CREATE INDEX IF NOT EXISTS idx_transactions_account_type_created_at_tx
+ON transactions (account_id, type, created_at DESC, tx_id DESC)
+"""
+
+# Bieżące saldo per konto, aktualizowane w tej samej transakcji co append.
+create_account_balances_table_sql = """
+CREATE TABLE IF NOT EXISTS account_balances (
+    account_id TEXT PRIMARY KEY NOT NULL REFERENCES accounts(account_id),
+    balance NUMERIC(18,2) NOT NULL DEFAULT 0,
+    tx_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT NOT NULL
+)
+"""
+
+# Jednorazowe wypełnienie ledgera z istniejącej historii (no-op dla kont, które już mają wiersz).
+backfill_account_balances_sql = """
+INSERT OR IGNORE INTO account_balances (account_id, balance, tx_count, updated_at)
+SELECT
+    account_id,
+    ROUND(COALESCE(SUM(
+        CASE
+            WHEN type = 'DEPOSIT' THEN amount
+            WHEN type = 'WITHDRAW' THEN -amount
+            ELSE 0
+        END
+    ), 0), 2),
+    COUNT(*),
+    MAX(created_at)
+FROM transactions
+GROUP BY account_id
+"""
+
+# Kwoty w groszach/centach (INTEGER) obok kolumn NUMERIC; NULL = wiersz jeszcze bez backfillu.
+add_transactions_amount_minor_sql = "ALTER TABLE transactions ADD COLUMN amount_minor INTEGER NULL"
+add_accounts_balance_minor_sql = "ALTER TABLE accounts ADD COLUMN balance_minor INTEGER NULL"
+add_account_balances_balance_minor_sql = "ALTER TABLE account_balances ADD COLUMN balance_minor INTEGER NULL"
+
+# Czas jako INTEGER (mikrosekundy od epoki UTC) obok kolumn ISO-8601; NULL = wiersz bez backfillu.
+add_transactions_created_at_us_sql = "ALTER TABLE transactions ADD COLUMN created_at_us INTEGER NULL"
+add_accounts_created_at_us_sql = "ALTER TABLE accounts ADD COLUMN created_at_us INTEGER NULL"
+add_accounts_updated_at_us_sql = "ALTER TABLE accounts ADD COLUMN updated_at_us INTEGER NULL"
+
+create_transactions_us_index_sql = """
+CREATE INDEX IF NOT EXISTS idx_transactions_account_created_at_us_tx
+ON transactions (account_id, created_at_us DESC, tx_id DESC)
+"""
+
+create_transactions_type_us_index_sql = """
+CREATE INDEX IF NOT EXISTS idx_transactions_account_type_created_at_us_tx
+ON transactions (account_id, type, created_at_us DESC, tx_id DESC)
+"""
+
+# Saldo otwarcia konta: suma transakcji przeniesionych do archiwum i klucz (created_at, tx_id)
+# ostatniej z nich; wszystko, co zostało w transactions, jest od niego nowsze.
+create_account_checkpoints_table_sql = """
+CREATE TABLE IF NOT EXISTS account_checkpoints (
+    account_id TEXT PRIMARY KEY NOT NULL REFERENCES accounts(account_id),
+    balance_minor INTEGER NOT NULL,
+    tx_count INTEGER NOT NULL,
+    boundary_created_at TEXT NOT NULL,
+    boundary_tx_id TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+)
+"""
+
+# Dzienne sumy per (konto, dzień UTC, waluta), aktualizowane w tej samej transakcji co append.
+# WITHOUT ROWID: dni konta leżą obok siebie w kluczu głównym, więc suma za okres to jeden zakres indeksu.
+create_account_daily_totals_table_sql = """
+CREATE TABLE IF NOT EXISTS account_daily_totals (
+    account_id TEXT NOT NULL REFERENCES accounts(account_id),
+    day TEXT NOT NULL,
+    currency TEXT NOT NULL,
+    inflow_minor INTEGER NOT NULL DEFAULT 0,
+    outflow_minor INTEGER NOT NULL DEFAULT 0,
+    tx_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (account_id, day, currency)
+) WITHOUT ROWID
+"""
+
+# 0 = historia konta sprzed migracji 7 nie jest jeszcze zsumowana (migrate-daily-totals);
+# konta, których ledger powstaje później, mają sumy kompletne od pierwszej transakcji.
+add_account_balances_daily_totals_ready_sql = (
+    "ALTER TABLE account_balances ADD COLUMN daily_totals_ready INTEGER NOT NULL DEFAULT 0"
+)
+
+# Listowanie kont (keyset po (created_at, account_id), najnowsze najpierw): indeks bez filtra
+# i po jednym na filtry status / currency, w parach created_at / created_at_us jak indeksy
+# transakcji.
+create_accounts_created_at_index_sql = """
+CREATE INDEX IF NOT EXISTS idx_accounts_created_at_id
+ON accounts (created_at DESC, account_id DESC)
+"""
+
+create_accounts_status_index_sql = """
+CREATE INDEX IF NOT EXISTS idx_accounts_status_created_at_id
+ON accounts (status, created_at DESC, account_id DESC)
+"""
+
+create_accounts_currency_index_sql = """
+CREATE INDEX IF NOT EXISTS idx_accounts_currency_created_at_id
+ON accounts (currency, created_at DESC, account_id DESC)
+"""
+
+create_accounts_created_at_us_index_sql = """
+CREATE INDEX IF NOT EXISTS idx_accounts_created_at_us_id
+ON accounts (created_at_us DESC, account_id DESC)
+"""
+
+create_accounts_status_us_index_sql = """
+CREATE INDEX IF NOT EXISTS idx_accounts_status_created_at_us_id
+ON accounts (status, created_at_us DESC, account_id DESC)
+"""
+
+create_accounts_currency_us_index_sql = """
+CREATE INDEX IF NOT EXISTS idx_accounts_currency_created_at_us_id
+ON accounts (currency, created_at_us DESC, account_id DESC)
+"""
+
+# Prefiks właściciela to zakres na owner_name, więc dopasowania i tak trzeba posortować;
+# obie kolumny czasu i account_id w indeksie pozwalają sprawdzić kursor (w każdym trybie
+# zapisu czasu) bez sięgania do wierszy tabeli.
+create_accounts_owner_index_sql = """
+CREATE INDEX IF NOT EXISTS idx_accounts_owner_created_at_id
+ON accounts (owner_name, created_at, created_at_us, account_id)
+"""
+
+# Archiwum (osobny plik, ATTACH ... AS archive): te same kolumny co transactions, bez kluczy
+# obcych (nie sięgają między plikami) i bez CHECK-ów (wiersze przeszły je przy zapisie).
+create_archive_transactions_table_sql = """
+CREATE TABLE IF NOT EXISTS archive.transactions (
+    tx_id TEXT PRIMARY KEY NOT NULL,
+    account_id TEXT NOT NULL,
+    type TEXT NOT NULL,
+    amount NUMERIC(18,2) NOT NULL,
+    currency TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    related_account_id TEXT NULL,
+    note TEXT NULL,
+    amount_minor INTEGER NULL,
+    created_at_us INTEGER NULL
+)
+"""
+
+create_archive_transactions_index_sql = """
+CREATE INDEX IF NOT EXISTS archive.idx_archive_transactions_account_created_at_tx
+ON transactions (account_id, created_at DESC, tx_id DESC)
+"""
+
+create_archive_transactions_us_index_sql = """
+CREATE INDEX IF NOT EXISTS archive.idx_archive_transactions_account_created_at_us_tx
+ON transactions (account_id, created_at_us DESC, tx_id DESC)
+"""
+
+ARCHIVE_SCHEMA = [
+    create_archive_transactions_table_sql,
+    create_archive_transactions_index_sql,
+    create_archive_transactions_us_index_sql,
+]
+
+create_schema_version_table_sql = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    version INTEGER PRIMARY KEY NOT NULL,
+    applied_at TEXT NOT NULL
+)
+"""
+
+schema_version_exists_sql = """
+SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'schema_version'
+"""
+
+# Kolejne wersje schematu: (wersja, instrukcje). Wersje 1-3 są idempotentne, bo bazy
+# sprzed wersjonowania mają już część obiektów. Nowa zmiana = nowa pozycja na końcu.
+MIGRATIONS: list[tuple[int, list[str]]] = [
+    (1, [create_accounts_table_sql, create_transactions_table_sql]),
+    (2, [create_account_balances_table_sql, backfill_account_balances_sql]),
+    (3, [
+        drop_legacy_transactions_index_sql,
+        create_transactions_index_sql,
+        create_transactions_type_index_sql,
+    ]),
+    (4, [
+        add_transactions_amount_minor_sql,
+        add_accounts_balance_minor_sql,
+        add_account_balances_balance_minor_sql,
+    ]),
+    (5, [
+        add_transactions_created_at_us_sql,
+        add_accounts_created_at_us_sql,
+        add_accounts_updated_at_us_sql,
+        create_transactions_us_index_sql,
+        create_transactions_type_us_index_sql,
+    ]),
+    (6, [create_account_checkpoints_table_sql]),
+    (7, [create_account_daily_totals_table_sql, add_account_balances_daily_totals_ready_sql]),
+    (8, [
+        create_accounts_created_at_index_sql,
+        create_accounts_status_index_sql,
+        create_accounts_currency_index_sql,
+        create_accounts_owner_index_sql,
+        create_accounts_created_at_us_index_sql,
+        create_accounts_status_us_index_sql,
+        create_accounts_currency_us_index_sql,
+    ]),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
 
-create_transactions_index_sql = text("""
-CREATE INDEX IF NOT EXISTS idx_transactions_account_created_at
-ON transactions (account_id, created_at DESC)
-""")
 
-with engine.begin() as con:
-    con.execute(text("PRAGMA foreign_keys=ON"))
-    con.execute(text("PRAGMA journal_mode=WAL"))
-    con.execute(text("PRAGMA busy_timeout=5000"))
-    con.execute(create_accounts_table_sql)
-    con.execute(create_transactions_table_sql)
-    con.execute(create_transactions_index_sql)
+def _current_schema_version(cursor) -> int:
+    cursor.execute(schema_version_exists_sql)
+    if cursor.fetchone() is None:
+        return 0
+    cursor.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+    return cursor.fetchone()[0]
+
+
+def ensure_schema(dbapi_connection) -> int:
+    """
+    Doprowadza schemat do SCHEMA_VERSION; zwraca wersję sprzed migracji.
+
+    Aktualna baza kosztuje jeden SELECT. Migracje idą pod BEGIN IMMEDIATE
+    z ponownym odczytem wersji, więc równoległe procesy nie zdublują DDL.
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        current = _current_schema_version(cursor)
+        if current >= SCHEMA_VERSION:
+            return current
+
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            current = _current_schema_version(cursor)
+            cursor.execute(create_schema_version_table_sql)
+            for version, statements in MIGRATIONS:
+                if version <= current:
+                    continue
+                for statement in statements:
+                    cursor.execute(statement)
+                cursor.execute(
+                    "INSERT INTO schema_version (version, applied_at) VALUES (?, ?)",
+                    (version, datetime.now(timezone.utc).isoformat()),
+                )
+            cursor.execute("COMMIT")
+        except BaseException:
+            cursor.execute("ROLLBACK")
+            raise
+        return current
+    finally:
+        cursor.close()
+
+
+# pysqlite sam decyduje, kiedy wysłać BEGIN, co psuje SAVEPOINT-y (begin_nested).
+# Wyłączamy to i sami otwieramy transakcję; PRAGMA muszą więc iść poza transakcją.
+def _on_connect(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.close()
+
+
+def apply_pragma_profile(dbapi_connection, profile: str) -> None:
+    """Ustawia PRAGMA profilu z config.SQLITE_PROFILES (działają per połączenie, nie per baza)."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma, value in SQLITE_PROFILES[profile].items():
+            cursor.execute(f"PRAGMA {pragma}={value}")
+    finally:
+        cursor.close()
+
+
+# Połączenia tylko do odczytu: plik otwierany z mode=ro, a query_only blokuje zapis także
+# w tabelach tymczasowych. journal_mode i migracje zostawiamy silnikowi zapisu.
+def _on_connect_read_only(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA query_only=ON")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.close()
+
+
+def attach_archive(dbapi_connection, archive_path, read_only: bool = False) -> None:
+    """
+    Podpina bazę archiwum jako schemat `archive` (ATTACH działa per połączenie).
+
+    Połączenie do zapisu tworzy plik i jego schemat; tylko do odczytu otwiera go z mode=ro.
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        if read_only:
+            cursor.execute("ATTACH DATABASE ? AS archive", (f"file:{quote(str(archive_path.resolve()))}?mode=ro",))
+            return
+        cursor.execute("ATTACH DATABASE ? AS archive", (str(archive_path),))
+        cursor.execute("PRAGMA archive.journal_mode=WAL")
+        for statement in ARCHIVE_SCHEMA:
+            cursor.execute(statement)
+    finally:
+        cursor.close()
+
+
+def _on_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
+
+# Transakcje silnika zapisu biorą lock zapisu od razu. Przy odroczonym BEGIN odczyt ustala
+# migawkę WAL, a zapis po cudzym COMMIT dostaje SQLITE_BUSY_SNAPSHOT ("database is locked")
+# bez czekania na busy_timeout; ponowienie w tej samej transakcji widzi tę samą, starą migawkę.
+def _on_begin_immediate(conn):
+    conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def install_sqlite_hooks(
+    target_engine,
+    profile: str = SQLITE_PROFILE,
+    schema=ensure_schema,
+    archive_path=None,
+) -> None:
+    """
+    Podpina PRAGMA (wspólne + profil), ręczny BEGIN IMMEDIATE i migracje schematu pod silnik (także sync_engine silnika async).
+
+    Schemat sprawdzamy przy pierwszym połączeniu silnika, nie przy imporcie,
+    więc `--help` i komendy bez bazy nie płacą za połączenie ani DDL.
+    `schema` podmienia migracje banku na własne (np. dziennik koordynatora shardów),
+    a `archive_path` podpina pod każde połączenie bazę archiwum transakcji.
+    """
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(
+            f"Unknown BANK_SQLITE_PROFILE '{profile}' (expected one of: {', '.join(SQLITE_PROFILES)})"
+        )
+
+    def _on_connect_profile(dbapi_connection, connection_record):
+        apply_pragma_profile(dbapi_connection, profile)
+
+    def _on_first_connect(dbapi_connection, connection_record):
+        schema(dbapi_connection)
+
+    event.listen(target_engine, "connect", _on_connect)
+    event.listen(target_engine, "connect", _on_connect_profile)
+    event.listen(target_engine, "connect", _on_first_connect, once=True)
+    if archive_path is not None:
+        def _on_connect_archive(dbapi_connection, connection_record):
+            attach_archive(dbapi_connection, archive_path)
+
+        event.listen(target_engine, "connect", _on_connect_archive)
+    event.listen(target_engine, "begin", _on_begin_immediate)
+
+
+def install_read_only_hooks(target_engine, writer_engine, profile: str = SQLITE_PROFILE, archive_path=None) -> None:
+    """
+    Podpina pod silnik tylko do odczytu query_only, profil PRAGMA i ręczny BEGIN.
+
+    mode=ro nie utworzy ani nie zmigruje bazy, więc przed pierwszym połączeniem
+    otwieramy ją raz silnikiem zapisu (plik, WAL, schemat).
+    """
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(
+            f"Unknown BANK_SQLITE_PROFILE '{profile}' (expected one of: {', '.join(SQLITE_PROFILES)})"
+        )
+
+    def _prepare_database(dialect, connection_record, cargs, cparams):
+        with writer_engine.connect():
+            pass
+
+    def _on_connect_profile(dbapi_connection, connection_record):
+        apply_pragma_profile(dbapi_connection, profile)
+
+    event.listen(target_engine, "do_connect", _prepare_database, once=True)
+    event.listen(target_engine, "connect", _on_connect_read_only)
+    event.listen(target_engine, "connect", _on_connect_profile)
+    if archive_path is not None:
+        def _on_connect_archive(dbapi_connection, connection_record):
+            attach_archive(dbapi_connection, archive_path, read_only=True)
+
+        event.listen(target_engine, "connect", _on_connect_archive)
+    event.listen(target_engine, "begin", _on_begin)
+
+
+engine = create_engine(f"sqlite:///{SQLITE_PATH}", echo=False, future=True)
+install_sqlite_hooks(engine, archive_path=ARCHIVE_PATH)
+
+SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+# Osobny silnik i pula dla zapytań (saldo, historia): w WAL czytelnicy nie blokują
+# writera ani nie czekają na niego, a sesja nie ma czego commitować.
+read_engine = create_engine(
+    f"sqlite:///file:{quote(str(SQLITE_PATH.resolve()))}?mode=ro&uri=true", echo=False, future=True
+)
+install_read_only_hooks(read_engine, engine, archive_path=ARCHIVE_PATH)
 
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
\ No newline at end of file
+ReadSessionLocal = sessionmaker(bind=read_engine, autoflush=False, autocommit=False)
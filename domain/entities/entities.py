@@ -1,11 +1,11 @@
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 from domain.types.transaction import TransactionType
 from domain.types.currency import CurrencyType
 from domain.types.account_status import AccountStatus
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Account:
     account_id: str
     owner_name: str
@@ -14,8 +14,9 @@ class Account:
     created_at: datetime
     updated_at: datetime
     status: AccountStatus
+    version: int = 0
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Transaction:
     tx_id: str
     type: TransactionType
@@ -24,4 +25,14 @@ class Transaction:
     currency: CurrencyType
     occurred_at: datetime
     related_account_id: str | None = None
-    note: str | None = None
\ No newline at end of file
+    note: str | None = None
+
+@dataclass(frozen=True, slots=True)
+class DailyTotals:
+    """Sumy transakcji konta z jednego dnia (UTC) w jednej walucie."""
+    account_id: str
+    day: date
+    currency: CurrencyType
+    inflow: Decimal
+    outflow: Decimal
+    count: int
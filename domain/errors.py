@@ -18,6 +18,24 @@ class TransactionAlreadyExists(DomainError):
     pass
 
 
+class AccountVersionConflict(DomainError):
+    """Raised when an account changed since it was read (optimistic concurrency check failed)."""
+    pass
+
+
+class BatchWriteError(DomainError):
+    """Raised when a batch write fails; `failures` maps row key to its domain error."""
+
+    def __init__(self, message: str, failures: dict):
+        super().__init__(message)
+        self.failures = failures
+
+
+class BalanceLedgerMismatch(DomainError):
+    """Raised when the running balance ledger disagrees with the transaction history."""
+    pass
+
+
 class ApplicationError(Exception):
     """Bazowy wyjątek warstwy application."""
 
@@ -44,3 +62,8 @@ class CurrencyMismatchError(ApplicationError):
 
 class SameAccountTransferNotAllowedError(ApplicationError):
     """Próba przelewu na to samo konto."""
+
+
+class CrossShardCommitError(DomainError):
+    """Raised when a write spanning several shards cannot be committed atomically right now."""
+    pass
@@ -1,8 +1,12 @@
+from collections.abc import Iterator, Sequence
 from typing import Protocol
 from domain.entities.entities import Account
-from domain.entities.entities import Transaction
+from domain.entities.entities import DailyTotals, Transaction
+from domain.types.account_status import AccountStatus
+from domain.types.currency import CurrencyType
+from domain.types.transaction import TransactionType
 from decimal import Decimal
-from datetime import datetime
+from datetime import date, datetime
 
 
 class IdProvider (Protocol):
@@ -10,6 +14,10 @@ class IdProvider (Protocol):
         """Zwraca nowy unikalny identyfikator (np. UUID, ULID)."""
         ...
 
+    def generate_ids(self, count: int) -> list[str]:
+        """Zwraca `count` nowych identyfikatorów naraz."""
+        ...
+
 
 class Clock (Protocol):
     def now(self) -> datetime:
@@ -26,21 +34,176 @@ class AccountRepository(Protocol):
         """Zwraca konto po ID lub rzuca AccountNotFound."""
         ...
 
-    def update_balance(self, account_id: str, new_balance: Decimal) -> None:
-        """Aktualizuje saldo konta."""
+    def get_by_id(self, account_id: str) -> Account | None:
+        """Zwraca konto lub None."""
+        ...
+
+    def get_version(self, account_id: str) -> int | None:
+        """Zwraca bieżącą wersję konta (accounts.version) lub None."""
+        ...
+
+    def update_balance(self, account_id: str, new_balance: Decimal, expected_version: int | None = None) -> None:
+        """Aktualizuje saldo konta; przy niezgodnej wersji rzuca AccountVersionConflict."""
+        ...
+
+    def update_balances(
+        self,
+        balances: dict[str, Decimal],
+        expected_versions: dict[str, int] | None = None,
+    ) -> None:
+        """Aktualizuje salda wielu kont naraz (rzuca BatchWriteError z błędami per konto)."""
         ...
 
-    def list_all(self, limit: int | None = None) -> list[Account]:
+    def list_all(self, limit: int | None = None) -> Sequence[Account]:
         """Zwraca liste kont."""
         ...
 
+    def list_page(
+        self,
+        limit: int,
+        status: AccountStatus | None = None,
+        currency: CurrencyType | None = None,
+        owner_prefix: str | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+        after: tuple[datetime, str] | None = None,
+    ) -> Sequence[Account]:
+        """Zwraca strone kont spelniajacych filtry (najnowsze najpierw, keyset po (created_at, account_id))."""
+        ...
+
 
 class TransactionRepository(Protocol):
     def append(self, transaction: Transaction) -> None: 
         """Dodaje nowa transakcje do historii."""
         ...
-    
-    def list_for_account(self, account_id: str, limit: int | None = None) -> list[Transaction]:
-        """Zwraca historie transakcji danego konta."""
+
+    def append_many(self, transactions: list[Transaction]) -> None:
+        """Dodaje wiele transakcji naraz (rzuca BatchWriteError z błędami per wiersz)."""
+        ...
+
+    def get_balance(self, account_id: str) -> Decimal:
+        """Zwraca bieżące saldo konta (bez skanowania historii)."""
         ...
 
+    def list_for_account(
+        self,
+        account_id: str,
+        limit: int | None = None,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+        types: set[TransactionType] | None = None,
+        after: tuple[datetime, str] | None = None,
+    ) -> Sequence[Transaction]:
+        """Zwraca historie transakcji danego konta (najnowsze najpierw, keyset po (created_at, tx_id))."""
+        ...
+
+    def iter_for_account(
+        self,
+        account_id: str,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+        types: set[TransactionType] | None = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Transaction]:
+        """Strumieniuje historie konta od najstarszych, pobierajac z bazy po batch_size wierszy."""
+        ...
+
+    def daily_totals(
+        self,
+        account_id: str,
+        date_from: date | None = None,
+        date_to: date | None = None,
+    ) -> Sequence[DailyTotals] | None:
+        """Zwraca dzienne sumy konta (dni UTC, date_to wylacznie) albo None, gdy historia nie jest jeszcze zsumowana."""
+        ...
+
+    def count_for_account(
+        self,
+        account_id: str,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+    ) -> int | None:
+        """Zwraca liczbe transakcji w zakresie (jak list_for_account bez limitu) z dziennych sum albo None."""
+        ...
+
+
+class AsyncAccountRepository(Protocol):
+    async def create(self, account: Account) -> None:
+        """Zapisuje nowe konto."""
+        ...
+
+    async def get(self, account_id: str) -> Account:
+        """Zwraca konto po ID lub rzuca AccountNotFound."""
+        ...
+
+    async def get_by_id(self, account_id: str) -> Account | None:
+        """Zwraca konto lub None."""
+        ...
+
+    async def get_version(self, account_id: str) -> int | None:
+        """Zwraca bieżącą wersję konta (accounts.version) lub None."""
+        ...
+
+    async def update_balance(self, account_id: str, new_balance: Decimal, expected_version: int | None = None) -> None:
+        """Aktualizuje saldo konta; przy niezgodnej wersji rzuca AccountVersionConflict."""
+        ...
+
+    async def update_balances(
+        self,
+        balances: dict[str, Decimal],
+        expected_versions: dict[str, int] | None = None,
+    ) -> None:
+        """Aktualizuje salda wielu kont naraz (rzuca BatchWriteError z błędami per konto)."""
+        ...
+
+    async def list_all(self, limit: int | None = None) -> Sequence[Account]:
+        """Zwraca liste kont."""
+        ...
+
+    async def list_page(
+        self,
+        limit: int,
+        status: AccountStatus | None = None,
+        currency: CurrencyType | None = None,
+        owner_prefix: str | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+        after: tuple[datetime, str] | None = None,
+    ) -> Sequence[Account]:
+        """Zwraca strone kont spelniajacych filtry (najnowsze najpierw, keyset po (created_at, account_id))."""
+        ...
+
+
+class AsyncTransactionRepository(Protocol):
+    async def append(self, transaction: Transaction) -> None:
+        """Dodaje nowa transakcje do historii."""
+        ...
+
+    async def append_many(self, transactions: list[Transaction]) -> None:
+        """Dodaje wiele transakcji naraz (rzuca BatchWriteError z błędami per wiersz)."""
+        ...
+
+    async def get_balance(self, account_id: str) -> Decimal:
+        """Zwraca bieżące saldo konta (bez skanowania historii)."""
+        ...
+
+    async def list_for_account(
+        self,
+        account_id: str,
+        limit: int | None = None,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+        types: set[TransactionType] | None = None,
+        after: tuple[datetime, str] | None = None,
+    ) -> Sequence[Transaction]:
+        """Zwraca historie transakcji danego konta (najnowsze najpierw, keyset po (created_at, tx_id))."""
+        ...
+
+    async def count_for_account(
+        self,
+        account_id: str,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+    ) -> int | None:
+        """Zwraca liczbe transakcji w zakresie (jak list_for_account bez limitu) z dziennych sum albo None."""
+        ...